@@ -3,7 +3,8 @@ import logging
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
 
-from app.exceptions import AppException
+from app.db.database import BUDGET_EXCEEDED, is_statement_timeout
+from app.exceptions import AppException, ServiceUnavailableError
 
 logger = logging.getLogger(__name__)
 
@@ -32,3 +33,10 @@ def app_exception_handler(request: Request, exc: Exception) -> Response:
             exc.detail,
         )
     return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+
+
+def statement_timeout_handler(request: Request, exc: Exception) -> Response:
+    """A statement cancelled by the request's budget (statement_timeout) is a 503, not a 500."""
+    if not is_statement_timeout(exc):
+        raise exc
+    return app_exception_handler(request, ServiceUnavailableError(BUDGET_EXCEEDED))
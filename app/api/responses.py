@@ -0,0 +1,39 @@
+"""Fast JSON path: routes return plain dicts straight from ORM rows, encoded with orjson.
+
+Returning a Response makes FastAPI skip response_model validation and serialization, so each
+object is converted once instead of model -> validate -> dict -> JSON. Routes keep
+response_model= for the OpenAPI schema; XResponse.content_from_x() mirror those models field
+for field (tests/unit/test_responses.py checks the bytes match).
+
+With settings.pg_json_lists, list routes skip even that: Postgres renders the items (see
+app.utils.query.json_page) and pg_json_page_response passes the text through.
+"""
+
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson-encoded JSONResponse. OPT_UTC_Z renders UTC datetimes with "Z", as Pydantic does."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def pg_json_page_response(items_json: str, next_cursor: Optional[str], limit: int) -> Response:
+    """PaginatedResponse body around an items array already rendered as JSON text."""
+    body = b"".join(
+        (
+            b'{"items":',
+            items_json.encode(),
+            b',"next_cursor":',
+            orjson.dumps(next_cursor),
+            b',"limit":',
+            orjson.dumps(limit),
+            b"}",
+        )
+    )
+    return Response(content=body, media_type="application/json")
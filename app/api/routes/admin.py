@@ -0,0 +1,15 @@
+import os
+
+from fastapi import APIRouter
+
+from app.db.database import async_engine
+from app.db.pool import pool_status
+from app.schemas.admin import PoolStatsResponse
+
+router = APIRouter(tags=["admin"])
+
+
+@router.get("/pool", response_model=PoolStatsResponse)
+async def get_pool_stats():
+    """Connection pool usage of the worker that serves the request (each worker has its own)."""
+    return PoolStatsResponse(pid=os.getpid(), **pool_status(async_engine.sync_engine))
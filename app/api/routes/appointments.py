@@ -1,88 +1,209 @@
-from typing import Annotated, Optional
+from collections import Counter
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime
+from typing import Annotated, Any, Optional
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.api.responses import FastJSONResponse, pg_json_page_response
+from app.config import settings
+from app.db.database import get_async_db
 from app.schemas.appointments import (
+    AppointmentBatchCreate,
+    AppointmentBatchResponse,
     AppointmentCreate,
     AppointmentResponse,
+    AppointmentSort,
     AppointmentStatus,
     AppointmentStatusUpdate,
+    BatchItemStatus,
+    ExportFormat,
+)
+from app.schemas.pagination import (
+    PaginatedResponse,
+    PaginationParams,
+    get_pagination,
+    paginated_content,
 )
-from app.schemas.pagination import PaginatedResponse, PaginationParams, get_pagination
 from app.services.appointment_service import AppointmentService
+from app.utils.export import to_csv, to_ndjson
 
 router = APIRouter()
 
-_depends_get_db = Depends(get_db)
+_depends_get_db = Depends(get_async_db)
 _depends_get_pagination = Depends(get_pagination)
+_query_start_from = Query(None, description="Only appointments starting at or after (ISO 8601)")
+_query_start_to = Query(None, description="Only appointments starting before (ISO 8601)")
 
 
 @router.post(
     "/medspas/{medspa_id}/appointments", response_model=AppointmentResponse, status_code=201
 )
-def create_appointment(medspa_id: str, data: AppointmentCreate, db: Session = _depends_get_db):
-    appointment = AppointmentService.create_appointment(db, medspa_id, data)
-    return AppointmentResponse.from_appointment(appointment)
+async def create_appointment(
+    medspa_id: str, data: AppointmentCreate, db: AsyncSession = _depends_get_db
+):
+    appointment = await db.run_sync(AppointmentService.create_appointment, medspa_id, data)
+    return FastJSONResponse(
+        AppointmentResponse.content_from_appointment(appointment), status_code=201
+    )
+
+
+@router.post("/medspas/{medspa_id}/appointments:batch", response_model=AppointmentBatchResponse)
+async def create_appointments_batch(
+    medspa_id: str, data: AppointmentBatchCreate, db: AsyncSession = _depends_get_db
+):
+    outcomes = await db.run_sync(
+        AppointmentService.create_appointments_batch, medspa_id, data.appointments
+    )
+    counts = Counter(o.status for o in outcomes)
+    return FastJSONResponse(
+        {
+            "created": counts[BatchItemStatus.CREATED],
+            "conflicts": counts[BatchItemStatus.CONFLICT],
+            "invalid": counts[BatchItemStatus.INVALID],
+            "results": [
+                {
+                    "index": o.index,
+                    "status": o.status,
+                    "appointment": AppointmentResponse.content_from_appointment(o.appointment)
+                    if o.appointment is not None
+                    else None,
+                    "detail": o.detail,
+                }
+                for o in outcomes
+            ],
+        }
+    )
 
 
 @router.get(
     "/medspas/{medspa_id}/appointments",
     response_model=PaginatedResponse[AppointmentResponse],
 )
-def list_medspa_appointments(
+async def list_medspa_appointments(
     medspa_id: str,
     status: Annotated[Optional[AppointmentStatus], Query()] = None,
-    db: Session = _depends_get_db,
+    sort: Annotated[AppointmentSort, Query()] = AppointmentSort.ID,
+    start_from: Optional[datetime] = _query_start_from,
+    start_to: Optional[datetime] = _query_start_to,
+    db: AsyncSession = _depends_get_db,
     pagination: PaginationParams = _depends_get_pagination,
 ):
-    items, next_cursor = AppointmentService.list_appointments(
-        db,
+    filters: dict[str, Any] = {
+        "medspa_id": medspa_id,
+        "status": status,
+        "cursor": pagination.cursor,
+        "limit": pagination.limit,
+        "sort": sort,
+        "start_from": start_from,
+        "start_to": start_to,
+    }
+    if settings.pg_json_lists:
+        items_json, next_cursor = await db.run_sync(
+            AppointmentService.list_appointments_json, **filters
+        )
+        return pg_json_page_response(items_json, next_cursor, pagination.limit)
+    items, next_cursor = await db.run_sync(AppointmentService.list_appointments, **filters)
+    return FastJSONResponse(
+        paginated_content(
+            [AppointmentResponse.content_from_appointment(a) for a in items],
+            next_cursor,
+            pagination.limit,
+        )
+    )
+
+
+async def _stream_then_close(
+    db: AsyncSession, chunks: Iterator[str | bytes]
+) -> AsyncIterator[str | bytes]:
+    # Since FastAPI 0.106, get_async_db's cleanup runs before a streaming body is sent. The closed
+    # session is reusable: the export query checks out a fresh connection, released here.
+    # chunks pulls rows from a server-side cursor, so it is advanced inside run_sync, one
+    # chunk (CHUNK_ROWS rows) at a time: each is sent before the next is read.
+    try:
+        while (chunk := await db.run_sync(lambda _: next(chunks, None))) is not None:
+            yield chunk
+    finally:
+        await db.close()
+
+
+# Declared before /appointments/{appointment_id} so "export" is not taken as an id
+@router.get("/appointments/export", response_class=StreamingResponse)
+async def export_appointments(
+    format: ExportFormat = ExportFormat.NDJSON,
+    medspa_id: Annotated[Optional[str], Query()] = None,
+    status: Annotated[Optional[AppointmentStatus], Query()] = None,
+    start_from: Optional[datetime] = _query_start_from,
+    start_to: Optional[datetime] = _query_start_to,
+    db: AsyncSession = _depends_get_db,
+):
+    rows = await db.run_sync(
+        AppointmentService.export_appointments,
         medspa_id=medspa_id,
         status=status,
-        cursor=pagination.cursor,
-        limit=pagination.limit,
+        start_from=start_from,
+        start_to=start_to,
     )
-    return PaginatedResponse(
-        items=[AppointmentResponse.from_appointment(a) for a in items],
-        next_cursor=next_cursor,
-        limit=pagination.limit,
+    chunks = to_ndjson(rows) if format == ExportFormat.NDJSON else to_csv(rows)
+    return StreamingResponse(
+        _stream_then_close(db, chunks),
+        media_type=format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="appointments.{format.value}"'},
     )
 
 
 @router.get("/appointments/{appointment_id}", response_model=AppointmentResponse)
-def get_appointment(appointment_id: str, db: Session = _depends_get_db):
-    appointment = AppointmentService.get_appointment(db, appointment_id)
-    return AppointmentResponse.from_appointment(appointment)
+async def get_appointment(appointment_id: str, db: AsyncSession = _depends_get_db):
+    appointment = await db.run_sync(AppointmentService.get_appointment, appointment_id)
+    return FastJSONResponse(AppointmentResponse.content_from_appointment(appointment))
 
 
 @router.patch("/appointments/{appointment_id}", response_model=AppointmentResponse)
-def update_appointment_status(
+async def update_appointment_status(
     appointment_id: str,
     data: AppointmentStatusUpdate,
-    db: Session = _depends_get_db,
+    db: AsyncSession = _depends_get_db,
 ):
-    appointment = AppointmentService.update_status(db, appointment_id, data.status)
-    return AppointmentResponse.from_appointment(appointment)
+    # Serialized inside run_sync: the merged row refreshes (updated_at) after commit
+    content = await db.run_sync(
+        lambda session: AppointmentResponse.content_from_appointment(
+            AppointmentService.update_status(session, appointment_id, data.status)
+        )
+    )
+    return FastJSONResponse(content)
 
 
 @router.get("/appointments", response_model=PaginatedResponse[AppointmentResponse])
-def list_appointments(
+async def list_appointments(
     medspa_id: Annotated[Optional[str], Query()] = None,
     status: Annotated[Optional[AppointmentStatus], Query()] = None,
-    db: Session = _depends_get_db,
+    sort: Annotated[AppointmentSort, Query()] = AppointmentSort.ID,
+    start_from: Optional[datetime] = _query_start_from,
+    start_to: Optional[datetime] = _query_start_to,
+    db: AsyncSession = _depends_get_db,
     pagination: PaginationParams = _depends_get_pagination,
 ):
-    items, next_cursor = AppointmentService.list_appointments(
-        db,
-        medspa_id=medspa_id,
-        status=status,
-        cursor=pagination.cursor,
-        limit=pagination.limit,
-    )
-    return PaginatedResponse(
-        items=[AppointmentResponse.from_appointment(a) for a in items],
-        next_cursor=next_cursor,
-        limit=pagination.limit,
+    filters: dict[str, Any] = {
+        "medspa_id": medspa_id,
+        "status": status,
+        "cursor": pagination.cursor,
+        "limit": pagination.limit,
+        "sort": sort,
+        "start_from": start_from,
+        "start_to": start_to,
+    }
+    if settings.pg_json_lists:
+        items_json, next_cursor = await db.run_sync(
+            AppointmentService.list_appointments_json, **filters
+        )
+        return pg_json_page_response(items_json, next_cursor, pagination.limit)
+    items, next_cursor = await db.run_sync(AppointmentService.list_appointments, **filters)
+    return FastJSONResponse(
+        paginated_content(
+            [AppointmentResponse.content_from_appointment(a) for a in items],
+            next_cursor,
+            pagination.limit,
+        )
     )
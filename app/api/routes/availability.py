@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_async_db
+from app.schemas.availability import GRANULARITY_PATTERN, AvailabilityResponse, parse_granularity
+from app.services.availability_service import AvailabilityService
+
+router = APIRouter(tags=["availability"])
+
+_depends_get_db = Depends(get_async_db)
+_query_service_ids = Query(
+    ...,
+    description="Services to book together; repeat the parameter or pass a comma-separated list",
+)
+_query_from = Query(..., alias="from", description="Window start (ISO 8601, inclusive)")
+_query_to = Query(..., alias="to", description="Window end (ISO 8601); slots must end by then")
+_query_granularity = Query(
+    "15m", pattern=GRANULARITY_PATTERN, description="Spacing of start times, e.g. 15m, 30m, 1h"
+)
+
+
+@router.get("/medspas/{medspa_id}/availability", response_model=AvailabilityResponse)
+async def get_availability(
+    medspa_id: str,
+    service_ids: list[str] = _query_service_ids,
+    window_start: datetime = _query_from,
+    window_end: datetime = _query_to,
+    granularity: str = _query_granularity,
+    db: AsyncSession = _depends_get_db,
+):
+    ids = [sid.strip() for raw in service_ids for sid in raw.split(",") if sid.strip()]
+    return await db.run_sync(
+        AvailabilityService.find_open_slots,
+        medspa_id,
+        ids,
+        window_start,
+        window_end,
+        parse_granularity(granularity),
+    )
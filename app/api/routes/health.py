@@ -0,0 +1,69 @@
+import time
+from typing import Any, Optional
+
+from fastapi import APIRouter, Request
+from starlette.responses import JSONResponse
+
+from app.config import settings
+from app.db.database import async_engine
+from app.db.health import DatabaseProber
+from app.db.pool import pool_status
+
+router = APIRouter(tags=["health"])
+
+
+def _readiness(request: Request) -> tuple[bool, dict[str, Any]]:
+    """Readiness from the prober's last result and the pool's live counters; no DB round trip."""
+    prober: Optional[DatabaseProber] = getattr(request.app.state, "db_prober", None)
+    status = prober.status if prober is not None else None
+    pool = pool_status(async_engine.sync_engine)
+    capacity = pool.get("size", 0) + pool.get("max_overflow", 0)
+    saturation = pool.get("checked_out", 0) / capacity if capacity else 0.0
+    database: dict[str, Any] = {"ok": False, "detail": "not probed yet"}
+    database_ok = False
+    if prober is not None and status is not None:
+        database_ok = status.ok and prober.is_fresh(status)
+        database = {
+            "ok": database_ok,
+            "age_seconds": round(time.monotonic() - status.checked_at, 3),
+            "latency_ms": status.latency_ms,
+            "error": status.error,
+        }
+    ready = database_ok and saturation < settings.health_max_pool_saturation
+    return ready, {
+        "database": database,
+        "pool": {
+            "checked_out": pool.get("checked_out", 0),
+            "capacity": capacity,
+            "saturation": round(saturation, 3),
+        },
+    }
+
+
+# async: these only read memory, so they run on the event loop and never wait for a
+# threadpool slot held by a request that is waiting on the database
+@router.get("/health/live")
+async def live():
+    """The process is up and serving requests; never touches the database."""
+    return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def ready(request: Request):
+    is_ready, details = _readiness(request)
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"status": "ok" if is_ready else "unavailable", **details},
+    )
+
+
+@router.get("/health")
+async def health(request: Request):
+    """Readiness in the original response shape."""
+    is_ready, _ = _readiness(request)
+    if not is_ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unhealthy", "detail": "database unavailable"},
+        )
+    return {"status": "ok"}
@@ -1,39 +1,56 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.api.responses import FastJSONResponse, pg_json_page_response
+from app.config import settings
+from app.db.database import get_async_db
 from app.schemas.medspas import MedspaCreate, MedspaResponse
-from app.schemas.pagination import PaginatedResponse, PaginationParams, get_pagination
+from app.schemas.pagination import (
+    PaginatedResponse,
+    PaginationParams,
+    get_pagination,
+    paginated_content,
+)
 from app.services.medspa_service import MedspaService
 
 router = APIRouter(tags=["medspas"])
 
-_depends_get_db = Depends(get_db)
+_depends_get_db = Depends(get_async_db)
 _depends_get_pagination = Depends(get_pagination)
 
 
 @router.get("", response_model=PaginatedResponse[MedspaResponse])
-def list_medspas(
-    db: Session = _depends_get_db,
+async def list_medspas(
+    db: AsyncSession = _depends_get_db,
     pagination: PaginationParams = _depends_get_pagination,
 ):
-    items, next_cursor = MedspaService.list_medspas(
-        db, cursor=pagination.cursor, limit=pagination.limit
+    if settings.pg_json_lists:
+        items_json, next_cursor = await db.run_sync(
+            MedspaService.list_medspas_json, cursor=pagination.cursor, limit=pagination.limit
+        )
+        return pg_json_page_response(items_json, next_cursor, pagination.limit)
+    items, next_cursor = await db.run_sync(
+        MedspaService.list_medspas, cursor=pagination.cursor, limit=pagination.limit
     )
-    return PaginatedResponse(
-        items=[MedspaResponse.from_medspa(m) for m in items],
-        next_cursor=next_cursor,
-        limit=pagination.limit,
+    return FastJSONResponse(
+        paginated_content(
+            [MedspaResponse.content_from_medspa(m) for m in items], next_cursor, pagination.limit
+        )
     )
 
 
 @router.get("/{medspa_id}", response_model=MedspaResponse)
-def get_medspa(medspa_id: str, db: Session = _depends_get_db):
-    medspa = MedspaService.get_medspa(db, medspa_id)
-    return MedspaResponse.from_medspa(medspa)
+async def get_medspa(medspa_id: str, db: AsyncSession = _depends_get_db):
+    medspa = await db.run_sync(MedspaService.get_medspa, medspa_id)
+    return FastJSONResponse(MedspaResponse.content_from_medspa(medspa))
 
 
 @router.post("", response_model=MedspaResponse, status_code=201)
-def create_medspa(data: MedspaCreate, db: Session = _depends_get_db):
-    medspa = MedspaService.create_medspa(db, data)
-    return MedspaResponse.from_medspa(medspa)
+async def create_medspa(data: MedspaCreate, db: AsyncSession = _depends_get_db):
+    # The new row's server defaults load after commit: serialize inside run_sync
+    content = await db.run_sync(
+        lambda session: MedspaResponse.content_from_medspa(
+            MedspaService.create_medspa(session, data)
+        )
+    )
+    return FastJSONResponse(content, status_code=201)
@@ -1,46 +1,73 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
-from app.schemas.pagination import PaginatedResponse, PaginationParams, get_pagination
+from app.api.responses import FastJSONResponse, pg_json_page_response
+from app.config import settings
+from app.db.database import get_async_db
+from app.schemas.pagination import (
+    PaginatedResponse,
+    PaginationParams,
+    get_pagination,
+    paginated_content,
+)
 from app.schemas.services import ServiceCreate, ServiceResponse, ServiceUpdate
 from app.services.offerings_service import OfferingsService
 
 router = APIRouter()
 
-_depends_get_db = Depends(get_db)
+_depends_get_db = Depends(get_async_db)
 _depends_get_pagination = Depends(get_pagination)
 
 
 @router.post("/medspas/{medspa_id}/services", response_model=ServiceResponse, status_code=201)
-def create_service(medspa_id: str, data: ServiceCreate, db: Session = _depends_get_db):
-    service = OfferingsService.create_service(db, medspa_id, data)
-    return ServiceResponse.from_service(service)
+async def create_service(medspa_id: str, data: ServiceCreate, db: AsyncSession = _depends_get_db):
+    # Written rows load their server defaults after commit: serialize inside run_sync
+    content = await db.run_sync(
+        lambda session: ServiceResponse.content_from_service(
+            OfferingsService.create_service(session, medspa_id, data)
+        )
+    )
+    return FastJSONResponse(content, status_code=201)
 
 
 @router.get("/services/{service_id}", response_model=ServiceResponse)
-def get_service(service_id: str, db: Session = _depends_get_db):
-    service = OfferingsService.get_service(db, service_id)
-    return ServiceResponse.from_service(service)
+async def get_service(service_id: str, db: AsyncSession = _depends_get_db):
+    service = await db.run_sync(OfferingsService.get_service, service_id)
+    return FastJSONResponse(ServiceResponse.content_from_service(service))
 
 
 @router.get("/medspas/{medspa_id}/services", response_model=PaginatedResponse[ServiceResponse])
-def list_services(
+async def list_services(
     medspa_id: str,
-    db: Session = _depends_get_db,
+    db: AsyncSession = _depends_get_db,
     pagination: PaginationParams = _depends_get_pagination,
 ):
-    items, next_cursor = OfferingsService.list_services_by_medspa(
-        db, medspa_id, cursor=pagination.cursor, limit=pagination.limit
-    )
-    return PaginatedResponse(
-        items=[ServiceResponse.from_service(s) for s in items],
-        next_cursor=next_cursor,
+    if settings.pg_json_lists:
+        items_json, next_cursor = await db.run_sync(
+            OfferingsService.list_services_by_medspa_json,
+            medspa_id,
+            cursor=pagination.cursor,
+            limit=pagination.limit,
+        )
+        return pg_json_page_response(items_json, next_cursor, pagination.limit)
+    items, next_cursor = await db.run_sync(
+        OfferingsService.list_services_by_medspa,
+        medspa_id,
+        cursor=pagination.cursor,
         limit=pagination.limit,
     )
+    return FastJSONResponse(
+        paginated_content(
+            [ServiceResponse.content_from_service(s) for s in items], next_cursor, pagination.limit
+        )
+    )
 
 
 @router.patch("/services/{service_id}", response_model=ServiceResponse)
-def update_service(service_id: str, data: ServiceUpdate, db: Session = _depends_get_db):
-    service = OfferingsService.update_service(db, service_id, data)
-    return ServiceResponse.from_service(service)
+async def update_service(service_id: str, data: ServiceUpdate, db: AsyncSession = _depends_get_db):
+    content = await db.run_sync(
+        lambda session: ServiceResponse.content_from_service(
+            OfferingsService.update_service(session, service_id, data)
+        )
+    )
+    return FastJSONResponse(content)
@@ -1,3 +1,3 @@
-from app.db.database import Base, SessionLocal, engine, get_db
+from app.db.database import Base, SessionLocal, engine, get_async_db
 
-__all__ = ["get_db", "Base", "SessionLocal", "engine"]
+__all__ = ["get_async_db", "Base", "SessionLocal", "engine"]
@@ -1,22 +1,253 @@
+import asyncio
+import contextvars
 import logging
-from collections.abc import Generator
+import re
+import time
+from collections.abc import AsyncGenerator, Generator
 from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Optional, TypeVar
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy import (
+    URL,
+    Engine,
+    Executable,
+    String,
+    bindparam,
+    create_engine,
+    event,
+    make_url,
+    text,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, SessionTransaction, declarative_base, sessionmaker
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+from starlette.requests import Request
 
 from app.config import settings
+from app.db.pool import TimedAsyncQueuePool, TimedQueuePool, instrument_pool
+from app.db.query_stats import instrument_queries, route_key
+from app.db.slow_queries import instrument_slow_queries
+from app.db.sql_comments import tag_statements
+from app.exceptions import ServiceUnavailableError
 
 logger = logging.getLogger(__name__)
 
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_POOL_OPTIONS: dict[str, Any] = {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout,
+    "pool_recycle": settings.db_pool_recycle,
+    "pool_pre_ping": settings.db_pool_pre_ping,
+    "pool_use_lifo": settings.db_pool_use_lifo,
+}
+
+
+def async_url(url: str) -> URL:
+    """url with the asyncpg driver, for create_async_engine: same database and credentials."""
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+
+def _instrument(engine: Engine, request_ids: bool = True) -> None:
+    instrument_queries(engine)
+    instrument_slow_queries(engine)
+    tag_statements(engine, request_id=request_ids)
+
+
+# psycopg2, for work outside requests: the health probe, partition maintenance, the
+# invalidation listener, scripts and benchmarks.
+engine = create_engine(settings.database_url, poolclass=TimedQueuePool, **_POOL_OPTIONS)
+instrument_pool(engine)
+_instrument(engine)
+replica_engine: Optional[Engine] = (
+    create_engine(settings.replica_database_url, **_POOL_OPTIONS)
+    if settings.replica_database_url
+    else None
+)
+if replica_engine is not None:
+    _instrument(replica_engine)
+
+# asyncpg, for requests (see get_async_db). Instrumentation hooks the sync_engine facade,
+# whose events fire as each statement is sent, as on the psycopg2 engines. Statements are
+# tagged with the route only, so each one's text repeats and its prepared statement is reused.
+async_engine = create_async_engine(
+    async_url(settings.database_url), poolclass=TimedAsyncQueuePool, **_POOL_OPTIONS
+)
+instrument_pool(async_engine.sync_engine)
+_instrument(async_engine.sync_engine, request_ids=False)
+async_replica_engine: Optional[AsyncEngine] = (
+    create_async_engine(async_url(settings.replica_database_url), **_POOL_OPTIONS)
+    if settings.replica_database_url
+    else None
+)
+if async_replica_engine is not None:
+    _instrument(async_replica_engine.sync_engine, request_ids=False)
+
+# Postgres WAL position as printed by pg_current_wal_lsn(), e.g. "16/B374D848"
+_LSN_PATTERN = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+_PRIMARY_ONLY = "primary_only"
+_REPLICA_CAUGHT_UP = "replica_caught_up"
+_DEADLINE = "deadline"
+_SET_STATEMENT_TIMEOUT = text("SELECT set_config('statement_timeout', :timeout, true)")
+
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout-Ms"
+BUDGET_EXCEEDED = "Request exceeded its time budget, please retry."
+
+
+@dataclass
+class ReadConsistency:
+    """Per-request read-your-writes state, shared with the code that runs the route.
+
+    read_after: the client's consistency token, the primary's WAL position after its last
+    write; replica reads wait for it. written: the position after a write in this request,
+    returned to the client as its next token.
+    """
+
+    read_after: Optional[str] = None
+    written: Optional[str] = None
+
+
+# Set by ReadConsistencyMiddleware; the holder object itself is mutated, so a value written
+# from a run_sync greenlet or the threadpool is seen by the middleware.
+read_consistency_ctx: contextvars.ContextVar[Optional[ReadConsistency]] = contextvars.ContextVar(
+    "read_consistency", default=None
+)
+
+
+def parse_consistency_token(value: Optional[str]) -> Optional[str]:
+    """The token if it is a well-formed LSN, else None (an invalid token is ignored)."""
+    return value if value is not None and _LSN_PATTERN.match(value) else None
+
+
+ExecutableT = TypeVar("ExecutableT", bound=Executable)
+
+
+def on_replica(stmt: ExecutableT) -> ExecutableT:
+    """Mark a read as safe to serve from the replica (see RoutingSession)."""
+    return stmt.execution_options(replica=True)
+
+
+class RoutingSession(Session):
+    """Session that sends on_replica() statements to the replica engine, the rest to the primary.
+
+    Statements go to the primary while transaction() is open, and also until the replica has
+    replayed past the request's read_after token (checked once per session). Without a
+    replica every statement goes to the primary.
+    """
+
+    def __init__(self, *args: Any, replica: Optional[Engine] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Any:
+        if self.replica is not None and self._for_replica(clause):
+            return self.replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+    def _for_replica(self, clause: Any) -> bool:
+        if not isinstance(clause, Executable) or self.info.get(_PRIMARY_ONLY):
+            return False
+        return bool(clause.get_execution_options().get("replica")) and self._replica_caught_up()
+
+    def _replica_caught_up(self) -> bool:
+        consistency = read_consistency_ctx.get()
+        if consistency is None or consistency.read_after is None:
+            return True
+        if _REPLICA_CAUGHT_UP not in self.info:
+            # NULL replay position means the replica is not in recovery, i.e. not lagging
+            self.info[_REPLICA_CAUGHT_UP] = self.connection(
+                bind_arguments={"bind": self.replica}
+            ).scalar(
+                # The token binds as text: asyncpg's own pg_lsn codec takes an int
+                text(
+                    "SELECT coalesce(pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn), "
+                    "NOT pg_is_in_recovery())"
+                ).bindparams(bindparam("lsn", type_=String)),
+                {"lsn": consistency.read_after},
+            )
+        return bool(self.info[_REPLICA_CAUGHT_UP])
+
+    def record_write(self) -> None:
+        """After a commit: hand the client the primary's WAL position as its next token."""
+        consistency = read_consistency_ctx.get()
+        if self.replica is None or consistency is None:
+            return
+        try:
+            consistency.written = self.connection().scalar(
+                text("SELECT pg_current_wal_lsn()::text")
+            )
+        except DBAPIError:
+            # The write is committed; without a token the client may just read stale once
+            logger.warning("consistency_token_unavailable", exc_info=True)
+            return
+        # This session's own later reads must see the write too
+        consistency.read_after = consistency.written
+        self.info.pop(_REPLICA_CAUGHT_UP, None)
+
+
+def set_deadline(session: Session, budget_ms: int) -> None:
+    """Bound the session's statements to finish within budget_ms from now (0: no bound)."""
+    if budget_ms > 0:
+        session.info[_DEADLINE] = time.monotonic() + budget_ms / 1000
+    else:
+        session.info.pop(_DEADLINE, None)
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _apply_deadline(session: Session, transaction: SessionTransaction, connection: Any) -> None:
+    # Runs for every connection a transaction uses (primary and replica), with the time left.
+    deadline = session.info.get(_DEADLINE)
+    if deadline is None:
+        return
+    remaining_ms = int((deadline - time.monotonic()) * 1000)
+    if remaining_ms <= 0:
+        raise ServiceUnavailableError(BUDGET_EXCEEDED)
+    # set_config(..., true) is SET LOCAL with the value bound: asyncpg prepares statements by
+    # their text, which would otherwise change with every transaction's time left
+    connection.execute(_SET_STATEMENT_TIMEOUT, {"timeout": f"{remaining_ms}ms"})
+
+
+def request_budget_ms(request: Request) -> int:
+    """Statement budget for request: its route's setting, or the client's header up to the max."""
+    budget = settings.statement_timeout_routes_ms.get(
+        route_key(request.scope), settings.statement_timeout_ms
+    )
+    requested = request.headers.get(REQUEST_TIMEOUT_HEADER, "")
+    if requested.isdigit() and int(requested) > 0:
+        budget = min(int(requested), settings.statement_timeout_max_ms)
+    return budget
+
+
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, replica=replica_engine
+)
+# The same RoutingSession underneath, so replica routing, deadlines and transaction() apply
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    replica=async_replica_engine.sync_engine if async_replica_engine is not None else None,
+)
 Base = declarative_base()
 
+# lock_not_available (lock_timeout), deadlock_detected, serialization_failure
+_RETRYABLE_LOCK_PGCODES = frozenset({"55P03", "40P01", "40001"})
+_QUERY_CANCELED_PGCODE = "57014"
+
 
 @contextmanager
 def transaction(session: Session) -> Generator[Session, None, None]:
-    """Context manager for service-layer transactions. Commits on success, rolls back on exception."""
+    """Context manager for service-layer transactions. Commits on success, rolls back on exception.
+
+    Everything inside runs on the primary, including reads marked on_replica().
+    """
+    session.info[_PRIMARY_ONLY] = True
     try:
         yield session
         session.commit()
@@ -24,14 +255,50 @@ def transaction(session: Session) -> Generator[Session, None, None]:
         session.rollback()
         logger.exception("transaction rollback")
         raise
+    finally:
+        session.info.pop(_PRIMARY_ONLY, None)
+    if isinstance(session, RoutingSession):
+        session.record_write()
+
+
+# Checked by SQLSTATE on any DBAPIError: psycopg2 raises these as OperationalError, while
+# SQLAlchemy's asyncpg adapter raises them as plain DBAPIError (both carry orig.pgcode).
+def is_statement_timeout(exc: Exception) -> bool:
+    """True if exc is Postgres cancelling a statement (query_canceled, e.g. statement_timeout)."""
+    if not isinstance(exc, DBAPIError):
+        return False
+    return getattr(exc.orig, "pgcode", None) == _QUERY_CANCELED_PGCODE
+
+
+def is_lock_contention_error(exc: Exception) -> bool:
+    """True if exc is a lock timeout/deadlock/serialization failure that is safe to retry."""
+    if not isinstance(exc, DBAPIError):
+        return False
+    return getattr(exc.orig, "pgcode", None) in _RETRYABLE_LOCK_PGCODES
+
+
+def pause(seconds: float) -> None:
+    """time.sleep, except under AsyncSession.run_sync, where the event loop keeps running."""
+    if in_greenlet():
+        await_only(asyncio.sleep(seconds))
+    else:
+        time.sleep(seconds)
+
 
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """The routes' session: asyncpg, so waiting on the database holds no thread.
 
-def get_db():
-    db = SessionLocal()
+    Services and repositories take a Session; routes call them with
+    ``await db.run_sync(fn, *args)``, which runs fn in a greenlet on the event loop where each
+    statement awaits the driver. Everything fn touches, lazy loads and refreshes of expired
+    attributes included, must happen inside run_sync.
+    """
+    db = AsyncSessionLocal()
+    set_deadline(db.sync_session, request_budget_ms(request))
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
 
 
 def create_all():
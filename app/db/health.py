@@ -0,0 +1,81 @@
+"""Database health, probed in the background so health endpoints answer from memory.
+
+DatabaseProber runs SELECT 1 every interval on its own single connection, outside the
+request pool, with connect and statement timeouts. Each result replaces `status`. Readiness
+also needs a recent result (is_fresh), so a prober that is itself stuck reads as not ready.
+"""
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import anyio
+from anyio import to_thread
+from sqlalchemy import Engine, create_engine, text
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DatabaseStatus:
+    ok: bool
+    checked_at: float  # time.monotonic() of the probe
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class DatabaseProber:
+    def __init__(self, engine: Engine, interval: float, timeout: float) -> None:
+        self.interval = interval
+        self.timeout = timeout
+        self._engine = create_engine(
+            engine.url,
+            pool_size=1,
+            max_overflow=0,
+            pool_pre_ping=False,
+            connect_args={
+                "connect_timeout": max(1, math.ceil(timeout)),
+                "options": f"-c statement_timeout={int(timeout * 1000)}",
+            },
+        )
+        self._lock = threading.Lock()
+        self._status: Optional[DatabaseStatus] = None
+
+    @property
+    def status(self) -> Optional[DatabaseStatus]:
+        """The last probe's result; None until the first probe finishes."""
+        with self._lock:
+            return self._status
+
+    def probe(self) -> DatabaseStatus:
+        started = time.monotonic()
+        try:
+            with self._engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            status = DatabaseStatus(True, time.monotonic(), (time.monotonic() - started) * 1000)
+        except Exception as exc:
+            # A dead pooled connection would fail every later probe too
+            self._engine.dispose()
+            status = DatabaseStatus(False, time.monotonic(), error=type(exc).__name__)
+            logger.warning("database_probe_failed error=%s", status.error)
+        with self._lock:
+            self._status = status
+        return status
+
+    def is_fresh(self, status: DatabaseStatus) -> bool:
+        """True unless two probes in a row are overdue (each may take up to timeout)."""
+        return time.monotonic() - status.checked_at <= 2 * (self.interval + self.timeout)
+
+    async def run(self) -> None:
+        """Probe forever, every interval; cancel the task to stop."""
+        # Its own thread token: probes never queue behind requests for AnyIO's threadpool
+        limiter = anyio.CapacityLimiter(1)
+        while True:
+            await to_thread.run_sync(self.probe, limiter=limiter)
+            await anyio.sleep(self.interval)
+
+    def close(self) -> None:
+        self._engine.dispose()
@@ -0,0 +1,129 @@
+"""Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+Writers call notify_invalidation() inside their transaction. Postgres delivers a NOTIFY only
+when that transaction commits and drops it on rollback. Each worker runs one
+InvalidationListener (started in app.main's lifespan). It LISTENs on CHANNEL and hands each
+key to the handler registered for its topic. Notifications sent while a listener is not
+connected are lost, so it flushes every registered cache when the connection drops and again
+once it is back.
+"""
+
+import logging
+import select
+import threading
+from collections.abc import Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_invalidation"
+
+
+@dataclass(frozen=True)
+class _Handler:
+    evict: Callable[[str], None]
+    flush: Callable[[], None]
+
+
+_handlers: dict[str, _Handler] = {}
+
+
+def register_invalidation(
+    topic: str, evict: Callable[[str], None], flush: Callable[[], None]
+) -> None:
+    """Route topic's notifications to evict(key); flush() drops everything the cache holds."""
+    _handlers[topic] = _Handler(evict, flush)
+
+
+def notify_invalidation(db: Session, topic: str, key: str) -> None:
+    """Queue an invalidation of key; sent to every worker when db's transaction commits."""
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CHANNEL, "payload": f"{topic}:{key}"},
+    )
+
+
+def dispatch(payload: str) -> None:
+    topic, _, key = payload.partition(":")
+    handler = _handlers.get(topic)
+    if handler is None:
+        logger.warning("cache_invalidation_unknown_topic payload=%s", payload)
+        return
+    handler.evict(key)
+
+
+def flush_all() -> None:
+    for handler in _handlers.values():
+        handler.flush()
+
+
+class InvalidationListener:
+    """Background thread that LISTENs on CHANNEL and dispatches notifications.
+
+    Uses its own DBAPI connection (not one from the pool) in autocommit mode. A heartbeat query
+    every heartbeat seconds of silence detects connections that died without a reset. After a
+    failure the thread reconnects with exponential backoff, capped at max_backoff seconds.
+    """
+
+    def __init__(self, engine: Engine, heartbeat: float, max_backoff: float) -> None:
+        self._engine = engine
+        self._heartbeat = heartbeat
+        self._max_backoff = max_backoff
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="cache-invalidation-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _connect(self) -> Any:
+        cargs, cparams = self._engine.dialect.create_connect_args(self._engine.url)
+        conn = self._engine.dialect.connect(*cargs, **cparams)
+        conn.autocommit = True
+        conn.cursor().execute(f"LISTEN {CHANNEL}")
+        return conn
+
+    def _listen(self, conn: Any) -> None:
+        while not self._stopping.is_set():
+            readable, _, _ = select.select([conn], [], [], self._heartbeat)
+            if not readable:
+                conn.cursor().execute("SELECT 1")  # heartbeat: raises if the connection is gone
+            conn.poll()
+            while conn.notifies:
+                dispatch(conn.notifies.pop(0).payload)
+
+    def _run(self) -> None:
+        backoff = min(1.0, self._max_backoff)
+        while not self._stopping.is_set():
+            try:
+                conn = self._connect()
+            except Exception:
+                logger.warning("cache_invalidation_connect_failed retry_in=%.1fs", backoff)
+                self._stopping.wait(backoff)
+                backoff = min(backoff * 2, self._max_backoff)
+                continue
+            backoff = min(1.0, self._max_backoff)
+            # Anything committed while we were not listening was missed.
+            flush_all()
+            try:
+                self._listen(conn)
+            except Exception:
+                logger.warning("cache_invalidation_connection_lost", exc_info=True)
+                flush_all()
+            finally:
+                with suppress(Exception):
+                    conn.close()
@@ -0,0 +1,62 @@
+"""Monthly appointment partitions, created ahead of the bookings that need them.
+
+sql/schema.sql range partitions appointments and appointment_services by start_time month and
+defines create_appointment_partitions(). ensure_partitions() calls it for this month and the
+next months_ahead; the API runs it at startup and then every interval (maintain_partitions), so
+new bookings land in their month's partition rather than the default one. A database built
+without schema.sql (e.g. Base.metadata.create_all in tests) has no such function: each run
+logs a warning and the API carries on with unpartitioned tables.
+
+Creating a partition takes an ACCESS EXCLUSIVE lock on both tables. While that lock is waited
+for, every later read and booking queues behind it, so the wait is capped at lock_timeout_ms:
+behind a long export the run gives up and the next one tries again.
+"""
+
+import logging
+from typing import Optional
+
+import anyio
+from anyio import to_thread
+from sqlalchemy import Engine, text
+
+from app.db.database import is_lock_contention_error
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_partitions(engine: Engine, months_ahead: int, lock_timeout_ms: int) -> Optional[int]:
+    """Create any missing partitions through months_ahead; months created, or None on failure."""
+    try:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}")
+            created = conn.execute(
+                text(
+                    "SELECT create_appointment_partitions("
+                    "now(), now() + :months * interval '1 month')"
+                ),
+                {"months": months_ahead + 1},
+            ).scalar_one()
+    except Exception as exc:
+        if is_lock_contention_error(exc):
+            logger.warning(
+                "appointment_partitions_lock_timeout lock_timeout_ms=%d", lock_timeout_ms
+            )
+        else:
+            logger.warning("appointment_partitions_failed", exc_info=True)
+        return None
+    if created:
+        logger.info("appointment_partitions_created months=%d", created)
+    return created
+
+
+async def maintain_partitions(
+    engine: Engine, months_ahead: int, interval: float, lock_timeout_ms: int
+) -> None:
+    """ensure_partitions every interval seconds, forever; cancel the task to stop."""
+    # Its own thread token, as for DatabaseProber.run: never queued behind requests
+    limiter = anyio.CapacityLimiter(1)
+    while True:
+        await to_thread.run_sync(
+            ensure_partitions, engine, months_ahead, lock_timeout_ms, limiter=limiter
+        )
+        await anyio.sleep(interval)
@@ -0,0 +1,127 @@
+"""Connection pool instrumentation: checkout wait, connections in use and overflow, per process.
+
+TimedQueuePool (psycopg2) and TimedAsyncQueuePool (asyncpg) time every checkout, including the
+wait for a free connection once pool_size + max_overflow are all in use. instrument_pool()
+listens for checkouts to track peaks. Each timed pool keeps its own PoolStats, carried over
+when dispose() recreates the pool, so the request engine and the background engine never mix;
+/admin/pool reports the request engine's along with its live counters.
+"""
+
+import threading
+import time
+from typing import Any, Optional
+
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    """Thread-safe counters since start (or reset()); waits are in seconds."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.peak_checked_out = 0
+            self.peak_overflow = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_in_use(self, checked_out: int, overflow: int) -> None:
+        with self._lock:
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_mean_ms": self.wait_total / attempts * 1000 if attempts else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+            }
+
+
+class _TimedCheckout(QueuePool):
+    """Records how long each checkout took in the pool's stats.
+
+    The time covers waiting for a free connection and opening a new one (overflow or after
+    recycle), which is what a request spends before its first query can run.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        if isinstance(pool, _TimedCheckout):
+            pool.stats = self.stats
+        return pool
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - started)
+        return conn
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool that records checkout times in its stats (psycopg2 engines)."""
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout times in its stats (asyncpg engines)."""
+
+
+def pool_stats(engine: Engine) -> Optional[PoolStats]:
+    """engine's checkout stats since start (or reset()), or None if its pool is not timed."""
+    pool = engine.pool
+    return pool.stats if isinstance(pool, _TimedCheckout) else None
+
+
+def instrument_pool(engine: Engine) -> None:
+    """Track peak connections in use and peak overflow in engine's pool stats."""
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        pool = engine.pool
+        if isinstance(pool, _TimedCheckout):
+            pool.stats.record_in_use(pool.checkedout(), max(pool.overflow(), 0))
+
+
+def pool_status(engine: Engine) -> dict[str, Any]:
+    """engine's live pool counters plus its pool_stats, for this process."""
+    pool = engine.pool
+    live: dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        live.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    stats = pool_stats(engine) or PoolStats()
+    return {**live, **stats.snapshot()}
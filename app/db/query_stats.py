@@ -0,0 +1,154 @@
+"""Per-request SQL statement counts and database time.
+
+instrument_queries(engine) times every statement the engine sends and adds it to the
+QueryStats in query_stats_ctx. QueryStatsMiddleware (app.main) sets a fresh one for each
+request and logs the totals in the request summary line, under the request's request_id.
+A route may declare a statement budget (settings.query_budgets, by "METHOD /path/{template}").
+Going over it is logged, or raised in strict mode (the test suite): a count that grows with the
+rows returned, one statement per row, is how an N+1 query shows up. Other per-statement checks
+(app/db/slow_queries.py) use the same timing through observe_statements().
+"""
+
+import contextvars
+import logging
+import time
+import weakref
+from collections.abc import Callable, Generator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import Engine, event
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Start times of the statements running on a DBAPI connection (its info dict)
+_STARTED = "query_stats_started"
+
+# Called after each statement: (connection, statement, parameters, executemany, seconds, failed)
+StatementObserver = Callable[[Any, Optional[str], Any, bool, float, bool], None]
+# Engines instrument_queries() has hooked, with the observers of their statements
+_observers: "weakref.WeakKeyDictionary[Engine, list[StatementObserver]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@dataclass
+class QueryStats:
+    """Statements sent and seconds spent waiting on them, for one request (or count_queries).
+
+    scope is the request's ASGI scope, which gains its matched route once routing is done.
+    """
+
+    statements: int = 0
+    db_seconds: float = 0.0
+    scope: Optional[Mapping[str, Any]] = field(default=None, repr=False)
+
+    def record(self, seconds: float) -> None:
+        self.statements += 1
+        self.db_seconds += seconds
+
+
+# Set by QueryStatsMiddleware; the holder is mutated, so statements run in the threadpool
+# (sync routes, streamed bodies) are seen by the middleware.
+query_stats_ctx: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar(
+    "query_stats", default=None
+)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more statements than its route's budget (raised only in strict mode)."""
+
+
+@contextmanager
+def count_queries() -> Generator[QueryStats, None, None]:
+    """Count the statements run in this context (and threads started from it) in a new QueryStats."""
+    stats = QueryStats()
+    token = query_stats_ctx.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats_ctx.reset(token)
+
+
+def _finish(
+    conn: Any,
+    observers: list[StatementObserver],
+    statement: Optional[str],
+    parameters: Any,
+    executemany: bool,
+    failed: bool = False,
+) -> None:
+    started = conn.info.get(_STARTED)
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = query_stats_ctx.get()
+    if stats is not None:
+        stats.record(elapsed)
+    for observer in observers:
+        observer(conn, statement, parameters, executemany, elapsed, failed)
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Count engine's statements, failed ones included, into the current QueryStats.
+
+    Idempotent: an engine is hooked (and each statement timed) once, however often it is called.
+    """
+    if engine in _observers:
+        return
+    observers: list[StatementObserver] = []
+    _observers[engine] = observers
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn: Any, cursor: Any, statement: Any, params: Any, context: Any, many: Any):
+        conn.info.setdefault(_STARTED, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn: Any, cursor: Any, statement: Any, params: Any, context: Any, many: bool):
+        _finish(conn, observers, statement, params, many)
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(context: Any) -> None:
+        if context.connection is not None:
+            many = bool(getattr(context.execution_context, "executemany", False))
+            _finish(
+                context.connection,
+                observers,
+                context.statement,
+                context.parameters,
+                many,
+                failed=True,
+            )
+
+
+def observe_statements(engine: Engine, observer: StatementObserver) -> None:
+    """Call observer after each of engine's statements, with the timing instrument_queries took."""
+    instrument_queries(engine)
+    _observers[engine].append(observer)
+
+
+def route_key(scope: Mapping[str, Any]) -> str:
+    """Key for the route that matched, "METHOD /path/{template}" (the raw path if none did)."""
+    return f"{scope['method']} {getattr(scope.get('route'), 'path', scope['path'])}"
+
+
+def query_budget(route: str) -> int:
+    """Statement budget for route ("METHOD /path/{template}"); 0 means none."""
+    return settings.query_budgets.get(route, settings.query_budget_default)
+
+
+def check_query_budget(route: str, stats: QueryStats) -> None:
+    """Warn, or raise QueryBudgetExceeded in strict mode, if stats went over route's budget."""
+    budget = query_budget(route)
+    if budget <= 0 or stats.statements <= budget:
+        return
+    if settings.query_budget_strict:
+        raise QueryBudgetExceeded(
+            f"{route} ran {stats.statements} SQL statements, over its budget of {budget}"
+        )
+    logger.warning(
+        "query_budget_exceeded route=%s statements=%d budget=%d", route, stats.statements, budget
+    )
@@ -0,0 +1,191 @@
+"""Slow statement log, with an optional EXPLAIN of each slow SELECT.
+
+instrument_slow_queries(engine) looks at every statement the engine sends, failed ones included
+(a statement cancelled by statement_timeout is the slowest kind), with the timing that
+app/db/query_stats.py already takes for the request's totals. One over settings.slow_query_ms
+is logged as slow_query with its route, normalized SQL and parameter shapes. Only the types
+are logged, never the values, which may be patient contact details. The request id comes from
+the log format.
+
+With settings.slow_query_explain, a slow SELECT is also queued for EXPLAIN (ANALYZE, BUFFERS).
+One background thread runs it on its own psycopg2 connection to the same database, outside the
+request pool, in a read-only transaction that is rolled back. A statement sent by asyncpg keeps
+its $1 placeholders, so it is PREPAREd and the EXECUTE explained. ANALYZE runs the query a
+second time, so this is for debugging, not for production load.
+"""
+
+import logging
+import queue
+import re
+import threading
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from sqlalchemy import URL, Engine, create_engine
+
+from app.config import settings
+from app.db.query_stats import observe_statements, query_stats_ctx, route_key
+from app.logging_config import request_id_ctx
+
+logger = logging.getLogger(__name__)
+
+# Quoted strings and standalone numbers; bound parameters (%(name)s, $1) are left as they are
+_LITERAL = re.compile(r"'(?:[^']|'')*'|(?<!\$)\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+# A data-modifying CTE (WITH ... INSERT/UPDATE/DELETE ...) is a write, whatever it starts with
+_WRITE = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+_MAX_SQL_CHARS = 2000
+_MAX_SHAPES = 20
+
+
+def normalize_sql(statement: str) -> str:
+    """statement on one line with literals as ?, cut at _MAX_SQL_CHARS."""
+    sql = _WHITESPACE.sub(" ", _LITERAL.sub("?", statement)).strip()
+    return sql if len(sql) <= _MAX_SQL_CHARS else sql[:_MAX_SQL_CHARS] + "..."
+
+
+def _shape(value: Any) -> str:
+    if isinstance(value, list | tuple):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shapes(parameters: Any, executemany: bool = False) -> str:
+    """Names and types of parameters (no values), e.g. "{medspa_id_1: str, keys: list[3]}"."""
+    if executemany and isinstance(parameters, list | tuple) and parameters:
+        return f"{len(parameters)} x {parameter_shapes(parameters[0])}"
+    if isinstance(parameters, Mapping):
+        shapes = [f"{name}: {_shape(value)}" for name, value in parameters.items()]
+    elif isinstance(parameters, list | tuple):
+        shapes = [_shape(value) for value in parameters]
+    else:
+        return _shape(parameters)
+    if len(shapes) > _MAX_SHAPES:
+        shapes = shapes[:_MAX_SHAPES] + [f"... {len(shapes)} in all"]
+    return "{" + ", ".join(shapes) + "}"
+
+
+def is_explainable(statement: str, executemany: bool) -> bool:
+    """A single read-only SELECT (or WITH) statement, worth an EXPLAIN ANALYZE.
+
+    Writes, data-modifying CTEs (insert_if_available's INSERT ... RETURNING) and multi-statement
+    strings are never re-run: the read-only transaction would only make their EXPLAIN fail.
+    Any INSERT/UPDATE/DELETE/MERGE keyword outside a string literal counts, FOR UPDATE included.
+    """
+    head = statement.lstrip()[:6].upper()
+    return (
+        not executemany
+        and head.startswith(("SELECT", "WITH"))
+        and ";" not in statement
+        and _WRITE.search(_LITERAL.sub("?", statement)) is None
+    )
+
+
+class _Explainer:
+    """Daemon thread running EXPLAIN (ANALYZE, BUFFERS) for queued slow statements.
+
+    At most max_queued statements wait; more are dropped, so a burst of slow queries does not
+    pile up work. Each database gets one single-connection engine.
+    """
+
+    def __init__(self, max_queued: int = 16) -> None:
+        self._queue: queue.Queue[tuple[URL, str, Any, Optional[str]]] = queue.Queue(max_queued)
+        self._engines: dict[URL, Engine] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, url: URL, statement: str, parameters: Any, request_id: Optional[str]) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="slow-query-explain", daemon=True
+                )
+                self._thread.start()
+        try:
+            self._queue.put_nowait((url, statement, parameters, request_id))
+        except queue.Full:
+            logger.info("slow_query_explain_skipped reason=queue_full")
+
+    def _run(self) -> None:
+        while True:
+            url, statement, parameters, request_id = self._queue.get()
+            token = request_id_ctx.set(request_id)
+            try:
+                plan = self.explain(url, statement, parameters)
+                logger.warning("slow_query_plan sql=%s\n%s", normalize_sql(statement), plan)
+            except Exception:
+                logger.warning("slow_query_explain_failed", exc_info=True)
+            finally:
+                request_id_ctx.reset(token)
+                self._queue.task_done()
+
+    def explain(self, url: URL, statement: str, parameters: Any) -> str:
+        numbered = url.get_driver_name() == "asyncpg"
+        if numbered:
+            url = url.set(drivername="postgresql+psycopg2")
+        engine = self._engines.get(url)
+        if engine is None:
+            engine = create_engine(url, pool_size=1, max_overflow=0)
+            self._engines[url] = engine
+        try:
+            with engine.connect() as conn:
+                conn.execution_options(postgresql_readonly=True)  # before the transaction begins
+                conn.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {settings.statement_timeout_max_ms}"
+                )
+                if not numbered:
+                    result = conn.exec_driver_sql(
+                        f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters or None
+                    )
+                    return "\n".join(str(line) for line in result.scalars())  # rolled back
+                values = tuple(parameters or ())
+                conn.exec_driver_sql(f"PREPARE slow_query AS {statement}")
+                arguments = f"({', '.join(['%s'] * len(values))})" if values else ""
+                result = conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS) EXECUTE slow_query{arguments}", values or None
+                )
+                plan = "\n".join(str(line) for line in result.scalars())
+                # Prepared statements outlive the transaction; on failure, dispose() drops them
+                conn.exec_driver_sql("DEALLOCATE slow_query")
+                return plan
+        except Exception:
+            # A dead connection would fail every later EXPLAIN too
+            engine.dispose()
+            raise
+
+    def join(self) -> None:
+        """Wait until every queued statement has been explained (tests)."""
+        self._queue.join()
+
+
+explainer = _Explainer()
+
+
+def _log_if_slow(
+    conn: Any,
+    statement: Optional[str],
+    parameters: Any,
+    executemany: bool,
+    seconds: float,
+    failed: bool,
+) -> None:
+    elapsed_ms = seconds * 1000
+    if statement is None or settings.slow_query_ms <= 0 or elapsed_ms < settings.slow_query_ms:
+        return
+    stats = query_stats_ctx.get()
+    route = route_key(stats.scope) if stats is not None and stats.scope is not None else "-"
+    logger.warning(
+        "slow_query duration_ms=%.1f route=%s failed=%s params=%s sql=%s",
+        elapsed_ms,
+        route,
+        failed,
+        parameter_shapes(parameters, executemany),
+        normalize_sql(statement),
+    )
+    if settings.slow_query_explain and is_explainable(statement, executemany):
+        explainer.submit(conn.engine.url, statement, parameters, request_id_ctx.get())
+
+
+def instrument_slow_queries(engine: Engine) -> None:
+    """Log engine's statements slower than settings.slow_query_ms (see module docstring)."""
+    observe_statements(engine, _log_if_slow)
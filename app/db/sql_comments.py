@@ -0,0 +1,59 @@
+"""sqlcommenter-style tags on every statement sent during a request.
+
+tag_statements(engine) appends /*request_id='...',route='...'*/ to each statement: the request
+id from request_id_ctx and the matched route template from the request's QueryStats scope. The
+comment is in Postgres's statement text, so its logs (log_min_duration_statement,
+auto_explain, pg_stat_activity) and pg_stat_statements can be traced back to an endpoint and a
+request. pg_stat_statements groups by the parsed query, ignoring comments, and keeps one
+example text per group.
+
+Values are restricted to a safe character set rather than URL-encoded: a "%" would be read as
+a placeholder by psycopg2, and the request id comes from the client's X-Request-ID header.
+
+Engines that prepare statements (asyncpg) are tagged with the route alone: the driver caches
+prepared statements by their text, so a request id in it would prepare every statement anew.
+"""
+
+import re
+from typing import Any, Optional
+
+from sqlalchemy import Engine, event
+
+from app.config import settings
+from app.db.query_stats import query_stats_ctx
+from app.logging_config import request_id_ctx
+
+# Anything outside this set is replaced, so a value cannot close the comment or the quotes
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.:/{}-]")
+_MAX_VALUE_CHARS = 128
+
+
+def _value(raw: str) -> str:
+    return _UNSAFE.sub("_", raw[:_MAX_VALUE_CHARS])
+
+
+def sql_comment(request_id: bool = True) -> Optional[str]:
+    """The comment for the current request, or None outside one; request_id=False: route only."""
+    tags: dict[str, str] = {}
+    current_id = request_id_ctx.get() if request_id else None
+    if current_id:
+        tags["request_id"] = current_id
+    stats = query_stats_ctx.get()
+    route = getattr(stats.scope.get("route"), "path", None) if stats and stats.scope else None
+    if route:
+        tags["route"] = route
+    if not tags:
+        return None
+    # sqlcommenter: key='value' pairs, sorted by key, comma separated
+    return "/*" + ",".join(f"{key}='{_value(tags[key])}'" for key in sorted(tags)) + "*/"
+
+
+def tag_statements(engine: Engine, request_id: bool = True) -> None:
+    """Append sql_comment(request_id) to engine's statements while settings.sql_comments is on."""
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def _tag(conn: Any, cursor: Any, statement: str, params: Any, context: Any, many: Any):
+        comment = sql_comment(request_id) if settings.sql_comments else None
+        if comment is None:
+            return statement, params
+        return f"{statement} {comment}", params
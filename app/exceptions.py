@@ -26,3 +26,10 @@ class ConflictError(AppException):
 
     def __init__(self, detail: str = "One or more services are already booked for this time slot."):
         super().__init__(detail=detail, status_code=409)
+
+
+class ServiceUnavailableError(AppException):
+    """Raise when the request cannot be served right now and may be retried (HTTP 503)."""
+
+    def __init__(self, detail: str = "Service temporarily unavailable, please retry."):
+        super().__init__(detail=detail, status_code=503)
@@ -1,26 +1,80 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, suppress
 
+from anyio import to_thread
 from fastapi import FastAPI
-from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.api.exception_handlers import app_exception_handler
+from app.api.exception_handlers import app_exception_handler, statement_timeout_handler
+from app.api.routes import admin as admin_router
 from app.api.routes import appointments as appointments_router
+from app.api.routes import availability as availability_router
+from app.api.routes import health as health_router
 from app.api.routes import medspas as medspas_router
 from app.api.routes import services as services_router
 from app.config import settings
-from app.db.database import engine
+from app.db.database import (
+    ReadConsistency,
+    async_engine,
+    engine,
+    parse_consistency_token,
+    read_consistency_ctx,
+)
+from app.db.health import DatabaseProber
+from app.db.invalidation import InvalidationListener
+from app.db.partitions import maintain_partitions
+from app.db.query_stats import QueryStats, check_query_budget, query_stats_ctx, route_key
 from app.exceptions import AppException
 from app.logging_config import request_id_ctx, setup_logging
 from app.utils.ulid import generate_id
 
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     setup_logging(settings.log_level)
+    prober = DatabaseProber(
+        engine,
+        interval=settings.health_probe_interval_seconds,
+        timeout=settings.health_probe_timeout_seconds,
+    )
+    app.state.db_prober = prober
+    # First result before serving, so readiness is known from the first probe request
+    await to_thread.run_sync(prober.probe)
+    probing = asyncio.create_task(prober.run())
+    # First pass right away, in the background: startup does not wait on partition DDL
+    partitioning = asyncio.create_task(
+        maintain_partitions(
+            engine,
+            months_ahead=settings.appointment_partition_months_ahead,
+            interval=settings.appointment_partition_check_hours * 3600,
+            lock_timeout_ms=settings.appointment_partition_lock_timeout_ms,
+        )
+    )
+    listener = None
+    if settings.cache_invalidation_listen:
+        listener = InvalidationListener(
+            engine,
+            heartbeat=settings.cache_invalidation_heartbeat_seconds,
+            max_backoff=settings.cache_invalidation_max_backoff_seconds,
+        )
+        listener.start()
     yield
+    for task in (probing, partitioning):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    prober.close()
+    if listener is not None:
+        listener.stop()
+    # asyncpg connections belong to this event loop
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -34,6 +88,7 @@ app = FastAPI(
 )
 
 app.add_exception_handler(AppException, app_exception_handler)
+app.add_exception_handler(DBAPIError, statement_timeout_handler)
 
 
 class RequestIDMiddleware(BaseHTTPMiddleware):
@@ -51,22 +106,79 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
             request_id_ctx.reset(token)
 
 
-app.add_middleware(RequestIDMiddleware)
+CONSISTENCY_TOKEN_HEADER = "X-Consistency-Token"
+
 
+class ReadConsistencyMiddleware(BaseHTTPMiddleware):
+    """Read-your-writes across requests when reads may be served by a replica.
 
-@app.get("/health")
-def health():
-    try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-    except Exception:
-        return JSONResponse(
-            status_code=503,
-            content={"status": "unhealthy", "detail": "database unavailable"},
+    A request that writes returns the primary's WAL position in X-Consistency-Token. A client
+    that sends the token back gets replica reads only once the replica has replayed that far,
+    and primary reads until then. Without a replica configured no token is issued.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        consistency = ReadConsistency(
+            read_after=parse_consistency_token(request.headers.get(CONSISTENCY_TOKEN_HEADER))
         )
-    return {"status": "ok"}
+        token = read_consistency_ctx.set(consistency)
+        try:
+            response = await call_next(request)
+            if consistency.written is not None:
+                response.headers[CONSISTENCY_TOKEN_HEADER] = consistency.written
+            return response
+        finally:
+            read_consistency_ctx.reset(token)
+
+
+class QueryStatsMiddleware:
+    """Log one summary line per request: status, duration, SQL statements and database time.
+
+    Pure ASGI, so the totals include statements run while a streaming body is sent. Checks the
+    statement count against the route's budget once the response is complete.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats(scope=scope)
+        token = query_stats_ctx.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            query_stats_ctx.reset(token)
+            logger.info(
+                "request_completed route=%s status=%d duration_ms=%.1f db_queries=%d db_ms=%.1f",
+                route_key(scope),
+                status_code,
+                (time.perf_counter() - started) * 1000,
+                stats.statements,
+                stats.db_seconds * 1000,
+            )
+        check_query_budget(route_key(scope), stats)
+
+
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(ReadConsistencyMiddleware)
+app.add_middleware(RequestIDMiddleware)
 
 
+app.include_router(health_router.router)
 app.include_router(medspas_router.router, prefix="/medspas")
 app.include_router(services_router.router, tags=["services"])
 app.include_router(appointments_router.router, tags=["appointments"])
+app.include_router(availability_router.router)
+app.include_router(admin_router.router, prefix="/admin")
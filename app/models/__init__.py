@@ -1,3 +1,17 @@
 from app.models.models import Appointment, Medspa, Service
+from app.models.read_models import (
+    AppointmentRecord,
+    AppointmentServiceRecord,
+    MedspaRecord,
+    ServiceRecord,
+)
 
-__all__ = ["Medspa", "Service", "Appointment"]
+__all__ = [
+    "Medspa",
+    "Service",
+    "Appointment",
+    "MedspaRecord",
+    "ServiceRecord",
+    "AppointmentRecord",
+    "AppointmentServiceRecord",
+]
@@ -1,7 +1,22 @@
-from datetime import datetime
-from typing import Optional
-
-from sqlalchemy import CheckConstraint, Column, DateTime, ForeignKey, Integer, String, Table, Text
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    CheckConstraint,
+    Column,
+    DateTime,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    event,
+    literal_column,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -58,21 +73,51 @@ class Service(Base):
     medspa: Mapped["Medspa"] = relationship("Medspa", back_populates="services")
 
 
-# Association table for appointment <-> services many-to-many
+Index("idx_services_medspa_id_id", Service.medspa_id, Service.id)
+
+# Service catalog version per medspa, bumped with every service write (see schema.sql)
+medspa_catalog_versions_table = Table(
+    "medspa_catalog_versions",
+    Base.metadata,
+    Column("medspa_id", String(26), ForeignKey("medspas.id", ondelete="CASCADE"), primary_key=True),
+    Column("version", BigInteger, nullable=False),
+)
+
+# Association table for appointment <-> services many-to-many. appointment_start_time copies
+# the appointment's start_time, which completes appointments' key and partitions the links by
+# the same months (see sql/schema.sql; create_all builds these tables unpartitioned).
 appointment_services_table = Table(
     "appointment_services",
     Base.metadata,
-    Column(
-        "appointment_id",
-        String(26),
-        ForeignKey("appointments.id", ondelete="CASCADE"),
-        primary_key=True,
-    ),
+    Column("appointment_id", String(26), primary_key=True),
+    Column("appointment_start_time", DateTime(timezone=True), primary_key=True),
     Column(
         "service_id", String(26), ForeignKey("services.id", ondelete="RESTRICT"), primary_key=True
     ),
+    ForeignKeyConstraint(
+        ["appointment_id", "appointment_start_time"],
+        ["appointments.id", "appointments.start_time"],
+        ondelete="CASCADE",
+        onupdate="CASCADE",
+    ),
+    Index("idx_appointment_services_service_id", "service_id"),
 )
 
+# Longest appointment in minutes (its services' durations summed), also a CHECK on appointments.
+# Overlap checks use it as a lower bound on start_time, so they stay within nearby partitions.
+MAX_APPOINTMENT_MINUTES = 24 * 60
+
+
+def tstz_slot(start: Any, end: Any) -> Any:
+    """Half-open [start, end) tstzrange expression used for booking overlap (``&&``) checks."""
+    return func.tstzrange(start, end, literal_column("'[)'"))
+
+
+def _default_end_time(context: Any) -> datetime:
+    """Derive end_time from start_time + total_duration (minutes) on insert."""
+    params = context.get_current_parameters()
+    return params["start_time"] + timedelta(minutes=params["total_duration"])
+
 
 class Appointment(Base):
     __tablename__ = "appointments"
@@ -81,18 +126,28 @@ class Appointment(Base):
             "status IN ('scheduled', 'completed', 'canceled')",
             name="appointments_status_valid",
         ),
+        CheckConstraint("end_time > start_time", name="appointments_end_after_start"),
+        CheckConstraint(
+            f"total_duration <= {MAX_APPOINTMENT_MINUTES}", name="appointments_duration_bounded"
+        ),
     )
 
+    # The key includes start_time, the partition key (see sql/schema.sql)
     id: Mapped[str] = mapped_column(String(26), primary_key=True)
     medspa_id: Mapped[str] = mapped_column(
         String(26), ForeignKey("medspas.id", ondelete="CASCADE"), nullable=False
     )
-    start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
     status: Mapped[str] = mapped_column(String(50), nullable=False)
     total_price: Mapped[int] = mapped_column(
         Integer, nullable=False
     )  # in cents, derived from services
     total_duration: Mapped[int] = mapped_column(Integer, nullable=False)
+    # start_time + total_duration; persisted so overlap checks can use the slot index below.
+    # Also set by DB on insert/update (trg_appointments_end_time trigger) for direct SQL.
+    end_time: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=_default_end_time
+    )
     # Set by DB on insert/update (DEFAULT NOW() and trg_*_updated_at trigger)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -107,3 +162,41 @@ class Appointment(Base):
         secondary=appointment_services_table,
         backref="appointments",
     )
+
+
+# GiST index over (medspa_id, [start_time, end_time)) for scheduled appointments only, so
+# find_scheduled_overlapping is a range probe over nearby bookings instead of a medspa-wide scan.
+# btree_gist provides the GiST equality operator class for medspa_id.
+Index(
+    "idx_appointments_scheduled_slot",
+    Appointment.medspa_id,
+    tstz_slot(Appointment.start_time, Appointment.end_time),
+    postgresql_using="gist",
+    postgresql_where=Appointment.status == "scheduled",
+)
+# Keyset pagination indexes for AppointmentRepository.list, one per filter + sort key combination
+# (see sql/schema.sql; tests/integration/test_query_plans.py checks the plans).
+Index("idx_appointments_medspa_id_id", Appointment.medspa_id, Appointment.id)
+Index(
+    "idx_appointments_medspa_status_id", Appointment.medspa_id, Appointment.status, Appointment.id
+)
+Index("idx_appointments_status_id", Appointment.status, Appointment.id)
+Index("idx_appointments_start_time_id", Appointment.start_time, Appointment.id)
+Index(
+    "idx_appointments_medspa_start_time_id",
+    Appointment.medspa_id,
+    Appointment.start_time,
+    Appointment.id,
+)
+Index(
+    "idx_appointments_scheduled_medspa_start_time_id",
+    Appointment.medspa_id,
+    Appointment.start_time,
+    Appointment.id,
+    postgresql_where=Appointment.status == "scheduled",
+)
+event.listen(
+    Appointment.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,63 @@
+"""Read models: immutable __slots__ records for GET paths.
+
+Repositories map Core select() rows straight into these, so reads skip the identity map,
+instance state and attribute instrumentation that ORM entities carry. Field names match the
+ORM models, so response schemas accept either. Writes still load entities.
+"""
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class MedspaRecord:
+    id: str
+    name: str
+    address: str
+    phone_number: str
+    email: str
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceRecord:
+    id: str
+    medspa_id: str
+    name: str
+    description: Optional[str]
+    price: int  # in cents
+    duration: int
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class AppointmentServiceRecord:
+    """A service as listed on an appointment."""
+
+    id: str
+    name: str
+    price: int  # in cents
+    duration: int
+
+
+@dataclass(frozen=True, slots=True)
+class AppointmentRecord:
+    id: str
+    medspa_id: str
+    start_time: datetime
+    status: str
+    total_price: int  # in cents
+    total_duration: int
+    created_at: datetime
+    updated_at: datetime
+    services: list[AppointmentServiceRecord]
+
+
+def record_columns(
+    model: type[Any], record: type[Any], exclude: tuple[str, ...] = ()
+) -> tuple[Any, ...]:
+    """model's columns in record's field order, so record(*row) maps a selected row."""
+    return tuple(getattr(model, f.name) for f in fields(record) if f.name not in exclude)
@@ -1,21 +1,214 @@
 """Persistence only for Appointment aggregate. No business rules."""
 
 import builtins
-from datetime import datetime
-from typing import Optional
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from operator import attrgetter
+from typing import Any, Optional
 
-from sqlalchemy import text
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    RowMapping,
+    and_,
+    bindparam,
+    func,
+    insert,
+    literal_column,
+    select,
+    text,
+    true,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import Session, selectinload
 
+from app.db.database import on_replica
 from app.exceptions import NotFoundError
-from app.models.models import Appointment, appointment_services_table
-from app.schemas.appointments import AppointmentStatus
+from app.models.models import (
+    MAX_APPOINTMENT_MINUTES,
+    Appointment,
+    Service,
+    appointment_services_table,
+    tstz_slot,
+)
+from app.models.read_models import AppointmentRecord, AppointmentServiceRecord, record_columns
+from app.schemas.appointments import AppointmentSort, AppointmentStatus
+from app.utils.query import JsonPage, json_page
+
+# One statement: resolve medspa + services, compute totals, check conflicts under the same
+# slot expression as idx_appointments_scheduled_slot, and insert the appointment and its
+# links only when everything is valid. Always returns exactly one diagnostic row. The conflict
+# probe's start_time bounds come from parameters, so only the slot's partitions are planned.
+_INSERT_IF_AVAILABLE_SQL = text(
+    """
+WITH requested AS (
+    SELECT s.id, s.medspa_id, s.name, s.price, s.duration
+    FROM services s
+    WHERE s.id IN :service_ids
+),
+totals AS (
+    SELECT count(*) AS n,
+           count(*) FILTER (WHERE medspa_id = :medspa_id) AS n_owned,
+           coalesce(sum(price), 0) AS total_price,
+           coalesce(sum(duration), 0) AS total_duration
+    FROM requested
+),
+slot AS (
+    SELECT CAST(:start_time AS timestamptz) AS start_time,
+           CAST(:start_time AS timestamptz) + total_duration * interval '1 minute' AS end_time
+    FROM totals
+),
+medspa AS (
+    SELECT EXISTS (SELECT 1 FROM medspas WHERE id = :medspa_id) AS found
+),
+conflict AS (
+    SELECT EXISTS (
+        SELECT 1
+        FROM slot, appointments a
+        JOIN appointment_services l
+          ON l.appointment_id = a.id AND l.appointment_start_time = a.start_time
+        WHERE a.medspa_id = :medspa_id
+          AND a.status = 'scheduled'
+          AND a.start_time > CAST(:start_time AS timestamptz) - :max_minutes * interval '1 minute'
+          AND a.start_time < CAST(:start_time AS timestamptz) + :max_minutes * interval '1 minute'
+          AND l.appointment_start_time
+              > CAST(:start_time AS timestamptz) - :max_minutes * interval '1 minute'
+          AND l.appointment_start_time
+              < CAST(:start_time AS timestamptz) + :max_minutes * interval '1 minute'
+          AND tstzrange(a.start_time, a.end_time, '[)')
+              && tstzrange(slot.start_time, slot.end_time, '[)')
+          AND l.service_id IN :service_ids
+    ) AS found
+),
+inserted AS (
+    INSERT INTO appointments
+        (id, medspa_id, start_time, status, total_price, total_duration, end_time)
+    SELECT :id, :medspa_id, slot.start_time, 'scheduled',
+           totals.total_price, totals.total_duration, slot.end_time
+    FROM totals, slot, medspa, conflict
+    WHERE medspa.found
+      AND totals.n = :n_services
+      AND totals.n_owned = totals.n
+      AND totals.total_duration <= :max_minutes
+      AND NOT conflict.found
+    RETURNING id, medspa_id, start_time, status, total_price, total_duration, end_time,
+              created_at, updated_at
+),
+links AS (
+    INSERT INTO appointment_services (appointment_id, appointment_start_time, service_id)
+    SELECT inserted.id, inserted.start_time, requested.id FROM inserted, requested
+)
+SELECT medspa.found AS medspa_found,
+       conflict.found AS conflict,
+       (SELECT total_duration FROM totals) AS duration,
+       (SELECT coalesce(json_agg(json_build_object(
+                    'id', r.id, 'medspa_id', r.medspa_id, 'name', r.name,
+                    'price', r.price, 'duration', r.duration)), '[]')
+        FROM requested r) AS services,
+       inserted.*
+FROM medspa CROSS JOIN conflict LEFT JOIN inserted ON true
+"""
+).bindparams(bindparam("service_ids", expanding=True))
+
+
+@dataclass
+class BookingAttempt:
+    """Outcome of insert_if_available: what the database saw, and the appointment if inserted."""
+
+    medspa_found: bool
+    conflict: bool
+    duration: int = 0  # minutes, summed over the services found
+    services: list[Service] = field(default_factory=list)
+    appointment: Optional[Appointment] = None
+
+
+_COLUMNS = record_columns(Appointment, AppointmentRecord, exclude=("services",))
+_SERVICE_COLUMNS = record_columns(Service, AppointmentServiceRecord)
+_LINK = appointment_services_table.c
+# Links join on the whole appointment key, so a start_time window also prunes link partitions
+_LINKED = and_(
+    Appointment.id == _LINK.appointment_id, Appointment.start_time == _LINK.appointment_start_time
+)
+_MAX_DURATION = timedelta(minutes=MAX_APPOINTMENT_MINUTES)
+
+
+def _records_with_services(db: Session, rows: Sequence[Row[Any]]) -> list[AppointmentRecord]:
+    """Map appointment rows to records, loading all their services in one more SELECT.
+
+    Only used by replica-eligible reads, so the services come from the same server as rows. The
+    page's start_time range limits the SELECT to the link partitions of those months.
+    """
+    services: dict[str, list[AppointmentServiceRecord]] = {row.id: [] for row in rows}
+    if services:
+        stmt = (
+            select(_LINK.appointment_id, *_SERVICE_COLUMNS)
+            .select_from(appointment_services_table)
+            .join(Service, Service.id == _LINK.service_id)
+            .where(
+                _LINK.appointment_id.in_(services),
+                _LINK.appointment_start_time.between(
+                    min(row.start_time for row in rows), max(row.start_time for row in rows)
+                ),
+            )
+        )
+        for appointment_id, *service in db.execute(on_replica(stmt)):
+            services[appointment_id].append(AppointmentServiceRecord(*service))
+    return [
+        AppointmentRecord(*row, services=sorted(services[row.id], key=attrgetter("id")))
+        for row in rows
+    ]
+
+
+def _list_criteria(
+    medspa_id: Optional[str],
+    status: Optional[str],
+    after: Optional[tuple[Any, ...]],
+    sort: AppointmentSort,
+    start_from: Optional[datetime],
+    start_to: Optional[datetime],
+) -> tuple[list[ColumnElement[bool]], tuple[Any, ...], bool]:
+    """WHERE clauses, sort key columns and direction shared by list() and list_json()."""
+    criteria: list[ColumnElement[bool]] = []
+    if medspa_id is not None:
+        criteria.append(Appointment.medspa_id == medspa_id)
+    if status is not None:
+        criteria.append(Appointment.status == status)
+    if start_from is not None:
+        criteria.append(Appointment.start_time >= start_from)
+    if start_to is not None:
+        criteria.append(Appointment.start_time < start_to)
+    descending = sort == AppointmentSort.START_TIME_DESC
+    if sort == AppointmentSort.ID:
+        key_columns: tuple[Any, ...] = (Appointment.id,)
+    else:
+        key_columns = (Appointment.start_time, Appointment.id)
+    if after is not None:
+        key = tuple_(*key_columns)
+        criteria.append(key < after if descending else key > after)
+    return criteria, key_columns, descending
+
+
+def _service_json() -> ColumnElement[Any]:
+    """A service as nested in appointment items: {id, name, price, duration}."""
+    return func.json_build_object(
+        "id", Service.id, "name", Service.name, "price", Service.price, "duration", Service.duration
+    )
 
 
 class AppointmentRepository:
     @staticmethod
-    def get_by_id(db: Session, id: str) -> Appointment:
-        """Load a single appointment by id with services eager-loaded. Raises NotFoundError if missing."""
+    def get_by_id(db: Session, id: str) -> AppointmentRecord:
+        """Read a single appointment with its services. Raises NotFoundError if missing."""
+        row = db.execute(on_replica(select(*_COLUMNS).where(Appointment.id == id))).first()
+        if not row:
+            raise NotFoundError("Appointment not found")
+        return _records_with_services(db, [row])[0]
+
+    @staticmethod
+    def load(db: Session, id: str) -> Appointment:
+        """Load the appointment entity (with services) for a write. Raises NotFoundError if missing."""
         appointment = (
             db.query(Appointment)
             .options(selectinload(Appointment.services))
@@ -26,56 +219,260 @@ class AppointmentRepository:
             raise NotFoundError("Appointment not found")
         return appointment
 
+    @staticmethod
+    def lock_services(
+        db: Session, medspa_id: str, service_ids: builtins.list[str], lock_timeout_ms: int
+    ) -> None:
+        """Take transaction-scoped advisory locks on each (medspa, service) pair, in sorted order.
+
+        Concurrent bookings that share a service serialize here; bookings for other services do
+        not wait. Sorted acquisition prevents deadlocks. Raises a DBAPIError (lock_not_available,
+        see is_lock_contention_error) if a lock is not granted within lock_timeout_ms. Must run
+        inside a transaction.
+        """
+        keys = sorted(f"{medspa_id}:{service_id}" for service_id in set(service_ids))
+        # Two statements: asyncpg prepares each one, and a prepared statement holds one command
+        db.execute(
+            text("SELECT set_config('lock_timeout', :lock_timeout, true)"),
+            {"lock_timeout": f"{lock_timeout_ms}ms"},
+        )
+        db.execute(
+            text(
+                "SELECT pg_advisory_xact_lock(hashtextextended(k, 0))"
+                " FROM unnest(CAST(:keys AS text[])) WITH ORDINALITY AS t(k, ord) ORDER BY ord"
+            ),
+            {"keys": keys},
+        )
+
+    @staticmethod
+    def _scheduled_overlap_filters(
+        medspa_id: str, start_time: datetime, end_time: datetime, service_ids: builtins.list[str]
+    ) -> builtins.list[Any]:
+        """Filters for scheduled appointments at this medspa overlapping [start_time, end_time) on any service.
+
+        The slot filter matches idx_appointments_scheduled_slot, so cost depends on nearby bookings only.
+        An overlapping booking starts before end_time and at most MAX_APPOINTMENT_MINUTES before
+        start_time; those bounds, on both tables, leave only the window's partitions to probe.
+        """
+        overlaps = tstz_slot(Appointment.start_time, Appointment.end_time).op(
+            "&&", is_comparison=True
+        )(tstz_slot(start_time, end_time))
+        earliest = start_time - _MAX_DURATION
+        return [
+            Appointment.medspa_id == medspa_id,
+            Appointment.status == AppointmentStatus.SCHEDULED,
+            overlaps,
+            Appointment.start_time > earliest,
+            Appointment.start_time < end_time,
+            _LINK.appointment_start_time > earliest,
+            _LINK.appointment_start_time < end_time,
+            _LINK.service_id.in_(service_ids),
+        ]
+
     @staticmethod
     def find_scheduled_overlapping(
         db: Session,
         medspa_id: str,
         start_time: datetime,
         end_time: datetime,
-        service_ids: list[str],
-    ) -> list[Appointment]:
+        service_ids: builtins.list[str],
+    ) -> builtins.list[Appointment]:
         """Return scheduled appointments at this medspa that overlap [start_time, end_time) and use any of the given services."""
         if not service_ids:
             return []
-        overlap_end = text(
-            "appointments.start_time + (appointments.total_duration * interval '1 minute') > :start_time"
-        )
         return (
             db.query(Appointment)
-            .join(
-                appointment_services_table,
-                Appointment.id == appointment_services_table.c.appointment_id,
+            .join(appointment_services_table, _LINKED)
+            .filter(
+                *AppointmentRepository._scheduled_overlap_filters(
+                    medspa_id, start_time, end_time, service_ids
+                )
             )
+            .distinct()
+            .all()
+        )
+
+    @staticmethod
+    def list_scheduled_slots(
+        db: Session,
+        medspa_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        service_ids: builtins.list[str],
+    ) -> builtins.list[tuple[datetime, datetime]]:
+        """Return (start_time, end_time) of bookings find_scheduled_overlapping would report for this window.
+
+        Same overlap semantics, but only the two columns an availability sweep needs.
+        """
+        if not service_ids:
+            return []
+        rows = (
+            db.query(Appointment.start_time, Appointment.end_time)
+            .join(appointment_services_table, _LINKED)
             .filter(
-                Appointment.medspa_id == medspa_id,
-                Appointment.status == AppointmentStatus.SCHEDULED,
-                Appointment.start_time < end_time,
-                overlap_end,
-                appointment_services_table.c.service_id.in_(service_ids),
+                *AppointmentRepository._scheduled_overlap_filters(
+                    medspa_id, start_time, end_time, service_ids
+                )
             )
-            .params(start_time=start_time)
             .distinct()
             .all()
         )
+        return [(row.start_time, row.end_time) for row in rows]
+
+    @staticmethod
+    def list_scheduled_slots_by_service(
+        db: Session,
+        medspa_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        service_ids: builtins.list[str],
+    ) -> dict[str, builtins.list[tuple[datetime, datetime]]]:
+        """Like list_scheduled_slots, but grouped per service id (one query)."""
+        slots: dict[str, builtins.list[tuple[datetime, datetime]]] = {}
+        if not service_ids:
+            return slots
+        rows = (
+            db.query(
+                _LINK.service_id,
+                Appointment.start_time,
+                Appointment.end_time,
+            )
+            .select_from(Appointment)
+            .join(appointment_services_table, _LINKED)
+            .filter(
+                *AppointmentRepository._scheduled_overlap_filters(
+                    medspa_id, start_time, end_time, service_ids
+                )
+            )
+            .all()
+        )
+        for row in rows:
+            slots.setdefault(row.service_id, []).append((row.start_time, row.end_time))
+        return slots
 
     @staticmethod
     def list(
         db: Session,
         medspa_id: Optional[str] = None,
         status: Optional[str] = None,
-        cursor: Optional[str] = None,
+        after: Optional[tuple[Any, ...]] = None,
+        limit: int = 20,
+        sort: AppointmentSort = AppointmentSort.ID,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+    ) -> builtins.list[AppointmentRecord]:
+        """Return up to limit+1 items in sort order, strictly after the keyset position `after`.
+
+        `after` is the sort key of the previous page's last item: (id,) for ID, (start_time, id)
+        otherwise. Keys compare as a row value, so each page is one range scan on the matching
+        composite index (idx_appointments_*_start_time_id / idx_appointments_medspa_id_id).
+        start_from (inclusive) and start_to (exclusive) bound start_time; with medspa_id they
+        are a range on idx_appointments_medspa_start_time_id. They also limit the scan to the
+        monthly partitions the window covers.
+        """
+        criteria, key_columns, descending = _list_criteria(
+            medspa_id, status, after, sort, start_from, start_to
+        )
+        stmt = (
+            select(*_COLUMNS)
+            .where(*criteria)
+            .order_by(*(c.desc() if descending else c for c in key_columns))
+            .limit(limit + 1)
+        )
+        return _records_with_services(db, db.execute(on_replica(stmt)).all())
+
+    @staticmethod
+    def list_json(
+        db: Session,
+        medspa_id: Optional[str] = None,
+        status: Optional[str] = None,
+        after: Optional[tuple[Any, ...]] = None,
         limit: int = 20,
-    ) -> list[Appointment]:
-        """Return up to limit+1 items ordered by id, after cursor (exclusive)."""
-        q = db.query(Appointment).options(selectinload(Appointment.services))
+        sort: AppointmentSort = AppointmentSort.ID,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+    ) -> JsonPage:
+        """Same page as list(), rendered by Postgres in AppointmentResponse's shape.
+
+        Services are nested through a LATERAL subquery (one appointment_services probe per page
+        row), so there is no second selectinload query and no ORM objects are built.
+        """
+        criteria, key_columns, descending = _list_criteria(
+            medspa_id, status, after, sort, start_from, start_to
+        )
+        services = (
+            select(func.json_agg(aggregate_order_by(_service_json(), Service.id)).label("services"))
+            .select_from(appointment_services_table)
+            .join(Service, Service.id == _LINK.service_id)
+            .where(_LINKED)
+            .lateral("appointment_service_list")
+        )
+        stmt = (
+            select(
+                Appointment.id,
+                Appointment.medspa_id,
+                Appointment.start_time,
+                Appointment.status,
+                Appointment.total_price,
+                Appointment.total_duration,
+                func.coalesce(services.c.services, literal_column("'[]'::json")).label("services"),
+                Appointment.created_at,
+                Appointment.updated_at,
+            )
+            .join(services, true())
+            .where(*criteria)
+        )
+        return json_page(
+            db, on_replica(stmt), [c.key for c in key_columns], limit, descending=descending
+        )
+
+    @staticmethod
+    def iter_export_rows(
+        db: Session,
+        medspa_id: Optional[str] = None,
+        status: Optional[str] = None,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[RowMapping]:
+        """Stream matching appointments in (start_time, id) order, one mapping per row.
+
+        Rows come through a server-side cursor, batch_size at a time, so memory stays flat for
+        any result size. Each row's services are aggregated in SQL into a JSON array of
+        {id, name, price, duration}; no ORM objects or relationship loads are involved.
+        """
+        services = (
+            select(func.json_agg(aggregate_order_by(_service_json(), Service.id)))
+            .select_from(appointment_services_table)
+            .join(Service, Service.id == _LINK.service_id)
+            .where(_LINKED)
+            .scalar_subquery()
+        )
+        stmt = select(
+            Appointment.id,
+            Appointment.medspa_id,
+            Appointment.start_time,
+            Appointment.end_time,
+            Appointment.status,
+            Appointment.total_price,
+            Appointment.total_duration,
+            Appointment.created_at,
+            services.label("services"),
+        )
         if medspa_id is not None:
-            q = q.filter(Appointment.medspa_id == medspa_id)
+            stmt = stmt.where(Appointment.medspa_id == medspa_id)
         if status is not None:
-            q = q.filter(Appointment.status == status)
-        q = q.order_by(Appointment.id)
-        if cursor is not None:
-            q = q.filter(Appointment.id > cursor)
-        return q.limit(limit + 1).all()
+            stmt = stmt.where(Appointment.status == status)
+        if start_from is not None:
+            stmt = stmt.where(Appointment.start_time >= start_from)
+        if start_to is not None:
+            stmt = stmt.where(Appointment.start_time < start_to)
+        stmt = stmt.order_by(Appointment.start_time, Appointment.id)
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        try:
+            yield from result.mappings()
+        finally:
+            result.close()
 
     @staticmethod
     def create_with_services(
@@ -86,14 +483,129 @@ class AppointmentRepository:
         """Insert a new appointment and its service links. For updates use update()."""
         db.add(appointment)
         db.flush()
-        for service_id in service_ids:
+        AppointmentRepository._insert_links(
+            db,
+            [
+                {
+                    "appointment_id": appointment.id,
+                    "appointment_start_time": appointment.start_time,
+                    "service_id": sid,
+                }
+                for sid in service_ids
+            ],
+        )
+        return appointment
+
+    @staticmethod
+    def _insert_links(db: Session, links: builtins.list[dict[str, Any]]) -> None:
+        """Write appointment_services rows as one multi-VALUES INSERT (one round trip for N)."""
+        if links:
+            db.execute(appointment_services_table.insert().values(links))
+
+    @staticmethod
+    def insert_if_available(
+        db: Session,
+        id: str,
+        medspa_id: str,
+        start_time: datetime,
+        service_ids: builtins.list[str],
+    ) -> BookingAttempt:
+        """Validate, conflict-check and insert an appointment with its service links in one statement.
+
+        The appointment is inserted only if the medspa exists, every service exists and belongs
+        to it, and no scheduled booking of those services overlaps. The returned appointment is
+        built from RETURNING (services included) and is not attached to the session, so reading
+        it after commit issues no further queries. Call lock_services first in the same
+        transaction to make the conflict check race-free.
+        """
+        row = (
             db.execute(
-                appointment_services_table.insert().values(
-                    appointment_id=appointment.id,
-                    service_id=service_id,
-                )
+                _INSERT_IF_AVAILABLE_SQL,
+                {
+                    "id": id,
+                    "medspa_id": medspa_id,
+                    "start_time": start_time,
+                    "service_ids": service_ids,
+                    "n_services": len(service_ids),
+                    "max_minutes": MAX_APPOINTMENT_MINUTES,
+                },
             )
-        return appointment
+            .mappings()
+            .one()
+        )
+        position = {service_id: i for i, service_id in enumerate(service_ids)}
+        services = [
+            Service(**s)
+            for s in sorted(row["services"], key=lambda s: position.get(s["id"], len(position)))
+        ]
+        appointment = None
+        if row["id"] is not None:
+            appointment = Appointment(
+                id=row["id"],
+                medspa_id=row["medspa_id"],
+                start_time=row["start_time"],
+                status=row["status"],
+                total_price=row["total_price"],
+                total_duration=row["total_duration"],
+                end_time=row["end_time"],
+                created_at=row["created_at"],
+                updated_at=row["updated_at"],
+                services=services,
+            )
+        return BookingAttempt(
+            medspa_found=row["medspa_found"],
+            conflict=row["conflict"],
+            duration=row["duration"],
+            services=services,
+            appointment=appointment,
+        )
+
+    @staticmethod
+    def create_many_with_services(
+        db: Session,
+        appointments: builtins.list[Appointment],
+        service_ids: builtins.list[builtins.list[str]],
+    ) -> builtins.list[Appointment]:
+        """Insert many new appointments and all their service links with two multi-row INSERTs.
+
+        service_ids[i] are the links for appointments[i]. Appointments stay transient (not added to
+        the session); created_at/updated_at are filled in from RETURNING, so reading them after
+        commit issues no further queries.
+        """
+        if not appointments:
+            return appointments
+        table = Appointment.__table__
+        columns = (
+            "id",
+            "medspa_id",
+            "start_time",
+            "status",
+            "total_price",
+            "total_duration",
+            "end_time",
+        )
+        result = db.execute(
+            insert(table).returning(
+                table.c.id, table.c.created_at, table.c.updated_at, sort_by_parameter_order=True
+            ),
+            [{c: getattr(a, c) for c in columns} for a in appointments],
+        )
+        for appointment, row in zip(appointments, result, strict=True):
+            appointment.created_at = row.created_at
+            appointment.updated_at = row.updated_at
+        AppointmentRepository._insert_links(
+            db,
+            [
+                {
+                    "appointment_id": a.id,
+                    "appointment_start_time": a.start_time,
+                    "service_id": service_id,
+                }
+                for a, ids in zip(appointments, service_ids, strict=True)
+                for service_id in ids
+            ],
+        )
+        return appointments
 
     @staticmethod
     def update(db: Session, appointment: Appointment) -> Appointment:
@@ -2,19 +2,51 @@
 
 from typing import Optional
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.db.database import on_replica
 from app.models.models import Medspa
+from app.models.read_models import MedspaRecord, record_columns
+from app.utils.query import JsonPage, json_page
+
+_COLUMNS = record_columns(Medspa, MedspaRecord)
 
 
 class MedspaRepository:
     @staticmethod
-    def list(db: Session, cursor: Optional[str] = None, limit: int = 20) -> list[Medspa]:
+    def get_by_id(db: Session, id: str) -> Optional[MedspaRecord]:
+        """Read on the primary, never the replica: this loads MedspaService's medspa_cache.
+
+        Cached entries, misses included, are served to every request whether or not it carries
+        a consistency token, so a lagging replica must not be their source.
+        """
+        row = db.execute(select(*_COLUMNS).where(Medspa.id == id)).first()
+        return MedspaRecord(*row) if row else None
+
+    @staticmethod
+    def list(db: Session, cursor: Optional[str] = None, limit: int = 20) -> list[MedspaRecord]:
         """Return up to limit+1 items ordered by id, after cursor (exclusive)."""
-        q = db.query(Medspa).order_by(Medspa.id)
+        stmt = select(*_COLUMNS).order_by(Medspa.id)
+        if cursor is not None:
+            stmt = stmt.where(Medspa.id > cursor)
+        return [MedspaRecord(*row) for row in db.execute(on_replica(stmt.limit(limit + 1)))]
+
+    @staticmethod
+    def list_json(db: Session, cursor: Optional[str] = None, limit: int = 20) -> JsonPage:
+        """Same page as list(), rendered by Postgres in MedspaResponse's shape."""
+        stmt = select(
+            Medspa.id,
+            Medspa.name,
+            Medspa.address,
+            Medspa.phone_number,
+            Medspa.email,
+            Medspa.created_at,
+            Medspa.updated_at,
+        )
         if cursor is not None:
-            q = q.filter(Medspa.id > cursor)
-        return q.limit(limit + 1).all()
+            stmt = stmt.where(Medspa.id > cursor)
+        return json_page(db, on_replica(stmt), ["id"], limit)
 
     @staticmethod
     def create(db: Session, medspa: Medspa) -> Medspa:
@@ -2,27 +2,94 @@
 
 from typing import Optional
 
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from app.models.models import Service
+from app.db.database import on_replica
+from app.models.models import Service, medspa_catalog_versions_table
+from app.models.read_models import ServiceRecord, record_columns
+from app.utils.query import JsonPage, json_page
+
+_COLUMNS = record_columns(Service, ServiceRecord)
 
 
 class ServiceRepository:
+    @staticmethod
+    def get_by_id(db: Session, id: str) -> Optional[ServiceRecord]:
+        row = db.execute(on_replica(select(*_COLUMNS).where(Service.id == id))).first()
+        return ServiceRecord(*row) if row else None
+
     @staticmethod
     def list_by_medspa_id(
         db: Session, medspa_id: str, cursor: Optional[str] = None, limit: int = 20
-    ) -> list[Service]:
+    ) -> list[ServiceRecord]:
         """Return up to limit+1 items ordered by id, after cursor (exclusive)."""
-        q = db.query(Service).filter(Service.medspa_id == medspa_id).order_by(Service.id)
+        stmt = select(*_COLUMNS).where(Service.medspa_id == medspa_id).order_by(Service.id)
+        if cursor is not None:
+            stmt = stmt.where(Service.id > cursor)
+        return [ServiceRecord(*row) for row in db.execute(on_replica(stmt.limit(limit + 1)))]
+
+    @staticmethod
+    def list_by_medspa_id_json(
+        db: Session, medspa_id: str, cursor: Optional[str] = None, limit: int = 20
+    ) -> JsonPage:
+        """Same page as list_by_medspa_id(), rendered by Postgres in ServiceResponse's shape."""
+        stmt = select(
+            Service.id,
+            Service.medspa_id,
+            Service.name,
+            Service.description,
+            Service.price,
+            Service.duration,
+            Service.created_at,
+            Service.updated_at,
+        ).where(Service.medspa_id == medspa_id)
         if cursor is not None:
-            q = q.filter(Service.id > cursor)
-        return q.limit(limit + 1).all()
+            stmt = stmt.where(Service.id > cursor)
+        return json_page(db, on_replica(stmt), ["id"], limit)
 
     @staticmethod
-    def find_by_ids(db: Session, ids: list[str]) -> list[Service]:
+    def list_catalog(db: Session, medspa_id: str) -> list[ServiceRecord]:
+        """All of a medspa's services, in id order."""
+        stmt = select(*_COLUMNS).where(Service.medspa_id == medspa_id).order_by(Service.id)
+        return [ServiceRecord(*row) for row in db.execute(stmt)]
+
+    @staticmethod
+    def find_by_ids(db: Session, ids: list[str]) -> list[ServiceRecord]:
         if not ids:
             return []
-        return db.query(Service).filter(Service.id.in_(ids)).all()
+        return [
+            ServiceRecord(*row) for row in db.execute(select(*_COLUMNS).where(Service.id.in_(ids)))
+        ]
+
+    @staticmethod
+    def catalog_version(db: Session, medspa_id: str) -> int:
+        """Current catalog version of the medspa; 0 before its first service write."""
+        version = db.execute(
+            select(medspa_catalog_versions_table.c.version).where(
+                medspa_catalog_versions_table.c.medspa_id == medspa_id
+            )
+        ).scalar()
+        return version or 0
+
+    @staticmethod
+    def bump_catalog_version(db: Session, medspa_id: str) -> int:
+        """Increment the medspa's catalog version; call in the transaction of the service write.
+
+        The upsert row-locks the version, so concurrent writers to one catalog serialize and
+        each commit publishes a distinct version.
+        """
+        table = medspa_catalog_versions_table
+        stmt = (
+            insert(table)
+            .values(medspa_id=medspa_id, version=1)
+            .on_conflict_do_update(
+                index_elements=[table.c.medspa_id], set_={"version": table.c.version + 1}
+            )
+            .returning(table.c.version)
+        )
+        return db.execute(stmt).scalar_one()
 
     @staticmethod
     def create(db: Session, service: Service) -> Service:
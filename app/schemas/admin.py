@@ -0,0 +1,19 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class PoolStatsResponse(BaseModel):
+    pid: int = Field(..., description="Worker process the numbers belong to")
+    pool_class: str
+    size: Optional[int] = Field(None, description="Connections kept open (pool_size)")
+    max_overflow: Optional[int] = None
+    checked_in: Optional[int] = Field(None, description="Idle connections in the pool now")
+    checked_out: Optional[int] = Field(None, description="Connections in use now")
+    overflow: Optional[int] = Field(None, description="Connections open beyond size now")
+    checkouts: int = Field(..., description="Successful checkouts since start")
+    timeouts: int = Field(..., description="Checkouts that gave up after pool_timeout")
+    wait_mean_ms: float = Field(..., description="Mean time to get a connection")
+    wait_max_ms: float = Field(..., description="Longest time to get a connection")
+    peak_checked_out: int
+    peak_overflow: int
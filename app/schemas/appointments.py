@@ -1,11 +1,12 @@
 from datetime import datetime, timezone
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 if TYPE_CHECKING:
     from app.models.models import Appointment
+    from app.models.read_models import AppointmentRecord
 
 
 class AppointmentStatus(str, Enum):
@@ -14,6 +15,23 @@ class AppointmentStatus(str, Enum):
     CANCELED = "canceled"
 
 
+class AppointmentSort(str, Enum):
+    """List order; every option is a keyset over a unique key, id breaking start_time ties."""
+
+    ID = "id"
+    START_TIME = "start_time"
+    START_TIME_DESC = "-start_time"
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        return "application/x-ndjson" if self is ExportFormat.NDJSON else "text/csv"
+
+
 # Valid status transitions: from_status -> set of allowed to_status
 # scheduled -> completed, canceled; completed and canceled are final (no transitions)
 VALID_STATUS_TRANSITIONS: dict[AppointmentStatus, tuple[AppointmentStatus, ...]] = {
@@ -23,7 +41,13 @@ VALID_STATUS_TRANSITIONS: dict[AppointmentStatus, tuple[AppointmentStatus, ...]]
 }
 
 
-class AppointmentCreate(BaseModel):
+class AppointmentBatchItem(BaseModel):
+    """One item of a batch booking.
+
+    A past start_time is not a validation error here: the batch reports it as that item's
+    outcome (BatchItemStatus.INVALID) and still books the other items.
+    """
+
     start_time: datetime
     service_ids: list[str] = Field(..., min_length=1)
 
@@ -32,6 +56,8 @@ class AppointmentCreate(BaseModel):
     def unique_service_ids(cls, v: list[str]) -> list[str]:
         return list(dict.fromkeys(v))
 
+
+class AppointmentCreate(AppointmentBatchItem):
     @field_validator("start_time")
     @classmethod
     def start_time_not_in_past(cls, v: datetime) -> datetime:
@@ -43,6 +69,13 @@ class AppointmentCreate(BaseModel):
         return v
 
 
+MAX_BATCH_SIZE = 500
+
+
+class AppointmentBatchCreate(BaseModel):
+    appointments: list[AppointmentBatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
 class AppointmentStatusUpdate(BaseModel):
     status: AppointmentStatus
 
@@ -68,8 +101,10 @@ class AppointmentResponse(BaseModel):
     updated_at: datetime
 
     @classmethod
-    def from_appointment(cls, appointment: "Appointment") -> "AppointmentResponse":
-        """Map ORM Appointment to AppointmentResponse. Keeps serialization in one place."""
+    def from_appointment(
+        cls, appointment: "Appointment | AppointmentRecord"
+    ) -> "AppointmentResponse":
+        """Map an Appointment (entity or record) to AppointmentResponse, in one place."""
         services = [ServiceInAppointment.model_validate(s) for s in appointment.services]
         return cls(
             id=appointment.id,
@@ -82,3 +117,41 @@ class AppointmentResponse(BaseModel):
             created_at=appointment.created_at,
             updated_at=appointment.updated_at,
         )
+
+    @staticmethod
+    def content_from_appointment(appointment: "Appointment | AppointmentRecord") -> dict[str, Any]:
+        """from_appointment's fields as plain values for FastJSONResponse; builds no models."""
+        return {
+            "id": appointment.id,
+            "medspa_id": appointment.medspa_id,
+            "start_time": appointment.start_time,
+            "status": AppointmentStatus(appointment.status),
+            "total_price": appointment.total_price,
+            "total_duration": appointment.total_duration,
+            "services": [
+                {"id": s.id, "name": s.name, "price": s.price, "duration": s.duration}
+                for s in appointment.services
+            ],
+            "created_at": appointment.created_at,
+            "updated_at": appointment.updated_at,
+        }
+
+
+class BatchItemStatus(str, Enum):
+    CREATED = "created"
+    CONFLICT = "conflict"
+    INVALID = "invalid"
+
+
+class AppointmentBatchItemResult(BaseModel):
+    index: int  # position in the request's appointments list
+    status: BatchItemStatus
+    appointment: Optional[AppointmentResponse] = None
+    detail: Optional[str] = None
+
+
+class AppointmentBatchResponse(BaseModel):
+    created: int
+    conflicts: int
+    invalid: int
+    results: list[AppointmentBatchItemResult]
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+# e.g. "15m", "30m", "1h"
+GRANULARITY_PATTERN = r"^[1-9][0-9]*[mh]$"
+
+
+def parse_granularity(value: str) -> int:
+    """Convert a granularity like '15m' or '1h' (already matched GRANULARITY_PATTERN) to minutes."""
+    amount = int(value[:-1])
+    return amount * 60 if value.endswith("h") else amount
+
+
+class AvailabilityResponse(BaseModel):
+    medspa_id: str
+    service_ids: list[str]
+    duration: int = Field(..., description="Total duration of the requested services, in minutes")
+    granularity: int = Field(..., description="Spacing of candidate start times, in minutes")
+    slots: list[datetime] = Field(
+        ..., description="Open start times; each slot [start, start + duration) fits the window"
+    )
@@ -1,11 +1,12 @@
 import re
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 if TYPE_CHECKING:
     from app.models.models import Medspa
+    from app.models.read_models import MedspaRecord
 
 # Matches 10 US digits with optional leading +1/1 and common separators.
 _US_PHONE_DIGITS_RE = re.compile(r"[^\d]")
@@ -59,6 +60,19 @@ class MedspaResponse(BaseModel):
     updated_at: datetime
 
     @classmethod
-    def from_medspa(cls, medspa: "Medspa") -> "MedspaResponse":
-        """Map ORM Medspa to MedspaResponse. Keeps serialization in one place."""
+    def from_medspa(cls, medspa: "Medspa | MedspaRecord") -> "MedspaResponse":
+        """Map a Medspa (entity or record) to MedspaResponse. Keeps serialization in one place."""
         return cls.model_validate(medspa)
+
+    @staticmethod
+    def content_from_medspa(medspa: "Medspa | MedspaRecord") -> dict[str, Any]:
+        """from_medspa's fields as plain values for FastJSONResponse; builds no model."""
+        return {
+            "id": medspa.id,
+            "name": medspa.name,
+            "address": medspa.address,
+            "phone_number": medspa.phone_number,
+            "email": medspa.email,
+            "created_at": medspa.created_at,
+            "updated_at": medspa.updated_at,
+        }
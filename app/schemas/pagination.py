@@ -1,10 +1,15 @@
 """Cursor-based pagination: cursor + limit, response with next_cursor."""
 
-from typing import Generic, Optional, TypeVar
+import base64
+import binascii
+import json
+from typing import Any, Generic, Optional, TypeVar
 
 from fastapi import Query
 from pydantic import BaseModel
 
+from app.exceptions import BadRequestError
+
 T = TypeVar("T")
 
 DEFAULT_LIMIT = 20
@@ -12,23 +17,47 @@ MAX_LIMIT = 100
 
 
 class PaginationParams(BaseModel):
-    """Cursor and limit for list queries. Cursor is the id of the last item from the previous page."""
+    """Cursor and limit for list queries. Cursor is opaque: pass back next_cursor unchanged."""
 
     cursor: Optional[str] = None
     limit: int = DEFAULT_LIMIT
 
 
-def get_pagination(
-    cursor: Optional[str] = Query(None, description="Cursor (id of last item from previous page)"),
+async def get_pagination(
+    cursor: Optional[str] = Query(None, description="Opaque cursor (next_cursor of previous page)"),
     limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT, description="Max items per page"),
 ) -> PaginationParams:
     """Dependency for cursor + limit query params. Use as Depends(get_pagination)."""
     return PaginationParams(cursor=cursor, limit=limit)
 
 
+def encode_cursor(*key: str) -> str:
+    """Opaque cursor for a keyset position: unpadded URL-safe base64 of the key as JSON."""
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> list[str]:
+    """Inverse of encode_cursor. Raises BadRequestError for anything it did not produce."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise BadRequestError("Invalid cursor") from None
+    if not isinstance(key, list) or not key or not all(isinstance(v, str) for v in key):
+        raise BadRequestError("Invalid cursor")
+    return key
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """Response for cursor-paginated lists: items, next_cursor (if more), limit."""
 
     items: list[T]
     next_cursor: Optional[str] = None
     limit: int
+
+
+def paginated_content(
+    items: list[dict[str, Any]], next_cursor: Optional[str], limit: int
+) -> dict[str, Any]:
+    """PaginatedResponse's fields as plain values for FastJSONResponse."""
+    return {"items": items, "next_cursor": next_cursor, "limit": limit}
@@ -1,10 +1,11 @@
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
 if TYPE_CHECKING:
     from app.models.models import Service
+    from app.models.read_models import ServiceRecord
 
 
 class ServiceBase(BaseModel):
@@ -37,6 +38,20 @@ class ServiceResponse(BaseModel):
     updated_at: datetime
 
     @classmethod
-    def from_service(cls, service: "Service") -> "ServiceResponse":
-        """Map ORM Service to ServiceResponse. Keeps serialization in one place."""
+    def from_service(cls, service: "Service | ServiceRecord") -> "ServiceResponse":
+        """Map a Service (entity or record) to ServiceResponse. Keeps serialization in one place."""
         return cls.model_validate(service)
+
+    @staticmethod
+    def content_from_service(service: "Service | ServiceRecord") -> dict[str, Any]:
+        """from_service's fields as plain values for FastJSONResponse; builds no model."""
+        return {
+            "id": service.id,
+            "medspa_id": service.medspa_id,
+            "name": service.name,
+            "description": service.description,
+            "price": service.price,
+            "duration": service.duration,
+            "created_at": service.created_at,
+            "updated_at": service.updated_at,
+        }
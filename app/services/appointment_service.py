@@ -1,24 +1,151 @@
 import logging
+import random
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Optional, TypeVar
 
+from sqlalchemy import RowMapping
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 
-from app.db.database import transaction
-from app.exceptions import BadRequestError, ConflictError, NotFoundError
-from app.models.models import Appointment
-from app.repositories.appointment_repository import AppointmentRepository
-from app.repositories.service_repository import ServiceRepository
+from app.config import settings
+from app.db.database import is_lock_contention_error, pause, transaction
+from app.exceptions import BadRequestError, ConflictError, NotFoundError, ServiceUnavailableError
+from app.models.models import MAX_APPOINTMENT_MINUTES, Appointment, Service
+from app.models.read_models import AppointmentRecord, ServiceRecord
+from app.repositories.appointment_repository import AppointmentRepository, BookingAttempt
 from app.schemas.appointments import (
     VALID_STATUS_TRANSITIONS,
+    AppointmentBatchItem,
     AppointmentCreate,
+    AppointmentSort,
     AppointmentStatus,
+    BatchItemStatus,
 )
+from app.schemas.pagination import decode_cursor, encode_cursor
 from app.services.medspa_service import MedspaService
+from app.services.offerings_service import OfferingsService
+from app.utils.intervals import DisjointIntervals
 from app.utils.ulid import generate_id
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+TOO_LONG = f"Appointment cannot be longer than {MAX_APPOINTMENT_MINUTES} minutes"
+
+
+def _retry_on_lock_contention(operation: Callable[[], T], medspa_id: str) -> T:
+    """Run a booking transaction, retrying lock timeouts/deadlocks up to booking_max_attempts."""
+    for attempt in range(1, settings.booking_max_attempts + 1):
+        try:
+            return operation()
+        except DBAPIError as exc:
+            if not is_lock_contention_error(exc):
+                raise
+            logger.warning(
+                "appointment_booking_contention medspa_id=%s attempt=%s/%s",
+                medspa_id,
+                attempt,
+                settings.booking_max_attempts,
+            )
+            if attempt < settings.booking_max_attempts:
+                backoff_ms = settings.booking_retry_backoff_ms * attempt
+                pause(random.uniform(0, backoff_ms) / 1000)
+    raise ServiceUnavailableError("Too many concurrent bookings for these services, please retry.")
+
+
+@dataclass
+class BatchItemOutcome:
+    index: int
+    status: BatchItemStatus
+    appointment: Optional[Appointment] = None
+    detail: Optional[str] = None
+
+
+@dataclass
+class _BatchCandidate:
+    index: int
+    start: datetime
+    end: datetime
+    services: list[ServiceRecord]
+
+
+def _encode_list_cursor(key: Sequence[Any], sort: AppointmentSort) -> str:
+    """Cursor after the item with sort key `key` (see AppointmentRepository.list)."""
+    return encode_cursor(
+        sort.value, *(v.isoformat() if isinstance(v, datetime) else v for v in key)
+    )
+
+
+def _sort_key(appointment: AppointmentRecord, sort: AppointmentSort) -> tuple[Any, ...]:
+    if sort == AppointmentSort.ID:
+        return (appointment.id,)
+    return (appointment.start_time, appointment.id)
+
+
+def _decode_list_cursor(cursor: str, sort: AppointmentSort) -> tuple[Any, ...]:
+    key = decode_cursor(cursor)
+    if key[0] != sort.value:
+        raise BadRequestError("Cursor does not match the requested sort order")
+    if sort == AppointmentSort.ID and len(key) == 2:
+        return (key[1],)
+    if sort != AppointmentSort.ID and len(key) == 3:
+        try:
+            return (datetime.fromisoformat(key[1]), key[2])
+        except ValueError:
+            pass
+    raise BadRequestError("Invalid cursor")
+
+
+def _start_window(
+    start_from: Optional[datetime], start_to: Optional[datetime]
+) -> tuple[Optional[datetime], Optional[datetime]]:
+    """Validate an optional start_time window; naive datetimes are UTC, as for start_time on create."""
+    if start_from is not None and start_from.tzinfo is None:
+        start_from = start_from.replace(tzinfo=timezone.utc)
+    if start_to is not None and start_to.tzinfo is None:
+        start_to = start_to.replace(tzinfo=timezone.utc)
+    if start_from is not None and start_to is not None and start_to <= start_from:
+        raise BadRequestError("start_to must be after start_from")
+    return start_from, start_to
+
+
+def _list_filters(
+    db: Session,
+    medspa_id: Optional[str],
+    status: Optional[AppointmentStatus],
+    cursor: Optional[str],
+    sort: AppointmentSort,
+    start_from: Optional[datetime],
+    start_to: Optional[datetime],
+) -> dict[str, Any]:
+    """Validated repository filters for list_appointments / list_appointments_json."""
+    start_from, start_to = _start_window(start_from, start_to)
+    medspa_id_filter = None
+    if medspa_id is not None:
+        medspa = MedspaService.get_medspa(db, medspa_id)
+        medspa_id_filter = medspa.id
+    return {
+        "medspa_id": medspa_id_filter,
+        "status": status,
+        "after": _decode_list_cursor(cursor, sort) if cursor is not None else None,
+        "start_from": start_from,
+        "start_to": start_to,
+    }
+
+
+def _detached_service(service: ServiceRecord) -> Service:
+    """Transient copy for response building; keeps new appointments out of the session."""
+    return Service(
+        id=service.id,
+        medspa_id=service.medspa_id,
+        name=service.name,
+        price=service.price,
+        duration=service.duration,
+    )
+
 
 class AppointmentService:
     @staticmethod
@@ -31,39 +158,36 @@ class AppointmentService:
         if start < datetime.now(timezone.utc):
             raise BadRequestError("start_time cannot be in the past")
 
-        medspa = MedspaService.get_medspa(db, medspa_id)
+        service_ids = data.service_ids
 
-        services = ServiceRepository.find_by_ids(db, data.service_ids)
-        if len(services) != len(data.service_ids):
-            found_ids = {s.id for s in services}
-            missing = list(set(data.service_ids) - found_ids)
-            raise NotFoundError(f"Service(s) not found: {sorted(missing)}")
+        # Two statements in one transaction: advisory locks (so two concurrent bookings for the
+        # same service cannot both pass the conflict check), then a single insert-if-available
+        # that validates, checks conflicts, inserts and returns the full appointment. Nothing is
+        # written unless every check passes, so the outcome is inspected after commit.
+        def book() -> BookingAttempt:
+            with transaction(db):
+                AppointmentRepository.lock_services(
+                    db, medspa_id, service_ids, settings.booking_lock_timeout_ms
+                )
+                return AppointmentRepository.insert_if_available(
+                    db, generate_id(), medspa_id, start, service_ids
+                )
 
-        for s in services:
-            if s.medspa_id != medspa.id:
+        attempt = _retry_on_lock_contention(book, medspa_id)
+        if not attempt.medspa_found:
+            raise NotFoundError("Medspa not found")
+        if len(attempt.services) != len(service_ids):
+            found_ids = {s.id for s in attempt.services}
+            missing = list(set(service_ids) - found_ids)
+            raise NotFoundError(f"Service(s) not found: {sorted(missing)}")
+        for s in attempt.services:
+            if s.medspa_id != medspa_id:
                 raise BadRequestError("All services must belong to the same medspa")
-
-        total_price = sum(s.price for s in services)
-        total_duration = sum(s.duration for s in services)
-        end_time = start + timedelta(minutes=total_duration)
-        overlapping = AppointmentRepository.find_scheduled_overlapping(
-            db, medspa.id, start, end_time, [s.id for s in services]
-        )
-        if overlapping:
+        if attempt.duration > MAX_APPOINTMENT_MINUTES:
+            raise BadRequestError(TOO_LONG)
+        created = attempt.appointment
+        if attempt.conflict or created is None:
             raise ConflictError("One or more services are already booked for this time slot.")
-
-        appointment = Appointment(
-            id=generate_id(),
-            medspa_id=medspa.id,
-            start_time=data.start_time,
-            status=AppointmentStatus.SCHEDULED,
-            total_price=total_price,
-            total_duration=total_duration,
-        )
-        with transaction(db):
-            created = AppointmentRepository.create_with_services(
-                db, appointment, [s.id for s in services]
-            )
         logger.info(
             "appointment_created appointment_id=%s medspa_id=%s start_time=%s",
             created.id,
@@ -73,12 +197,133 @@ class AppointmentService:
         return created
 
     @staticmethod
-    def get_appointment(db: Session, id: str) -> Appointment:
+    def create_appointments_batch(
+        db: Session, medspa_id: str, items: Sequence[AppointmentBatchItem]
+    ) -> list[BatchItemOutcome]:
+        """Book many appointments at one medspa under create_appointment's rules, reporting per item.
+
+        Services come from the medspa's cached catalog (OfferingsService.get_catalog), so
+        validation and totals need no service query. Each valid item is checked against existing
+        bookings and the batch's earlier items in one start-time-ordered pass, and every accepted
+        item is written with two multi-row INSERTs, all in one transaction under the same
+        advisory locks as create_appointment. Invalid and conflicting items are reported, not
+        raised.
+        """
+        medspa = MedspaService.get_medspa(db, medspa_id)
+        all_ids = list(dict.fromkeys(sid for item in items for sid in item.service_ids))
+        services = OfferingsService.resolve_services(db, medspa.id, all_ids)
+        now = datetime.now(timezone.utc)
+
+        outcomes: dict[int, BatchItemOutcome] = {}
+        candidates: list[_BatchCandidate] = []
+        for index, item in enumerate(items):
+            start = item.start_time
+            if start.tzinfo is None:
+                start = start.replace(tzinfo=timezone.utc)
+            missing = [sid for sid in item.service_ids if sid not in services]
+            if start < now:
+                detail = "start_time cannot be in the past"
+            elif missing:
+                detail = f"Service(s) not found: {sorted(missing)}"
+            elif any(services[sid].medspa_id != medspa.id for sid in item.service_ids):
+                detail = "All services must belong to the same medspa"
+            elif sum(services[sid].duration for sid in item.service_ids) > MAX_APPOINTMENT_MINUTES:
+                detail = TOO_LONG
+            else:
+                item_services = [services[sid] for sid in item.service_ids]
+                duration = sum(s.duration for s in item_services)
+                candidates.append(
+                    _BatchCandidate(
+                        index, start, start + timedelta(minutes=duration), item_services
+                    )
+                )
+                continue
+            outcomes[index] = BatchItemOutcome(index, BatchItemStatus.INVALID, detail=detail)
+        candidates.sort(key=lambda c: (c.start, c.index))
+
+        def book() -> list[BatchItemOutcome]:
+            booked_outcomes: list[BatchItemOutcome] = []
+            if not candidates:
+                return booked_outcomes
+            with transaction(db):
+                service_ids = sorted({s.id for c in candidates for s in c.services})
+                AppointmentRepository.lock_services(
+                    db, medspa.id, service_ids, settings.booking_lock_timeout_ms
+                )
+                booked = AppointmentRepository.list_scheduled_slots_by_service(
+                    db, medspa.id, candidates[0].start, max(c.end for c in candidates), service_ids
+                )
+                calendars = {sid: DisjointIntervals(booked.get(sid, ())) for sid in service_ids}
+                accepted: list[Appointment] = []
+                for c in candidates:
+                    if any(calendars[s.id].overlaps(c.start, c.end) for s in c.services):
+                        booked_outcomes.append(
+                            BatchItemOutcome(
+                                c.index,
+                                BatchItemStatus.CONFLICT,
+                                detail="One or more services are already booked for this time slot.",
+                            )
+                        )
+                        continue
+                    for s in c.services:
+                        calendars[s.id].add(c.start, c.end)
+                    appointment = Appointment(
+                        id=generate_id(),
+                        medspa_id=medspa.id,
+                        start_time=c.start,
+                        status=AppointmentStatus.SCHEDULED,
+                        total_price=sum(s.price for s in c.services),
+                        total_duration=sum(s.duration for s in c.services),
+                        end_time=c.end,
+                        services=[_detached_service(s) for s in c.services],
+                    )
+                    accepted.append(appointment)
+                    booked_outcomes.append(
+                        BatchItemOutcome(c.index, BatchItemStatus.CREATED, appointment)
+                    )
+                AppointmentRepository.create_many_with_services(
+                    db, accepted, [[s.id for s in a.services] for a in accepted]
+                )
+            return booked_outcomes
+
+        for outcome in _retry_on_lock_contention(book, medspa_id):
+            outcomes[outcome.index] = outcome
+        logger.info(
+            "appointment_batch_created medspa_id=%s created=%s conflicts=%s invalid=%s",
+            medspa_id,
+            sum(o.status == BatchItemStatus.CREATED for o in outcomes.values()),
+            sum(o.status == BatchItemStatus.CONFLICT for o in outcomes.values()),
+            len(items) - len(candidates),
+        )
+        return [outcomes[index] for index in range(len(items))]
+
+    @staticmethod
+    def export_appointments(
+        db: Session,
+        medspa_id: Optional[str] = None,
+        status: Optional[AppointmentStatus] = None,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+    ) -> Iterator[RowMapping]:
+        """Validate export filters now and return a lazy row stream (see iter_export_rows).
+
+        Errors surface here, before a streaming response has started; the query itself only runs
+        once the returned iterator is consumed.
+        """
+        start_from, start_to = _start_window(start_from, start_to)
+        if medspa_id is not None:
+            medspa_id = MedspaService.get_medspa(db, medspa_id).id
+        return AppointmentRepository.iter_export_rows(
+            db, medspa_id=medspa_id, status=status, start_from=start_from, start_to=start_to
+        )
+
+    @staticmethod
+    def get_appointment(db: Session, id: str) -> AppointmentRecord:
         return AppointmentRepository.get_by_id(db, id)
 
     @staticmethod
     def update_status(db: Session, appointment_id: str, status: AppointmentStatus) -> Appointment:
-        appointment = AppointmentService.get_appointment(db, appointment_id)
+        appointment = AppointmentRepository.load(db, appointment_id)
         current = appointment.status
         if status == current:
             return appointment
@@ -106,14 +351,31 @@ class AppointmentService:
         status: Optional[AppointmentStatus] = None,
         cursor: Optional[str] = None,
         limit: int = 20,
-    ) -> tuple[list[Appointment], Optional[str]]:
-        medspa_id_filter = None
-        if medspa_id is not None:
-            medspa = MedspaService.get_medspa(db, medspa_id)
-            medspa_id_filter = medspa.id
-        raw = AppointmentRepository.list(
-            db, medspa_id=medspa_id_filter, status=status, cursor=cursor, limit=limit
-        )
+        sort: AppointmentSort = AppointmentSort.ID,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+    ) -> tuple[list[AppointmentRecord], Optional[str]]:
+        filters = _list_filters(db, medspa_id, status, cursor, sort, start_from, start_to)
+        raw = AppointmentRepository.list(db, limit=limit, sort=sort, **filters)
         items = raw[:limit]
-        next_cursor = items[-1].id if len(raw) > limit else None
+        next_cursor = (
+            _encode_list_cursor(_sort_key(items[-1], sort), sort) if len(raw) > limit else None
+        )
         return items, next_cursor
+
+    @staticmethod
+    def list_appointments_json(
+        db: Session,
+        medspa_id: Optional[str] = None,
+        status: Optional[AppointmentStatus] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        sort: AppointmentSort = AppointmentSort.ID,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+    ) -> tuple[str, Optional[str]]:
+        """list_appointments with the items as JSON text rendered by Postgres."""
+        filters = _list_filters(db, medspa_id, status, cursor, sort, start_from, start_to)
+        page = AppointmentRepository.list_json(db, limit=limit, sort=sort, **filters)
+        next_cursor = _encode_list_cursor(list(page.last.values()), sort) if page.last else None
+        return page.items, next_cursor
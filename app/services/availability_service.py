@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.exceptions import BadRequestError, NotFoundError
+from app.models.models import MAX_APPOINTMENT_MINUTES
+from app.repositories.appointment_repository import AppointmentRepository
+from app.schemas.availability import AvailabilityResponse
+from app.services.appointment_service import TOO_LONG
+from app.services.medspa_service import MedspaService
+from app.services.offerings_service import OfferingsService
+from app.utils.intervals import free_starts, merge_intervals
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Naive datetimes are treated as UTC, as for appointment start_time.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class AvailabilityService:
+    @staticmethod
+    def find_open_slots(
+        db: Session,
+        medspa_id: str,
+        service_ids: list[str],
+        window_start: datetime,
+        window_end: datetime,
+        granularity: int,
+    ) -> AvailabilityResponse:
+        """Open start times for booking all service_ids together within [window_start, window_end).
+
+        Candidates sit on a UTC granularity grid (15 -> :00, :15, :30, :45), never in the past. A start is
+        open when find_scheduled_overlapping would report nothing for it, i.e. the same rule
+        create_appointment enforces. One query loads the window's bookings; one sweep answers.
+        """
+        window_start = _as_utc(window_start)
+        window_end = _as_utc(window_end)
+        if window_end <= window_start:
+            raise BadRequestError("'to' must be after 'from'")
+        if window_end - window_start > timedelta(days=settings.availability_max_window_days):
+            raise BadRequestError(
+                f"Availability window cannot exceed {settings.availability_max_window_days} days"
+            )
+        if not settings.availability_min_granularity_minutes <= granularity <= MINUTES_PER_DAY:
+            raise BadRequestError(
+                f"granularity must be between {settings.availability_min_granularity_minutes}m "
+                "and 24h"
+            )
+        service_ids = list(dict.fromkeys(service_ids))
+        if not service_ids:
+            raise BadRequestError("At least one service_id is required")
+
+        medspa = MedspaService.get_medspa(db, medspa_id)
+        found = OfferingsService.resolve_services(db, medspa.id, service_ids)
+        missing = [sid for sid in service_ids if sid not in found]
+        if missing:
+            raise NotFoundError(f"Service(s) not found: {sorted(missing)}")
+        services = list(found.values())
+        for s in services:
+            if s.medspa_id != medspa.id:
+                raise BadRequestError("All services must belong to the same medspa")
+
+        duration = sum(s.duration for s in services)
+        # create_appointment would reject every slot for these services together
+        if duration > MAX_APPOINTMENT_MINUTES:
+            raise BadRequestError(TOO_LONG)
+        busy = AppointmentRepository.list_scheduled_slots(
+            db, medspa.id, window_start, window_end, service_ids
+        )
+        earliest = max(window_start, datetime.now(timezone.utc))
+        slots = free_starts(
+            merge_intervals(busy),
+            earliest,
+            window_end,
+            timedelta(minutes=duration),
+            timedelta(minutes=granularity),
+        )
+        return AvailabilityResponse(
+            medspa_id=medspa.id,
+            service_ids=service_ids,
+            duration=duration,
+            granularity=granularity,
+            slots=slots,
+        )
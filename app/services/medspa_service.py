@@ -3,29 +3,62 @@ from typing import Optional
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.db.database import transaction
-from app.exceptions import ConflictError
+from app.db.invalidation import notify_invalidation, register_invalidation
+from app.exceptions import ConflictError, NotFoundError
 from app.models.models import Medspa
+from app.models.read_models import MedspaRecord
 from app.repositories.medspa_repository import MedspaRepository
 from app.schemas.medspas import MedspaCreate
-from app.utils.query import get_by_id
+from app.utils.cache import TTLCache
 from app.utils.ulid import generate_id
 
+# get_medspa runs on every nested route (/medspas/{id}/...); medspas almost never change
+medspa_cache: TTLCache[str, MedspaRecord] = TTLCache(
+    max_size=settings.medspa_cache_max_size,
+    ttl=settings.medspa_cache_ttl_seconds,
+    negative_ttl=settings.medspa_cache_negative_ttl_seconds,
+    negative_max_size=settings.medspa_cache_negative_max_size,
+)
+register_invalidation("medspa", medspa_cache.invalidate, medspa_cache.clear)
+
 
 class MedspaService:
     @staticmethod
-    def get_medspa(db: Session, id: str) -> Medspa:
-        return get_by_id(db, Medspa, id, "Medspa not found")
+    def get_medspa(db: Session, id: str) -> MedspaRecord:
+        """Read-through medspa_cache; unknown ids are cached too, for a shorter time."""
+        medspa = medspa_cache.get_or_load(id, lambda key: MedspaRepository.get_by_id(db, key))
+        if medspa is None:
+            raise NotFoundError("Medspa not found")
+        return medspa
+
+    @staticmethod
+    def invalidate_cached_medspa(id: str) -> None:
+        """Call after committing any write to a medspa row (create, update, delete).
+
+        Covers this process only; the write's transaction should also notify_invalidation()
+        so other workers evict it.
+        """
+        medspa_cache.invalidate(id)
 
     @staticmethod
     def list_medspas(
         db: Session, cursor: Optional[str] = None, limit: int = 20
-    ) -> tuple[list[Medspa], Optional[str]]:
+    ) -> tuple[list[MedspaRecord], Optional[str]]:
         raw = MedspaRepository.list(db, cursor=cursor, limit=limit)
         items = raw[:limit]
         next_cursor = items[-1].id if len(raw) > limit else None
         return items, next_cursor
 
+    @staticmethod
+    def list_medspas_json(
+        db: Session, cursor: Optional[str] = None, limit: int = 20
+    ) -> tuple[str, Optional[str]]:
+        """list_medspas with the items as JSON text rendered by Postgres."""
+        page = MedspaRepository.list_json(db, cursor=cursor, limit=limit)
+        return page.items, page.last["id"] if page.last else None
+
     @staticmethod
     def create_medspa(db: Session, data: MedspaCreate) -> Medspa:
         medspa = Medspa(
@@ -38,6 +71,8 @@ class MedspaService:
         try:
             with transaction(db):
                 MedspaRepository.create(db, medspa)
+                notify_invalidation(db, "medspa", medspa.id)
         except IntegrityError:
             raise ConflictError(f"A medspa named '{data.name}' already exists") from None
+        MedspaService.invalidate_cached_medspa(medspa.id)
         return medspa
@@ -1,15 +1,44 @@
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Optional
 
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.db.database import transaction
+from app.db.invalidation import notify_invalidation, register_invalidation
+from app.exceptions import NotFoundError
 from app.models.models import Service
+from app.models.read_models import ServiceRecord
 from app.repositories.service_repository import ServiceRepository
 from app.schemas.services import ServiceCreate, ServiceUpdate
 from app.services.medspa_service import MedspaService
+from app.utils.cache import TTLCache
 from app.utils.query import get_by_id
 from app.utils.ulid import generate_id
 
+# Booking validation reads whole catalogs: (medspa_id, catalog version) -> service id -> record.
+# A new version is a new key, so an entry is never stale; old versions age out by TTL and LRU.
+catalog_cache: TTLCache[tuple[str, int], Mapping[str, ServiceRecord]] = TTLCache(
+    max_size=settings.catalog_cache_max_size,
+    ttl=settings.catalog_cache_ttl_seconds,
+    negative_ttl=0,
+)
+
+
+def _evict_catalog(medspa_id: str) -> None:
+    # Versioning already keeps lookups fresh; this frees superseded versions right away.
+    catalog_cache.invalidate_where(lambda key: key[0] == medspa_id)
+
+
+register_invalidation("catalog", _evict_catalog, catalog_cache.clear)
+
+
+def _load_catalog(db: Session, medspa_id: str) -> Mapping[str, ServiceRecord]:
+    # Read after the version: the catalog is at least as new as the key it is stored under.
+    services = ServiceRepository.list_catalog(db, medspa_id)
+    return MappingProxyType({s.id: s for s in services})
+
 
 class OfferingsService:
     @staticmethod
@@ -24,28 +53,75 @@ class OfferingsService:
             duration=data.duration,
         )
         with transaction(db):
-            return ServiceRepository.create(db, service)
+            created = ServiceRepository.create(db, service)
+            ServiceRepository.bump_catalog_version(db, medspa.id)
+            notify_invalidation(db, "catalog", medspa.id)
+            return created
 
     @staticmethod
-    def get_service(db: Session, id: str) -> Service:
-        return get_by_id(db, Service, id, "Service not found")
+    def get_service(db: Session, id: str) -> ServiceRecord:
+        service = ServiceRepository.get_by_id(db, id)
+        if service is None:
+            raise NotFoundError("Service not found")
+        return service
 
     @staticmethod
     def list_services_by_medspa(
         db: Session, medspa_id: str, cursor: Optional[str] = None, limit: int = 20
-    ) -> tuple[list[Service], Optional[str]]:
+    ) -> tuple[list[ServiceRecord], Optional[str]]:
         medspa = MedspaService.get_medspa(db, medspa_id)
         raw = ServiceRepository.list_by_medspa_id(db, medspa.id, cursor=cursor, limit=limit)
         items = raw[:limit]
         next_cursor = items[-1].id if len(raw) > limit else None
         return items, next_cursor
 
+    @staticmethod
+    def list_services_by_medspa_json(
+        db: Session, medspa_id: str, cursor: Optional[str] = None, limit: int = 20
+    ) -> tuple[str, Optional[str]]:
+        """list_services_by_medspa with the items as JSON text rendered by Postgres."""
+        medspa = MedspaService.get_medspa(db, medspa_id)
+        page = ServiceRepository.list_by_medspa_id_json(db, medspa.id, cursor=cursor, limit=limit)
+        return page.items, page.last["id"] if page.last else None
+
     @staticmethod
     def update_service(db: Session, service_id: str, data: ServiceUpdate) -> Service:
-        service = OfferingsService.get_service(db, service_id)
+        service = get_by_id(db, Service, service_id, "Service not found")
         update = data.model_dump(exclude_unset=True)
         allowed = {"name", "description", "price", "duration"}
         for key in allowed & update.keys():
             setattr(service, key, update[key])
         with transaction(db):
-            return ServiceRepository.update(db, service)
+            updated = ServiceRepository.update(db, service)
+            ServiceRepository.bump_catalog_version(db, updated.medspa_id)
+            notify_invalidation(db, "catalog", updated.medspa_id)
+            return updated
+
+    @staticmethod
+    def get_catalog(db: Session, medspa_id: str) -> Mapping[str, ServiceRecord]:
+        """The medspa's services by id, from catalog_cache at the current catalog version.
+
+        Costs one primary-key read of the version; the catalog itself is loaded once per
+        version per process. Every service write must go through create_service or
+        update_service (which bump the version in their transaction) for this to stay fresh.
+        """
+        version = ServiceRepository.catalog_version(db, medspa_id)
+        catalog = catalog_cache.get_or_load(
+            (medspa_id, version), lambda key: _load_catalog(db, key[0])
+        )
+        return catalog or MappingProxyType({})
+
+    @staticmethod
+    def resolve_services(
+        db: Session, medspa_id: str, service_ids: list[str]
+    ) -> dict[str, ServiceRecord]:
+        """Services by id for booking at medspa_id; ids that do not exist are left out.
+
+        Served from get_catalog. Ids outside the catalog (another medspa's services, or unknown)
+        are looked up directly, so callers can still tell "not found" from "wrong medspa".
+        """
+        catalog = OfferingsService.get_catalog(db, medspa_id)
+        found = {sid: catalog[sid] for sid in service_ids if sid in catalog}
+        others = [sid for sid in service_ids if sid not in catalog]
+        found.update((s.id, s) for s in ServiceRepository.find_by_ids(db, others))
+        return found
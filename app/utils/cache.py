@@ -0,0 +1,129 @@
+"""Process-local TTL + LRU cache for small lookups that rarely change.
+
+Values must be immutable (e.g. read_models records): the same object is handed to every
+thread that hits. Each worker process has its own cache, so ttl bounds how long another
+process's write can go unseen.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe map of key -> value (or None for "not found") with per-entry expiry.
+
+    Found values live for ttl seconds, misses (None) for negative_ttl, so repeated lookups of
+    unknown keys are also absorbed. Misses are kept apart from found values, in an LRU of their
+    own capped at negative_max_size: a scan of unknown keys only ever evicts other misses, never
+    a hot value. Beyond max_size the least recently used value is evicted. A ttl of 0 disables
+    caching of found values (and likewise negative_ttl for misses).
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        negative_ttl: float,
+        negative_max_size: int = 1_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._negative_max_size = negative_max_size
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._misses: OrderedDict[K, float] = OrderedDict()  # key -> expiry
+        self._lock = threading.Lock()
+        # Bumped by invalidate()/clear(); a load that raced one is not stored
+        self._generation = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.negative_evictions = 0
+
+    def get_or_load(self, key: K, load: Callable[[K], Optional[V]]) -> Optional[V]:
+        """Cached value for key, or load(key) on a miss (called without holding the lock)."""
+        with self._lock:
+            now = self._clock()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            expires = self._misses.get(key)
+            if expires is not None and expires > now:
+                self._misses.move_to_end(key)
+                self.negative_hits += 1
+                return None
+            self.misses += 1
+            generation = self._generation
+        value = load(key)
+        with self._lock:
+            if generation == self._generation:
+                if value is not None:
+                    self._store(key, value)
+                else:
+                    self._store_miss(key)
+        return value
+
+    def _store(self, key: K, value: V) -> None:
+        self._misses.pop(key, None)
+        if self._ttl <= 0:
+            return
+        self._entries[key] = (self._clock() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _store_miss(self, key: K) -> None:
+        self._entries.pop(key, None)
+        if self._negative_ttl <= 0 or self._negative_max_size <= 0:
+            return
+        self._misses[key] = self._clock() + self._negative_ttl
+        self._misses.move_to_end(key)
+        while len(self._misses) > self._negative_max_size:
+            self._misses.popitem(last=False)
+            self.negative_evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """Drop key (found or negative) so the next lookup reads through."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._misses.pop(key, None)
+            self._generation += 1
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> None:
+        """Drop every key for which predicate(key) is true."""
+        with self._lock:
+            for entries in (self._entries, self._misses):
+                for key in [k for k in entries if predicate(k)]:
+                    del entries[key]
+            self._generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._misses.clear()
+            self._generation += 1
+
+    def stats(self) -> dict[str, int]:
+        """Counters since start, plus how many values (size) and misses (negative_size) are held."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "negative_evictions": self.negative_evictions,
+                "size": len(self._entries),
+                "negative_size": len(self._misses),
+            }
@@ -0,0 +1,76 @@
+"""Text encoders for streamed appointment exports (NDJSON and CSV).
+
+Both take the row mappings from AppointmentRepository.iter_export_rows and yield chunks of up
+to chunk_rows rows, so a StreamingResponse sends a few large writes instead of one per row.
+NDJSON comes out as bytes from orjson, with the API's options (app/api/responses.py).
+"""
+
+import csv
+import io
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import datetime
+from typing import Any
+
+import orjson
+
+CHUNK_ROWS = 500
+
+# CSV columns; services are flattened to ';'-separated ids and names
+CSV_COLUMNS = (
+    "id",
+    "medspa_id",
+    "start_time",
+    "end_time",
+    "status",
+    "total_price",
+    "total_duration",
+    "created_at",
+    "service_ids",
+    "service_names",
+)
+
+
+_NDJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+
+
+def _plain(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def to_ndjson(rows: Iterable[Mapping[Any, Any]], chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """One JSON object per line, services as a nested list (same shape as the API's items).
+
+    Encoded like FastJSONResponse: UTC datetimes end in "Z", as in the API's responses.
+    """
+    lines: list[bytes] = []
+    for row in rows:
+        record = dict(row)
+        record["services"] = record["services"] or []
+        lines.append(orjson.dumps(record, option=_NDJSON_OPTIONS))
+        if len(lines) >= chunk_rows:
+            yield b"".join(lines)
+            lines.clear()
+    if lines:
+        yield b"".join(lines)
+
+
+def to_csv(rows: Iterable[Mapping[Any, Any]], chunk_rows: int = CHUNK_ROWS) -> Iterator[str]:
+    """Header line, then one line per row (RFC 4180 quoting via the csv module)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    pending = 0
+    for row in rows:
+        services = row["services"] or []
+        writer.writerow(
+            [_plain(row[column]) for column in CSV_COLUMNS[:-2]]
+            + [";".join(s["id"] for s in services), ";".join(s["name"] for s in services)]
+        )
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,76 @@
+"""Half-open [start, end) interval helpers for booking availability (sorted sweep, no DB access)."""
+
+from bisect import bisect_left
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+
+Interval = tuple[datetime, datetime]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """Sort and merge overlapping or touching intervals into a disjoint, ascending list."""
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def align_up(moment: datetime, step: timedelta) -> datetime:
+    """Round moment up to the next multiple of step since the Unix epoch (UTC)."""
+    remainder = (moment - _EPOCH) % step
+    return moment if not remainder else moment + (step - remainder)
+
+
+def free_starts(
+    busy: list[Interval],
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+    step: timedelta,
+) -> list[datetime]:
+    """Start times on the step grid where [t, t + duration) fits in the window and hits no busy interval.
+
+    busy must be disjoint and ascending (see merge_intervals). One pass: the grid cursor and the
+    busy cursor only move forward, and a blocked cursor jumps straight past the blocking interval,
+    so cost is O(len(busy) + len(result)).
+    """
+    starts: list[datetime] = []
+    t = align_up(window_start, step)
+    i = 0
+    while t + duration <= window_end:
+        while i < len(busy) and busy[i][1] <= t:
+            i += 1
+        if i < len(busy) and busy[i][0] < t + duration:
+            t = align_up(busy[i][1], step)
+            continue
+        starts.append(t)
+        t += step
+    return starts
+
+
+class DisjointIntervals:
+    """Disjoint, ascending intervals with O(log n) overlap checks; used as one calendar per service."""
+
+    def __init__(self, intervals: Iterable[Interval] = ()) -> None:
+        merged = merge_intervals(intervals)
+        self._starts = [start for start, _ in merged]
+        self._ends = [end for _, end in merged]
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """True if [start, end) intersects any stored interval."""
+        # Intervals [0, i) start before `end`; being disjoint and sorted, the last of them has the
+        # latest end, so it alone decides the overlap.
+        i = bisect_left(self._starts, end)
+        return i > 0 and self._ends[i - 1] > start
+
+    def add(self, start: datetime, end: datetime) -> None:
+        """Insert [start, end). Caller guarantees it does not overlap (check overlaps() first)."""
+        i = bisect_left(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
@@ -1,5 +1,22 @@
-from typing import Any, Protocol, TypeVar
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Optional, Protocol, TypeVar
 
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    Select,
+    String,
+    Text,
+    case,
+    cast,
+    func,
+    literal,
+    literal_column,
+    select,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import Session
 
 from app.exceptions import NotFoundError
@@ -25,3 +42,72 @@ def get_by_id(
     if not entity:
         raise NotFoundError(not_found_message)
     return entity
+
+
+@dataclass(frozen=True)
+class JsonPage:
+    """One list page rendered by Postgres (see json_page)."""
+
+    items: str  # JSON array text, one object per row in sort order
+    last: Optional[dict[str, Any]]  # key columns of the last item, only when a next page exists
+
+
+def iso_utc(column: ColumnElement[Any]) -> ColumnElement[str]:
+    """timestamptz as text in the API's format: ISO 8601 in UTC with "Z", microseconds if non-zero."""
+    utc = func.timezone("UTC", column)
+    return case(
+        (
+            func.date_trunc("second", column) == column,
+            func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS"Z"'),
+        ),
+        else_=func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"'),
+    )
+
+
+def json_page(
+    db: Session,
+    stmt: Select[Any],
+    key: Sequence[str],
+    limit: int,
+    descending: bool = False,
+) -> JsonPage:
+    """Run a filtered select as one keyset page and have Postgres render it as JSON.
+
+    stmt's selected columns become the object fields, in order (timestamps via iso_utc), so its
+    labels must match the response model. Rows are ordered by the `key` columns; as with the
+    ORM list methods, limit+1 rows are read and the extra one only signals a next page. One
+    statement, one row back: the JSON text plus the key of the page's last item.
+    """
+    order_by = [
+        stmt.selected_columns[name].desc() if descending else stmt.selected_columns[name]
+        for name in key
+    ]
+    position = func.row_number().over(order_by=order_by).label("page_position")
+    page = stmt.add_columns(position).order_by(*order_by).limit(limit + 1).subquery("page")
+    fields = [c for c in page.c if c.name != "page_position"]
+    # Keys typed as text: a column's quoted_name would bind untyped, which asyncpg rejects
+    item = func.json_build_object(
+        *chain.from_iterable(
+            (literal(c.name, String), iso_utc(c) if isinstance(c.type, DateTime) else c)
+            for c in fields
+        )
+    )
+    # Aggregate in the subquery's own order, so the rows arrive presorted
+    item_order = [page.c[name].desc() if descending else page.c[name] for name in key]
+    in_page = page.c.page_position <= limit
+    is_last = page.c.page_position == limit
+    row = db.execute(
+        select(
+            cast(
+                func.coalesce(
+                    func.json_agg(aggregate_order_by(item, *item_order)).filter(in_page),
+                    literal_column("'[]'::json"),
+                ),
+                Text,
+            ).label("items"),
+            func.count().label("rows"),
+            *(func.max(page.c[name]).filter(is_last).label(name) for name in key),
+        ).execution_options(**stmt.get_execution_options())
+    ).one()
+    last = {name: row._mapping[name] for name in key} if row.rows > limit else None
+    return JsonPage(items=row.items, last=last)
@@ -0,0 +1,67 @@
+"""Availability sweep benchmark: 30-day window at a busy medspa.
+
+Generates a synthetic calendar (default 2,000 scheduled bookings across 30 days, random
+15-60 minute durations, overlaps allowed as with multi-service calendars) and times the
+engine behind GET /medspas/{id}/availability: merge_intervals + free_starts. No database.
+
+    python -m benchmarks.availability_sweep --bookings 5000 --granularity 5
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.utils.intervals import free_starts, merge_intervals
+
+
+def _calendar(bookings: int, start: datetime, days: int, seed: int):
+    rng = random.Random(seed)
+    span_minutes = days * 24 * 60
+    busy = []
+    for _ in range(bookings):
+        offset = rng.randrange(0, span_minutes // 5) * 5
+        begin = start + timedelta(minutes=offset)
+        busy.append((begin, begin + timedelta(minutes=rng.choice((15, 30, 45, 60)))))
+    return busy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Availability sweep benchmark")
+    parser.add_argument("--bookings", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--duration", type=int, default=30, help="requested duration (minutes)")
+    parser.add_argument("--granularity", type=int, default=15, help="grid step (minutes)")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    end = start + timedelta(days=args.days)
+    busy = _calendar(args.bookings, start, args.days, seed=42)
+
+    timings = []
+    slots: list[datetime] = []
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        slots = free_starts(
+            merge_intervals(busy),
+            start,
+            end,
+            timedelta(minutes=args.duration),
+            timedelta(minutes=args.granularity),
+        )
+        timings.append((time.perf_counter() - t0) * 1000)
+
+    print(
+        f"bookings={args.bookings} days={args.days} duration={args.duration}m "
+        f"granularity={args.granularity}m open_slots={len(slots)}"
+    )
+    print(
+        f"median={statistics.median(timings):.2f}ms "
+        f"p95={sorted(timings)[int(len(timings) * 0.95) - 1]:.2f}ms max={max(timings):.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Contention benchmark: N parallel bookings for one slot; exactly one must succeed.
+
+Runs AppointmentService.create_appointment from a thread pool, one session per booking,
+against DATABASE_URL (schema from sql/schema.sql must be applied). Creates its own medspa and
+service and deletes them afterwards.
+
+    python -m benchmarks.booking_contention --requests 200 --concurrency 32
+    python -m benchmarks.booking_contention --distinct-slots   # uncontended throughput
+"""
+
+import argparse
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from app.db.database import SessionLocal
+from app.exceptions import AppException, ConflictError
+from app.models.models import Medspa, Service
+from app.schemas.appointments import AppointmentCreate
+from app.services.appointment_service import AppointmentService
+from app.utils.ulid import generate_id
+
+
+def _setup() -> tuple[str, str]:
+    with SessionLocal() as db:
+        medspa = Medspa(
+            id=generate_id(),
+            name=f"bench-{generate_id()}",
+            address="1 Benchmark Way",
+            phone_number="(512) 555-0199",
+            email="bench@example.com",
+        )
+        service = Service(
+            id=generate_id(), medspa_id=medspa.id, name="Bench", price=1000, duration=30
+        )
+        db.add(medspa)
+        db.flush()
+        db.add(service)
+        db.commit()
+        return medspa.id, service.id
+
+
+def _teardown(medspa_id: str) -> None:
+    with SessionLocal() as db:
+        medspa = db.get(Medspa, medspa_id)
+        if medspa is not None:
+            db.delete(medspa)
+            db.commit()
+
+
+def _book(medspa_id: str, service_id: str, start: datetime) -> str:
+    with SessionLocal() as db:
+        try:
+            AppointmentService.create_appointment(
+                db, medspa_id, AppointmentCreate(start_time=start, service_ids=[service_id])
+            )
+            return "created"
+        except ConflictError:
+            return "conflict"
+        except AppException as exc:
+            return f"http_{exc.status_code}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parallel booking contention benchmark")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--distinct-slots", action="store_true", help="book non-overlapping slots instead"
+    )
+    args = parser.parse_args()
+
+    medspa_id, service_id = _setup()
+    base = (datetime.now(timezone.utc) + timedelta(days=7)).replace(microsecond=0)
+    try:
+        starts = [
+            base + timedelta(minutes=30 * i) if args.distinct_slots else base
+            for i in range(args.requests)
+        ]
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            outcomes = Counter(pool.map(lambda s: _book(medspa_id, service_id, s), starts))
+        elapsed = time.perf_counter() - t0
+    finally:
+        _teardown(medspa_id)
+
+    expected = args.requests if args.distinct_slots else 1
+    print(f"requests={args.requests} concurrency={args.concurrency}")
+    print(f"outcomes={dict(outcomes)}")
+    print(f"elapsed={elapsed:.3f}s throughput={args.requests / elapsed:.1f} req/s")
+    status = "OK" if outcomes["created"] == expected else "FAIL"
+    print(f"{status}: created={outcomes['created']} expected={expected}")
+
+
+if __name__ == "__main__":
+    main()
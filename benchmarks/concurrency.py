@@ -0,0 +1,208 @@
+"""Concurrency benchmark: sync vs async requests/s and latency at 50, 200 and 1000 clients.
+
+Drives GET /medspas/{id}/services and GET /appointments/{id} in-process (httpx over ASGI, no
+network), both stacks behind the app's middleware and calling the same services:
+
+- sync:  def routes on _get_db (psycopg2), each request holding one of AnyIO's threadpool
+         threads (--threads, 40 by default) for its whole database round trip
+- async: the app's async def routes on get_async_db (asyncpg), with the services running
+         under AsyncSession.run_sync on the event loop
+
+Alongside throughput and p50/p99 latency it prints error responses (e.g. 503 once a request
+outlives its budget), the longest connection checkout wait and checkout timeouts (app.db.pool),
+which show whether requests queue for threads or for connections. Both stacks use pools of
+DB_POOL_SIZE + DB_MAX_OVERFLOW connections. Runs against DATABASE_URL (schema applied) and
+deletes its fixtures afterwards.
+
+    python -m benchmarks.concurrency --clients 50 200 1000 --requests 4000
+    DB_POOL_SIZE=50 DB_MAX_OVERFLOW=50 python -m benchmarks.concurrency --threads 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from anyio import to_thread
+from fastapi import Depends, FastAPI, Request
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from app.api.responses import FastJSONResponse
+from app.config import settings
+from app.db.database import (
+    SessionLocal,
+    async_engine,
+    engine,
+    request_budget_ms,
+    set_deadline,
+)
+from app.db.pool import pool_stats, pool_status
+from app.main import app
+from app.models.models import Appointment, Medspa, Service
+from app.repositories.appointment_repository import AppointmentRepository
+from app.schemas.appointments import AppointmentResponse
+from app.schemas.pagination import DEFAULT_LIMIT, paginated_content
+from app.schemas.services import ServiceResponse
+from app.services.appointment_service import AppointmentService
+from app.services.offerings_service import OfferingsService
+from app.utils.ulid import generate_id
+
+DEFAULT_THREADS = 40
+
+
+def _setup() -> tuple[str, str]:
+    with SessionLocal() as db:
+        medspa = Medspa(
+            id=generate_id(),
+            name=f"bench-{generate_id()}",
+            address="1 Benchmark Way",
+            phone_number="(512) 555-0199",
+            email="bench@example.com",
+        )
+        db.add(medspa)
+        db.flush()
+        service = Service(
+            id=generate_id(), medspa_id=medspa.id, name="Bench", price=1000, duration=30
+        )
+        db.add(service)
+        db.flush()
+        start = datetime.now(timezone.utc) + timedelta(days=30)
+        appointment = Appointment(
+            id=generate_id(),
+            medspa_id=medspa.id,
+            start_time=start,
+            status="scheduled",
+            total_price=1000,
+            total_duration=30,
+            end_time=start + timedelta(minutes=30),
+        )
+        AppointmentRepository.create_many_with_services(db, [appointment], [[service.id]])
+        db.commit()
+        return medspa.id, appointment.id
+
+
+def _teardown(medspa_id: str) -> None:
+    with SessionLocal() as db:
+        medspa = db.get(Medspa, medspa_id)
+        if medspa is not None:
+            db.delete(medspa)
+            db.commit()
+
+
+def _get_db(request: Request) -> Iterator[Session]:
+    """The sync stack's session: psycopg2, with the request's budget, as get_async_db's."""
+    db = SessionLocal()
+    set_deadline(db, request_budget_ms(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _sync_app() -> FastAPI:
+    """The two routes as sync def routes on _get_db, behind the app's middleware and handlers."""
+    sync_app = FastAPI()
+    for middleware in app.user_middleware:
+        sync_app.add_middleware(middleware.cls, *middleware.args, **middleware.kwargs)
+    for exc_class, handler in app.exception_handlers.items():
+        sync_app.add_exception_handler(exc_class, handler)
+    depends_get_db = Depends(_get_db)
+
+    @sync_app.get("/medspas/{medspa_id}/services")
+    def list_services(medspa_id: str, db: Session = depends_get_db):
+        items, next_cursor = OfferingsService.list_services_by_medspa(
+            db, medspa_id, limit=DEFAULT_LIMIT
+        )
+        return FastJSONResponse(
+            paginated_content(
+                [ServiceResponse.content_from_service(s) for s in items], next_cursor, DEFAULT_LIMIT
+            )
+        )
+
+    @sync_app.get("/appointments/{appointment_id}")
+    def get_appointment(appointment_id: str, db: Session = depends_get_db):
+        appointment = AppointmentService.get_appointment(db, appointment_id)
+        return FastJSONResponse(AppointmentResponse.content_from_appointment(appointment))
+
+    return sync_app
+
+
+async def _run(
+    target: FastAPI, pool: Engine, paths: list[str], clients: int, requests: int, threads: int
+) -> tuple[list[float], int]:
+    """Latencies of requests that succeeded, and the number that did not; pool serves target."""
+    to_thread.current_default_thread_limiter().total_tokens = threads
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+    transport = httpx.ASGITransport(app=target)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # Open the pool's connections first, so neither stack is timed connecting
+            connections = settings.db_pool_size + settings.db_max_overflow
+            await asyncio.gather(*(client.get(paths[0]) for _ in range(connections)))
+            stats = pool_stats(pool)
+            assert stats is not None
+            stats.reset()
+
+            async def worker() -> None:
+                nonlocal errors
+                for i in remaining:
+                    t0 = time.perf_counter()
+                    response = await client.get(paths[i % len(paths)])
+                    if response.is_success:
+                        latencies.append(time.perf_counter() - t0)
+                    else:
+                        errors += 1
+
+            await asyncio.gather(*(worker() for _ in range(clients)))
+    finally:
+        # asyncpg connections belong to this run's event loop
+        await async_engine.dispose()
+    return latencies, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync vs async throughput by concurrent clients")
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=DEFAULT_THREADS,
+        help="AnyIO threadpool size for the sync stack (never below its default of 40)",
+    )
+    args = parser.parse_args()
+
+    medspa_id, appointment_id = _setup()
+    paths = [f"/medspas/{medspa_id}/services", f"/appointments/{appointment_id}"]
+    threads = max(args.threads, DEFAULT_THREADS)
+    stacks = {"sync": (_sync_app(), engine), "async": (app, async_engine.sync_engine)}
+    try:
+        print(f"requests={args.requests} sync_threads={threads}")
+        header = f"{'clients':>7} {'stack':>5} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}"
+        print(f"{header} {'errors':>6} {'wait max ms':>11} {'timeouts':>8}")
+        for clients in args.clients:
+            for stack, (target, pool_engine) in stacks.items():
+                t0 = time.perf_counter()
+                latencies, errors = asyncio.run(
+                    _run(target, pool_engine, paths, clients, args.requests, threads)
+                )
+                elapsed = time.perf_counter() - t0
+                cuts = statistics.quantiles(latencies, n=100)
+                p50, p99 = cuts[49] * 1000, cuts[98] * 1000
+                pool = pool_status(pool_engine)
+                print(
+                    f"{clients:>7} {stack:>5} {len(latencies) / elapsed:>8.1f} {p50:>8.2f}"
+                    f" {p99:>8.2f} {errors:>6} {pool['wait_max_ms']:>11.2f} {pool['timeouts']:>8}"
+                )
+    finally:
+        _teardown(medspa_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Link-insert benchmark: appointment_services writes for 1, 5 and 20 services per booking.
+
+Compares one INSERT per link (the previous create_with_services loop) with the single
+multi-VALUES INSERT now used by AppointmentRepository.create_with_services. Counts statements
+sent to the database and times each booking; every booking is rolled back. Runs against
+DATABASE_URL (schema from sql/schema.sql must be applied) and deletes its fixtures afterwards.
+
+    python -m benchmarks.link_insert --repeat 200
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal, engine
+from app.models.models import Appointment, Medspa, Service, appointment_services_table
+from app.repositories.appointment_repository import AppointmentRepository
+from app.utils.ulid import generate_id
+
+SERVICE_COUNTS = (1, 5, 20)
+
+
+def _setup(services: int) -> tuple[str, list[str]]:
+    with SessionLocal() as db:
+        medspa = Medspa(
+            id=generate_id(),
+            name=f"bench-{generate_id()}",
+            address="1 Benchmark Way",
+            phone_number="(512) 555-0199",
+            email="bench@example.com",
+        )
+        db.add(medspa)
+        db.flush()
+        rows = [
+            Service(id=generate_id(), medspa_id=medspa.id, name=f"Bench {i}", price=100, duration=5)
+            for i in range(services)
+        ]
+        db.add_all(rows)
+        db.commit()
+        return medspa.id, [s.id for s in rows]
+
+
+def _teardown(medspa_id: str) -> None:
+    with SessionLocal() as db:
+        medspa = db.get(Medspa, medspa_id)
+        if medspa is not None:
+            db.delete(medspa)
+            db.commit()
+
+
+def _per_row(db: Session, appointment: Appointment, service_ids: list[str]) -> None:
+    db.add(appointment)
+    db.flush()
+    for service_id in service_ids:
+        db.execute(
+            appointment_services_table.insert().values(
+                appointment_id=appointment.id,
+                appointment_start_time=appointment.start_time,
+                service_id=service_id,
+            )
+        )
+
+
+def _run(
+    write: Callable[[Session, Appointment, list[str]], object],
+    medspa_id: str,
+    service_ids: list[str],
+    repeat: int,
+    statements: list[str],
+) -> tuple[float, float]:
+    start = datetime.now(timezone.utc) + timedelta(days=30)
+    timings = []
+    counted = 0
+    for _ in range(repeat):
+        with SessionLocal() as db:
+            appointment = Appointment(
+                id=generate_id(),
+                medspa_id=medspa_id,
+                start_time=start,
+                status="scheduled",
+                total_price=100 * len(service_ids),
+                total_duration=5 * len(service_ids),
+            )
+            db.connection()  # check out before timing so BEGIN is not counted
+            statements.clear()
+            t0 = time.perf_counter()
+            write(db, appointment, service_ids)
+            timings.append(time.perf_counter() - t0)
+            counted += len(statements)
+            db.rollback()
+    return counted / repeat, statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="appointment_services insert benchmark")
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    medspa_id, service_ids = _setup(max(SERVICE_COUNTS))
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        print(f"{'services':>8} {'strategy':>12} {'statements':>10} {'median ms':>10}")
+        for n in SERVICE_COUNTS:
+            for name, write in (
+                ("per-row", _per_row),
+                ("multi-values", AppointmentRepository.create_with_services),
+            ):
+                per_booking, median_ms = _run(
+                    write, medspa_id, service_ids[:n], args.repeat, statements
+                )
+                print(f"{n:>8} {name:>12} {per_booking:>10.1f} {median_ms:>10.3f}")
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+        _teardown(medspa_id)
+
+
+if __name__ == "__main__":
+    main()
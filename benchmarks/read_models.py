@@ -0,0 +1,132 @@
+"""Read-path benchmark: ORM entities vs Core rows mapped into __slots__ records.
+
+Lists one medspa's appointments page by page two ways:
+
+- orm:     db.query(Appointment) + selectinload(services) (the previous AppointmentRepository.list)
+- records: AppointmentRepository.list (Core select + one services SELECT, AppointmentRecord)
+
+Reports median milliseconds per page and, via tracemalloc, the peak bytes allocated while
+loading a page plus the bytes still held by the loaded page. Runs against DATABASE_URL (schema
+from sql/schema.sql must be applied) and deletes its fixtures afterwards.
+
+    python -m benchmarks.read_models --appointments 2000 --limit 100 --repeat 50
+"""
+
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session, selectinload
+
+from app.db.database import SessionLocal
+from app.models.models import Appointment, Medspa, Service
+from app.repositories.appointment_repository import AppointmentRepository
+from app.utils.ulid import generate_id
+
+
+def _setup(appointments: int, services: int) -> str:
+    with SessionLocal() as db:
+        medspa = Medspa(
+            id=generate_id(),
+            name=f"bench-{generate_id()}",
+            address="1 Benchmark Way",
+            phone_number="(512) 555-0199",
+            email="bench@example.com",
+        )
+        db.add(medspa)
+        db.flush()
+        catalog = [
+            Service(id=generate_id(), medspa_id=medspa.id, name=f"Bench {i}", price=100, duration=5)
+            for i in range(services)
+        ]
+        db.add_all(catalog)
+        db.flush()
+        start = datetime.now(timezone.utc) + timedelta(days=30)
+        rows = [
+            Appointment(
+                id=generate_id(),
+                medspa_id=medspa.id,
+                start_time=start + timedelta(minutes=5 * services * i),
+                status="scheduled",
+                total_price=100 * services,
+                total_duration=5 * services,
+                end_time=start + timedelta(minutes=5 * services * (i + 1)),
+            )
+            for i in range(appointments)
+        ]
+        AppointmentRepository.create_many_with_services(
+            db, rows, [[s.id for s in catalog]] * appointments
+        )
+        db.commit()
+        return medspa.id
+
+
+def _teardown(medspa_id: str) -> None:
+    with SessionLocal() as db:
+        medspa = db.get(Medspa, medspa_id)
+        if medspa is not None:
+            db.delete(medspa)
+            db.commit()
+
+
+def _orm_page(db: Session, medspa_id: str, limit: int) -> list:
+    return (
+        db.query(Appointment)
+        .options(selectinload(Appointment.services))
+        .filter(Appointment.medspa_id == medspa_id)
+        .order_by(Appointment.id)
+        .limit(limit + 1)
+        .all()
+    )
+
+
+def _record_page(db: Session, medspa_id: str, limit: int) -> list:
+    return AppointmentRepository.list(db, medspa_id=medspa_id, limit=limit)
+
+
+def _run(
+    load: Callable[[Session, str, int], list], medspa_id: str, limit: int, repeat: int
+) -> tuple[float, int, int]:
+    timings = []
+    for _ in range(repeat):
+        with SessionLocal() as db:
+            db.connection()  # check out before timing
+            t0 = time.perf_counter()
+            load(db, medspa_id, limit)
+            timings.append(time.perf_counter() - t0)
+    with SessionLocal() as db:
+        db.connection()
+        gc.collect()
+        tracemalloc.start()
+        page = load(db, medspa_id, limit)
+        held, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del page
+    return statistics.median(timings) * 1000, peak, held
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ORM vs record read-path benchmark")
+    parser.add_argument("--appointments", type=int, default=1000)
+    parser.add_argument("--services", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    medspa_id = _setup(args.appointments, args.services)
+    try:
+        print(f"page={args.limit} services/appointment={args.services} repeat={args.repeat}")
+        print(f"{'path':>8} {'median ms':>10} {'peak KiB':>9} {'held KiB':>9}")
+        for name, load in (("orm", _orm_page), ("records", _record_page)):
+            median_ms, peak, held = _run(load, medspa_id, args.limit, args.repeat)
+            print(f"{name:>8} {median_ms:>10.3f} {peak / 1024:>9.1f} {held / 1024:>9.1f}")
+    finally:
+        _teardown(medspa_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Response serialization benchmark: CPU time per 100-item appointment page.
+
+Serves the same in-memory page (ORM Appointments with nested services, no database) two ways:
+
+- before: return PaginatedResponse[AppointmentResponse] built with from_appointment and let
+  response_model validate and serialize it again (the previous route pattern)
+- after:  return FastJSONResponse(paginated_content(...)) built with content_from_appointment
+
+Both go through the same TestClient stack, so the difference is the serialization path.
+
+    python -m benchmarks.response_serialization --items 100 --services 3 --requests 500
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.responses import FastJSONResponse
+from app.models.models import Appointment, Service
+from app.schemas.appointments import AppointmentResponse
+from app.schemas.pagination import PaginatedResponse, paginated_content
+from app.utils.ulid import generate_id
+
+
+def _page(items: int, services: int) -> list[Appointment]:
+    now = datetime.now(timezone.utc)
+    medspa_id = generate_id()
+    catalog = [
+        Service(
+            id=generate_id(),
+            medspa_id=medspa_id,
+            name=f"Service {i}",
+            price=1000 * (i + 1),
+            duration=15,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(services)
+    ]
+    return [
+        Appointment(
+            id=generate_id(),
+            medspa_id=medspa_id,
+            start_time=now + timedelta(hours=i),
+            status="scheduled",
+            total_price=sum(s.price for s in catalog),
+            total_duration=15 * services,
+            created_at=now,
+            updated_at=now,
+            services=list(catalog),
+        )
+        for i in range(items)
+    ]
+
+
+def _app(page: list[Appointment]) -> FastAPI:
+    bench = FastAPI()
+
+    @bench.get("/before", response_model=PaginatedResponse[AppointmentResponse])
+    def before():
+        return PaginatedResponse(
+            items=[AppointmentResponse.from_appointment(a) for a in page],
+            next_cursor="cursor",
+            limit=len(page),
+        )
+
+    @bench.get("/after", response_model=PaginatedResponse[AppointmentResponse])
+    def after():
+        return FastJSONResponse(
+            paginated_content(
+                [AppointmentResponse.content_from_appointment(a) for a in page],
+                "cursor",
+                len(page),
+            )
+        )
+
+    return bench
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Response serialization benchmark")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--services", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    client = TestClient(_app(_page(args.items, args.services)))
+    assert client.get("/before").json() == client.get("/after").json()
+    print(f"items={args.items} services/item={args.services} requests={args.requests}")
+    for path in ("/before", "/after"):
+        t0 = time.process_time()
+        for _ in range(args.requests):
+            client.get(path)
+        per_page_ms = (time.process_time() - t0) / args.requests * 1000
+        print(f"{path:>8}: {per_page_ms:.3f} ms CPU per page")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 -- MedSpa API schema
 -- Run with: psql -U postgres -d medspa_db -f schema.sql (from /sql in container)
 
+-- GiST operator classes for scalar columns (medspa_id in the appointment slot index)
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
 -- Medspas: basic info
 CREATE TABLE IF NOT EXISTS medspas (
     id CHAR(26) PRIMARY KEY,
@@ -24,30 +27,71 @@ CREATE TABLE IF NOT EXISTS services (
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
-CREATE INDEX IF NOT EXISTS idx_services_medspa_id ON services(medspa_id);
+-- Service list per medspa in id (cursor) order without a sort step
+CREATE INDEX IF NOT EXISTS idx_services_medspa_id_id ON services(medspa_id, id);
+
+-- Service catalog version per medspa: bumped in the same transaction as every service write,
+-- so cached catalogs (OfferingsService.get_catalog) can be checked with one key lookup
+CREATE TABLE IF NOT EXISTS medspa_catalog_versions (
+    medspa_id CHAR(26) PRIMARY KEY REFERENCES medspas(id) ON DELETE CASCADE,
+    version BIGINT NOT NULL
+);
 
--- Appointments: bookings (total_price and total_duration stored for historical accuracy)
+-- Appointments: bookings (total_price and total_duration stored for historical accuracy).
+-- Range partitioned by start_time, one partition per UTC month (appointments_pYYYY_MM) plus
+-- appointments_default for months without one; see create_appointment_partitions below. Queries
+-- with a start_time window only touch that window's partitions. Unique keys must include the
+-- partition key, so the primary key is (id, start_time); ids are ULIDs generated by the API.
 CREATE TABLE IF NOT EXISTS appointments (
-    id CHAR(26) PRIMARY KEY,
+    id CHAR(26) NOT NULL,
     medspa_id CHAR(26) NOT NULL REFERENCES medspas(id) ON DELETE CASCADE,
     start_time TIMESTAMPTZ NOT NULL,
     status VARCHAR(50) NOT NULL CHECK (status IN ('scheduled', 'completed', 'canceled')),
     total_price INTEGER NOT NULL,
     -- total_price in cents (derived from services at creation)
     total_duration INTEGER NOT NULL,
+    -- end_time = start_time + total_duration minutes (set by trg_appointments_end_time);
+    -- persisted so overlap checks can use idx_appointments_scheduled_slot
+    end_time TIMESTAMPTZ NOT NULL,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-);
-CREATE INDEX IF NOT EXISTS idx_appointments_medspa_id ON appointments(medspa_id);
-CREATE INDEX IF NOT EXISTS idx_appointments_status ON appointments(status);
-CREATE INDEX IF NOT EXISTS idx_appointments_start_time ON appointments(start_time);
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, start_time),
+    CONSTRAINT appointments_end_after_start CHECK (end_time > start_time),
+    -- MAX_APPOINTMENT_MINUTES in app/models/models.py: overlap checks rely on it to bound
+    -- start_time from below, so they only probe the partitions near the requested slot
+    CONSTRAINT appointments_duration_bounded CHECK (total_duration <= 1440)
+) PARTITION BY RANGE (start_time);
+CREATE TABLE IF NOT EXISTS appointments_default PARTITION OF appointments DEFAULT;
+-- Keyset pagination (AppointmentRepository.list): one index per filter + sort key combination,
+-- so every page is a range scan with no sort step. Prefixes also serve plain medspa_id lookups.
+-- tests/integration/test_query_plans.py fails if a list query falls back to a seq scan or sort.
+CREATE INDEX IF NOT EXISTS idx_appointments_medspa_id_id ON appointments(medspa_id, id);
+CREATE INDEX IF NOT EXISTS idx_appointments_medspa_status_id ON appointments(medspa_id, status, id);
+CREATE INDEX IF NOT EXISTS idx_appointments_status_id ON appointments(status, id);
+CREATE INDEX IF NOT EXISTS idx_appointments_start_time_id ON appointments(start_time, id);
+CREATE INDEX IF NOT EXISTS idx_appointments_medspa_start_time_id
+    ON appointments(medspa_id, start_time, id);
+-- Hot set: a medspa's upcoming (scheduled) appointments in start_time order, e.g. dashboards
+CREATE INDEX IF NOT EXISTS idx_appointments_scheduled_medspa_start_time_id
+    ON appointments(medspa_id, start_time, id)
+    WHERE status = 'scheduled';
+-- Booking conflict detection: range probe over scheduled slots of one medspa
+CREATE INDEX IF NOT EXISTS idx_appointments_scheduled_slot ON appointments
+    USING gist (medspa_id, tstzrange(start_time, end_time, '[)'))
+    WHERE status = 'scheduled';
 
--- Appointment-Services: many-to-many (service_id ON DELETE RESTRICT to preserve history)
+-- Appointment-Services: many-to-many (service_id ON DELETE RESTRICT to preserve history).
+-- appointment_start_time copies the appointment's start_time: it completes the key appointments
+-- is unique on, and partitions the links by the same months as their appointments.
 CREATE TABLE IF NOT EXISTS appointment_services (
-    appointment_id CHAR(26) NOT NULL REFERENCES appointments(id) ON DELETE CASCADE,
+    appointment_id CHAR(26) NOT NULL,
+    appointment_start_time TIMESTAMPTZ NOT NULL,
     service_id CHAR(26) NOT NULL REFERENCES services(id) ON DELETE RESTRICT,
-    PRIMARY KEY (appointment_id, service_id)
-);
+    PRIMARY KEY (appointment_id, appointment_start_time, service_id),
+    FOREIGN KEY (appointment_id, appointment_start_time)
+        REFERENCES appointments(id, start_time) ON DELETE CASCADE ON UPDATE CASCADE
+) PARTITION BY RANGE (appointment_start_time);
+CREATE TABLE IF NOT EXISTS appointment_services_default PARTITION OF appointment_services DEFAULT;
 CREATE INDEX IF NOT EXISTS idx_appointment_services_appointment_id ON appointment_services(appointment_id);
 CREATE INDEX IF NOT EXISTS idx_appointment_services_service_id ON appointment_services(service_id);
 
@@ -74,3 +118,69 @@ CREATE TRIGGER trg_appointments_updated_at
     BEFORE UPDATE ON appointments
     FOR EACH ROW
     EXECUTE PROCEDURE update_updated_at();
+
+-- Keep appointments.end_time derived from start_time + total_duration (covers direct SQL)
+CREATE OR REPLACE FUNCTION set_appointment_end_time()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.end_time = NEW.start_time + NEW.total_duration * interval '1 minute';
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_appointments_end_time
+    BEFORE INSERT OR UPDATE OF start_time, total_duration ON appointments
+    FOR EACH ROW
+    EXECUTE PROCEDURE set_appointment_end_time();
+
+-- Monthly partitions (UTC months) of appointments and appointment_services covering
+-- [from_time, through). Idempotent: the API runs it at startup and then periodically
+-- (app/db/partitions.py). Postgres will not create a partition while the default partition holds
+-- rows for its range, so a month's rows booked before its partition existed are parked, deleted
+-- from the defaults and inserted again once the partitions exist, all in this transaction.
+-- Returns the number of months created.
+CREATE OR REPLACE FUNCTION create_appointment_partitions(from_time TIMESTAMPTZ, through TIMESTAMPTZ)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start TIMESTAMP := date_trunc('month', from_time AT TIME ZONE 'UTC');
+    lower_bound TIMESTAMPTZ;
+    upper_bound TIMESTAMPTZ;
+    suffix TEXT;
+    created INTEGER := 0;
+BEGIN
+    -- Every API worker runs this at startup; one at a time
+    PERFORM pg_advisory_xact_lock(hashtext('create_appointment_partitions'));
+    WHILE month_start AT TIME ZONE 'UTC' < through LOOP
+        lower_bound := month_start AT TIME ZONE 'UTC';
+        upper_bound := (month_start + interval '1 month') AT TIME ZONE 'UTC';
+        suffix := to_char(month_start, '"p"YYYY_MM');
+        IF to_regclass('appointments_' || suffix) IS NULL THEN
+            -- Links first: deleting their appointments cascades to them
+            CREATE TEMP TABLE parked_links ON COMMIT DROP AS
+                SELECT * FROM appointment_services_default
+                WHERE appointment_start_time >= lower_bound AND appointment_start_time < upper_bound;
+            CREATE TEMP TABLE parked_appointments ON COMMIT DROP AS
+                SELECT * FROM appointments_default
+                WHERE start_time >= lower_bound AND start_time < upper_bound;
+            DELETE FROM appointments_default
+                WHERE start_time >= lower_bound AND start_time < upper_bound;
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF appointments FOR VALUES FROM (%L) TO (%L)',
+                'appointments_' || suffix, lower_bound, upper_bound);
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF appointment_services FOR VALUES FROM (%L) TO (%L)',
+                'appointment_services_' || suffix, lower_bound, upper_bound);
+            INSERT INTO appointments SELECT * FROM parked_appointments;
+            INSERT INTO appointment_services SELECT * FROM parked_links;
+            DROP TABLE parked_links;
+            DROP TABLE parked_appointments;
+            created := created + 1;
+        END IF;
+        month_start := month_start + interval '1 month';
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- This month_start and the next twelve; the API keeps extending this (appointment_partition_months_ahead)
+SELECT create_appointment_partitions(NOW(), NOW() + interval '13 months');
@@ -4,13 +4,19 @@ from datetime import timezone
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 # Use DATABASE_URL if set (e.g. in Docker: postgres_test). Otherwise use localhost:5433
 # so local pytest works when test DB is running: docker-compose -f docker-compose.test.yml up -d
-from app.db.database import Base, get_db
+from app.config import settings
+from app.db.database import Base, async_url, get_async_db
+from app.db.query_stats import instrument_queries
 from app.main import app
 from app.models.models import Appointment, Medspa, Service, appointment_services_table
+from app.services.medspa_service import medspa_cache
+from app.services.offerings_service import catalog_cache
 from app.utils.ulid import generate_id
 
 TEST_DATABASE_URL = os.environ.get(
@@ -20,6 +26,19 @@ TEST_DATABASE_URL = os.environ.get(
 
 test_engine = create_engine(TEST_DATABASE_URL)
 TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+instrument_queries(test_engine)
+# Routes run on asyncpg. No pool: each TestClient runs its own event loop, and an asyncpg
+# connection cannot outlive the loop it was opened on.
+test_async_engine = create_async_engine(async_url(TEST_DATABASE_URL), poolclass=NullPool)
+TestAsyncSessionLocal = async_sessionmaker(test_async_engine, autoflush=False)
+instrument_queries(test_async_engine.sync_engine)
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """Start every test cold: tables are truncated between tests, the process caches are not."""
+    medspa_cache.clear()
+    catalog_cache.clear()
 
 
 @pytest.fixture(scope="session")
@@ -48,14 +67,15 @@ def db_session(setup_test_db):
 
 
 @pytest.fixture
-def client(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-
-    app.dependency_overrides[get_db] = override_get_db
+def client(db_session, monkeypatch):
+    # A route going over its SQL statement budget fails the test (see app/db/query_stats.py)
+    monkeypatch.setattr(settings, "query_budget_strict", True)
+
+    async def override_get_db():
+        async with TestAsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -156,7 +176,9 @@ def sample_appointment(db_session, sample_medspa, sample_services):
     db_session.flush()
     for s in sample_services:
         db_session.execute(
-            appointment_services_table.insert().values(appointment_id=appt.id, service_id=s.id)
+            appointment_services_table.insert().values(
+                appointment_id=appt.id, appointment_start_time=appt.start_time, service_id=s.id
+            )
         )
     db_session.commit()
     db_session.refresh(appt)
@@ -182,7 +204,9 @@ def multiple_appointments(db_session, sample_medspa, sample_services):
         db_session.flush()
         for s in sample_services:
             db_session.execute(
-                appointment_services_table.insert().values(appointment_id=appt.id, service_id=s.id)
+                appointment_services_table.insert().values(
+                    appointment_id=appt.id, appointment_start_time=appt.start_time, service_id=s.id
+                )
             )
         appts.append(appt)
     db_session.commit()
@@ -1,9 +1,13 @@
+import json
 from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from app.exceptions import NotFoundError
 from app.models.models import Appointment, Service, appointment_services_table
+from app.models.read_models import AppointmentRecord
 from app.repositories.appointment_repository import AppointmentRepository
 from app.utils.ulid import generate_id
 
@@ -47,15 +51,90 @@ def test_list_status_filter_returns_none_when_no_match(db_session: Session, samp
     assert isinstance(lst, list)
 
 
+def test_get_by_id_returns_record_with_services(
+    db_session: Session, sample_appointment: Appointment, sample_services
+):
+    record = AppointmentRepository.get_by_id(db_session, sample_appointment.id)
+    assert isinstance(record, AppointmentRecord)
+    assert record.start_time == sample_appointment.start_time
+    assert [s.id for s in record.services] == sorted(s.id for s in sample_services)
+    with pytest.raises(NotFoundError, match="Appointment not found"):
+        AppointmentRepository.get_by_id(db_session, generate_id())
+
+
+def test_list_records_carry_their_own_services(db_session: Session, sample_medspa, sample_services):
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    appointments = [
+        Appointment(
+            id=generate_id(),
+            medspa_id=sample_medspa.id,
+            start_time=start + timedelta(hours=i),
+            status="scheduled",
+            total_price=service.price,
+            total_duration=service.duration,
+            end_time=start + timedelta(hours=i, minutes=service.duration),
+        )
+        for i, service in enumerate(sample_services)
+    ]
+    AppointmentRepository.create_many_with_services(
+        db_session, appointments, [[s.id] for s in sample_services]
+    )
+
+    records = AppointmentRepository.list(db_session, medspa_id=sample_medspa.id)
+
+    assert {r.id: [s.id for s in r.services] for r in records} == {
+        a.id: [s.id] for a, s in zip(appointments, sample_services, strict=True)
+    }
+
+
+def test_list_json_nests_services(
+    db_session: Session, sample_appointment: Appointment, sample_services
+):
+    page = AppointmentRepository.list_json(db_session, limit=20)
+
+    [item] = json.loads(page.items)
+    assert item["id"] == sample_appointment.id
+    assert [s["id"] for s in item["services"]] == sorted(s.id for s in sample_services)
+    assert set(item["services"][0]) == {"id", "name", "price", "duration"}
+    assert page.last is None
+
+
+def test_list_json_appointment_without_services_has_empty_list(db_session: Session, sample_medspa):
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    appointment = Appointment(
+        id=generate_id(),
+        medspa_id=sample_medspa.id,
+        start_time=start,
+        status="scheduled",
+        total_price=0,
+        total_duration=30,
+        end_time=start + timedelta(minutes=30),
+    )
+    AppointmentRepository.create_with_services(db_session, appointment, [])
+
+    page = AppointmentRepository.list_json(db_session, medspa_id=sample_medspa.id)
+
+    assert [item["services"] for item in json.loads(page.items)] == [[]]
+
+
 def test_update_persists_status_change(db_session: Session, sample_appointment: Appointment):
     sample_appointment.status = "completed"
     saved = AppointmentRepository.update(db_session, sample_appointment)
     assert saved.status == "completed"
-    got = db_session.get(Appointment, sample_appointment.id)
+    got = db_session.get(Appointment, (sample_appointment.id, sample_appointment.start_time))
     assert got is not None
     assert got.status == "completed"
 
 
+def test_end_time_derived_from_start_and_duration(
+    db_session: Session, sample_appointment: Appointment
+):
+    """end_time is persisted on insert so overlap checks can use the slot index."""
+    got = db_session.get(Appointment, (sample_appointment.id, sample_appointment.start_time))
+    assert got is not None
+    assert got.end_time == got.start_time + timedelta(minutes=got.total_duration)
+
+
 def test_find_scheduled_overlapping_returns_nothing_when_no_overlap(
     db_session: Session, sample_medspa, sample_services
 ):
@@ -73,7 +152,9 @@ def test_find_scheduled_overlapping_returns_nothing_when_no_overlap(
     db_session.flush()
     for s in sample_services:
         db_session.execute(
-            appointment_services_table.insert().values(appointment_id=appt.id, service_id=s.id)
+            appointment_services_table.insert().values(
+                appointment_id=appt.id, appointment_start_time=appt.start_time, service_id=s.id
+            )
         )
     db_session.commit()
     db_session.refresh(appt)
@@ -103,7 +184,9 @@ def test_find_scheduled_overlapping_returns_appointment_when_same_service_overla
     db_session.flush()
     for s in sample_services:
         db_session.execute(
-            appointment_services_table.insert().values(appointment_id=appt.id, service_id=s.id)
+            appointment_services_table.insert().values(
+                appointment_id=appt.id, appointment_start_time=appt.start_time, service_id=s.id
+            )
         )
     db_session.commit()
     db_session.refresh(appt)
@@ -133,7 +216,9 @@ def test_find_scheduled_overlapping_returns_nothing_when_appointment_completed(
     db_session.flush()
     for s in sample_services:
         db_session.execute(
-            appointment_services_table.insert().values(appointment_id=appt.id, service_id=s.id)
+            appointment_services_table.insert().values(
+                appointment_id=appt.id, appointment_start_time=appt.start_time, service_id=s.id
+            )
         )
     db_session.commit()
     db_session.refresh(appt)
@@ -162,7 +247,9 @@ def test_find_scheduled_overlapping_returns_nothing_when_appointment_canceled(
     db_session.flush()
     for s in sample_services:
         db_session.execute(
-            appointment_services_table.insert().values(appointment_id=appt.id, service_id=s.id)
+            appointment_services_table.insert().values(
+                appointment_id=appt.id, appointment_start_time=appt.start_time, service_id=s.id
+            )
         )
     db_session.commit()
     db_session.refresh(appt)
@@ -201,7 +288,9 @@ def test_find_scheduled_overlapping_returns_nothing_when_different_service(
     db_session.flush()
     db_session.execute(
         appointment_services_table.insert().values(
-            appointment_id=appt.id, service_id=other_service.id
+            appointment_id=appt.id,
+            appointment_start_time=appt.start_time,
+            service_id=other_service.id,
         )
     )
     db_session.commit()
@@ -231,7 +320,9 @@ def test_find_scheduled_overlapping_two_services_overlap_on_one(
     db_session.flush()
     for s in sample_services:
         db_session.execute(
-            appointment_services_table.insert().values(appointment_id=appt.id, service_id=s.id)
+            appointment_services_table.insert().values(
+                appointment_id=appt.id, appointment_start_time=appt.start_time, service_id=s.id
+            )
         )
     db_session.commit()
     db_session.refresh(appt)
@@ -244,6 +335,37 @@ def test_find_scheduled_overlapping_two_services_overlap_on_one(
     assert result[0].id == appt.id
 
 
+def test_find_scheduled_overlapping_returns_appointment_when_window_contains_it(
+    db_session: Session, sample_medspa, sample_services
+):
+    """Requested window that fully contains an existing booking is a conflict."""
+    base = datetime(2025, 6, 1, 10, 0, 0, tzinfo=timezone.utc)
+    appt = Appointment(
+        id=generate_id(),
+        medspa_id=sample_medspa.id,
+        start_time=base,
+        status="scheduled",
+        total_price=1000,
+        total_duration=15,
+    )
+    db_session.add(appt)
+    db_session.flush()
+    db_session.execute(
+        appointment_services_table.insert().values(
+            appointment_id=appt.id,
+            appointment_start_time=appt.start_time,
+            service_id=sample_services[0].id,
+        )
+    )
+    db_session.commit()
+    start = base - timedelta(minutes=30)
+    end = base + timedelta(minutes=60)
+    result = AppointmentRepository.find_scheduled_overlapping(
+        db_session, sample_medspa.id, start, end, [sample_services[0].id]
+    )
+    assert [a.id for a in result] == [appt.id]
+
+
 def test_find_scheduled_overlapping_empty_service_ids_returns_empty(
     db_session: Session, sample_medspa
 ):
@@ -252,3 +374,133 @@ def test_find_scheduled_overlapping_empty_service_ids_returns_empty(
         db_session, sample_medspa.id, base, base + timedelta(minutes=30), []
     )
     assert result == []
+
+
+def test_insert_if_available_inserts_appointment_and_links(
+    db_session: Session, sample_medspa, sample_services
+):
+    start = datetime(2030, 6, 1, 10, 0, 0, tzinfo=timezone.utc)
+    service_ids = [s.id for s in sample_services]
+    attempt = AppointmentRepository.insert_if_available(
+        db_session, generate_id(), sample_medspa.id, start, service_ids
+    )
+    db_session.commit()
+    assert attempt.medspa_found is True
+    assert attempt.conflict is False
+    assert [s.id for s in attempt.services] == service_ids
+    created = attempt.appointment
+    assert created is not None
+    assert created.status == "scheduled"
+    assert created.total_price == 3000
+    assert created.total_duration == 45
+    assert created.end_time == start + timedelta(minutes=45)
+    assert created.created_at is not None
+    assert {s.id for s in created.services} == set(service_ids)
+    stored = AppointmentRepository.get_by_id(db_session, created.id)
+    assert {s.id for s in stored.services} == set(service_ids)
+
+
+def test_insert_if_available_conflict_inserts_nothing(
+    db_session: Session, sample_medspa, sample_services
+):
+    start = datetime(2030, 6, 1, 10, 0, 0, tzinfo=timezone.utc)
+    first = AppointmentRepository.insert_if_available(
+        db_session, generate_id(), sample_medspa.id, start, [sample_services[0].id]
+    )
+    assert first.appointment is not None
+    second = AppointmentRepository.insert_if_available(
+        db_session,
+        generate_id(),
+        sample_medspa.id,
+        start + timedelta(minutes=5),
+        [sample_services[0].id],
+    )
+    assert second.conflict is True
+    assert second.appointment is None
+    count = db_session.query(Appointment).filter(Appointment.medspa_id == sample_medspa.id).count()
+    assert count == 1
+
+
+def test_insert_if_available_unknown_medspa_or_service_inserts_nothing(
+    db_session: Session, sample_medspa, sample_services
+):
+    start = datetime(2030, 6, 1, 10, 0, 0, tzinfo=timezone.utc)
+    no_medspa = AppointmentRepository.insert_if_available(
+        db_session, generate_id(), generate_id(), start, [sample_services[0].id]
+    )
+    assert no_medspa.medspa_found is False
+    assert no_medspa.appointment is None
+    missing_service = AppointmentRepository.insert_if_available(
+        db_session, generate_id(), sample_medspa.id, start, [sample_services[0].id, generate_id()]
+    )
+    assert [s.id for s in missing_service.services] == [sample_services[0].id]
+    assert missing_service.appointment is None
+    assert db_session.query(Appointment).count() == 0
+
+
+def test_create_many_with_services_inserts_rows_and_links(
+    db_session: Session, sample_medspa, sample_services
+):
+    start = datetime(2030, 6, 1, 10, 0, 0, tzinfo=timezone.utc)
+    appointments = [
+        Appointment(
+            id=generate_id(),
+            medspa_id=sample_medspa.id,
+            start_time=start + timedelta(hours=i),
+            status="scheduled",
+            total_price=3000,
+            total_duration=45,
+            end_time=start + timedelta(hours=i, minutes=45),
+        )
+        for i in range(3)
+    ]
+    service_ids = [[s.id for s in sample_services]] * 3
+    created = AppointmentRepository.create_many_with_services(db_session, appointments, service_ids)
+    db_session.commit()
+    assert all(a.created_at is not None for a in created)
+    for a in created:
+        stored = AppointmentRepository.get_by_id(db_session, a.id)
+        assert {s.id for s in stored.services} == {s.id for s in sample_services}
+    by_service = AppointmentRepository.list_scheduled_slots_by_service(
+        db_session,
+        sample_medspa.id,
+        start,
+        start + timedelta(hours=3),
+        [sample_services[0].id],
+    )
+    assert len(by_service[sample_services[0].id]) == 3
+
+
+def test_create_with_services_writes_links_in_one_statement(db_session: Session, sample_medspa):
+    services = [
+        Service(id=generate_id(), medspa_id=sample_medspa.id, name=f"S{i}", price=100, duration=5)
+        for i in range(5)
+    ]
+    db_session.add_all(services)
+    db_session.commit()
+    appointment = Appointment(
+        id=generate_id(),
+        medspa_id=sample_medspa.id,
+        start_time=datetime(2030, 6, 1, 10, 0, 0, tzinfo=timezone.utc),
+        status="scheduled",
+        total_price=500,
+        total_duration=25,
+    )
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        AppointmentRepository.create_with_services(
+            db_session, appointment, [s.id for s in services]
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    db_session.commit()
+
+    assert sum("appointment_services" in st for st in statements) == 1
+    stored = AppointmentRepository.get_by_id(db_session, appointment.id)
+    assert {s.id for s in stored.services} == {s.id for s in services}
@@ -2,6 +2,7 @@ import pytest
 from sqlalchemy.orm import Session
 
 from app.models.models import Medspa
+from app.models.read_models import MedspaRecord
 from app.repositories.medspa_repository import MedspaRepository
 from app.utils.ulid import generate_id
 
@@ -38,6 +39,19 @@ def test_list_with_cursor_returns_only_after_cursor(db_session: Session, multipl
     assert ids[2] == page_ids[0]
 
 
+def test_get_by_id_returns_record(db_session: Session, sample_medspa: Medspa):
+    record = MedspaRepository.get_by_id(db_session, sample_medspa.id)
+    assert isinstance(record, MedspaRecord)
+    assert record.id == sample_medspa.id
+    assert record.email == sample_medspa.email
+    assert record.created_at == sample_medspa.created_at
+    assert sample_medspa.id in {m.id for m in MedspaRepository.list(db_session)}
+
+
+def test_get_by_id_missing_returns_none(db_session: Session):
+    assert MedspaRepository.get_by_id(db_session, generate_id()) is None
+
+
 def test_add_persists_and_returns_medspa(db_session: Session):
     medspa = Medspa(
         id=generate_id(),
@@ -2,6 +2,7 @@ import pytest
 from sqlalchemy.orm import Session
 
 from app.models.models import Service
+from app.models.read_models import ServiceRecord
 from app.repositories.service_repository import ServiceRepository
 from app.utils.ulid import generate_id
 
@@ -34,6 +35,18 @@ def test_list_by_medspa_id_returns_services(
     assert sample_service.id in ids
 
 
+def test_get_by_id_returns_record(db_session: Session, sample_service: Service):
+    record = ServiceRepository.get_by_id(db_session, sample_service.id)
+    assert isinstance(record, ServiceRecord)
+    assert (record.id, record.medspa_id, record.price, record.duration) == (
+        sample_service.id,
+        sample_service.medspa_id,
+        sample_service.price,
+        sample_service.duration,
+    )
+    assert ServiceRepository.get_by_id(db_session, generate_id()) is None
+
+
 def test_find_by_ids_empty(db_session: Session):
     assert ServiceRepository.find_by_ids(db_session, []) == []
 
@@ -52,6 +65,23 @@ def test_find_by_ids_all(db_session: Session, sample_services):
     assert {s.id for s in found} == set(ids)
 
 
+def test_list_catalog_returns_only_medspa_services(
+    db_session: Session, sample_medspa, sample_services
+):
+    catalog = ServiceRepository.list_catalog(db_session, sample_medspa.id)
+    assert [s.id for s in catalog] == sorted(s.id for s in sample_services)
+    assert all(isinstance(s, ServiceRecord) for s in catalog)
+    assert ServiceRepository.list_catalog(db_session, generate_id()) == []
+
+
+def test_catalog_version_starts_at_zero_and_bumps(db_session: Session, sample_medspa):
+    assert ServiceRepository.catalog_version(db_session, sample_medspa.id) == 0
+    assert ServiceRepository.bump_catalog_version(db_session, sample_medspa.id) == 1
+    assert ServiceRepository.bump_catalog_version(db_session, sample_medspa.id) == 2
+    db_session.commit()
+    assert ServiceRepository.catalog_version(db_session, sample_medspa.id) == 2
+
+
 def test_add_persists_and_returns_service(db_session: Session, sample_medspa):
     service = Service(
         id=generate_id(),
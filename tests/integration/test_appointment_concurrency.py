@@ -0,0 +1,105 @@
+"""Concurrent bookings against the real database: advisory locks make the overlap check race-free.
+
+Also checks that the per-process service catalog cache never prices a booking with a
+service price older than the last committed update.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.exceptions import AppException, ConflictError
+from app.models.models import Appointment, Service
+from app.schemas.appointments import AppointmentCreate
+from app.schemas.services import ServiceUpdate
+from app.services.appointment_service import AppointmentService
+from app.services.offerings_service import OfferingsService
+from app.utils.ulid import generate_id
+
+pytestmark = pytest.mark.integration
+
+PARALLEL_BOOKINGS = 8
+PRICE_WRITERS = 4
+PRICE_ROUNDS = 10
+
+
+def test_parallel_bookings_same_slot_exactly_one_succeeds(
+    db_session: Session, sample_medspa, sample_service
+):
+    factory = sessionmaker(bind=db_session.get_bind(), autocommit=False, autoflush=False)
+    start = (datetime.now(timezone.utc) + timedelta(days=2)).replace(microsecond=0)
+    data = AppointmentCreate(start_time=start, service_ids=[sample_service.id])
+
+    def book() -> str:
+        session = factory()
+        try:
+            AppointmentService.create_appointment(session, sample_medspa.id, data)
+            return "created"
+        except ConflictError:
+            return "conflict"
+        except AppException as exc:
+            return f"error:{exc.status_code}"
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=PARALLEL_BOOKINGS) as pool:
+        outcomes = list(pool.map(lambda _: book(), range(PARALLEL_BOOKINGS)))
+
+    assert outcomes.count("created") == 1
+    assert outcomes.count("conflict") == PARALLEL_BOOKINGS - 1
+    booked = db_session.query(Appointment).filter(Appointment.medspa_id == sample_medspa.id).all()
+    assert len(booked) == 1
+
+
+def test_price_update_is_never_served_stale_after_commit(db_session: Session, sample_medspa):
+    """Writers each reprice their own service and then book it; every booking sees the new price.
+
+    All services share one medspa, so each commit bumps the catalog version the others are
+    reading and caching concurrently.
+    """
+    factory = sessionmaker(bind=db_session.get_bind(), autocommit=False, autoflush=False)
+    services = [
+        Service(
+            id=generate_id(),
+            medspa_id=sample_medspa.id,
+            name=f"Priced {i}",
+            price=1000,
+            duration=15,
+        )
+        for i in range(PRICE_WRITERS)
+    ]
+    db_session.add_all(services)
+    db_session.commit()
+    base = (datetime.now(timezone.utc) + timedelta(days=2)).replace(microsecond=0)
+
+    def reprice_and_book(writer: int) -> list[tuple[int, int]]:
+        service_id = services[writer].id
+        stale: list[tuple[int, int]] = []
+        for round_ in range(PRICE_ROUNDS):
+            price = 1000 + 100 * writer + round_ + 1
+            session = factory()
+            try:
+                OfferingsService.update_service(session, service_id, ServiceUpdate(price=price))
+            finally:
+                session.close()
+            session = factory()
+            try:
+                start = base + timedelta(hours=round_)
+                [outcome] = AppointmentService.create_appointments_batch(
+                    session,
+                    sample_medspa.id,
+                    [AppointmentCreate(start_time=start, service_ids=[service_id])],
+                )
+            finally:
+                session.close()
+            assert outcome.appointment is not None, outcome.detail
+            if outcome.appointment.total_price != price:
+                stale.append((price, outcome.appointment.total_price))
+        return stale
+
+    with ThreadPoolExecutor(max_workers=PRICE_WRITERS) as pool:
+        results = list(pool.map(reprice_and_book, range(PRICE_WRITERS)))
+
+    assert results == [[] for _ in range(PRICE_WRITERS)]
@@ -1,8 +1,15 @@
+import csv
+import io
+import json
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.utils.export import to_ndjson
 from app.utils.ulid import generate_id
 
 pytestmark = pytest.mark.integration
@@ -57,6 +64,23 @@ def test_create_appointment_past_start_time_returns_400(
     assert r.status_code == 422
 
 
+def test_create_appointment_longer_than_a_day_returns_400(client: TestClient, sample_medspa):
+    service_ids = [
+        client.post(
+            f"/medspas/{sample_medspa.id}/services",
+            json={"name": f"Long {minutes}", "price": 1000, "duration": minutes},
+        ).json()["id"]
+        for minutes in (1000, 441)
+    ]
+    start = (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0).isoformat()
+    r = client.post(
+        f"/medspas/{sample_medspa.id}/appointments",
+        json={"start_time": start, "service_ids": service_ids},
+    )
+    assert r.status_code == 400
+    assert "cannot be longer than 1440 minutes" in r.json()["detail"]
+
+
 def test_get_appointment_success(client: TestClient, sample_appointment):
     r = client.get(f"/appointments/{sample_appointment.id}")
     assert r.status_code == 200
@@ -155,7 +179,6 @@ def test_list_appointments_pagination_multiple_pages(
             assert data["next_cursor"] is None
             break
         if data["next_cursor"] is not None:
-            assert data["next_cursor"] == items[-1]["id"]
             cursor = data["next_cursor"]
         else:
             break
@@ -173,6 +196,141 @@ def test_list_appointments_pagination_ordered_by_id(
     assert ids == sorted(ids)
 
 
+def _book_at(client: TestClient, medspa_id: str, service_id: str, start: datetime) -> str:
+    r = client.post(
+        f"/medspas/{medspa_id}/appointments",
+        json={"start_time": start.isoformat(), "service_ids": [service_id]},
+    )
+    assert r.status_code == 201
+    return r.json()["id"]
+
+
+def _all_pages(
+    client: TestClient, path: str, params: dict, pages: Optional[list[dict]] = None
+) -> list[dict]:
+    """Every item of a list, following next_cursor; each page as returned is added to pages."""
+    items: list[dict] = []
+    cursor = None
+    while True:
+        r = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert r.status_code == 200
+        data = r.json()
+        if pages is not None:
+            pages.append(data)
+        items.extend(data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return items
+
+
+@pytest.mark.parametrize("sort", ["start_time", "-start_time"])
+def test_list_appointments_sorted_by_start_time_across_pages(
+    client: TestClient, sample_medspa, sample_service, sort
+):
+    base = (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0)
+    # Booked out of chronological order, so id order differs from start_time order
+    for hours in (3, 0, 2, 1, 4):
+        _book_at(client, sample_medspa.id, sample_service.id, base + timedelta(hours=hours))
+
+    items = _all_pages(
+        client, f"/medspas/{sample_medspa.id}/appointments", {"limit": 2, "sort": sort}
+    )
+    starts = [datetime.fromisoformat(a["start_time"]) for a in items]
+    assert len(starts) == 5
+    assert starts == sorted(starts, reverse=sort.startswith("-"))
+
+
+def test_list_appointments_start_time_ties_broken_by_id(
+    client: TestClient, multiple_appointments, sample_medspa
+):
+    """multiple_appointments share one start_time; the id tiebreaker keeps pages disjoint."""
+    items = _all_pages(
+        client, "/appointments", {"medspa_id": sample_medspa.id, "limit": 1, "sort": "start_time"}
+    )
+    ids = [a["id"] for a in items]
+    assert ids == sorted(a.id for a in multiple_appointments)
+
+
+def test_list_medspa_appointments_filtered_by_start_window(
+    client: TestClient, sample_medspa, sample_service
+):
+    day = (datetime.now(timezone.utc) + timedelta(days=2)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    inside = [
+        _book_at(client, sample_medspa.id, sample_service.id, day),
+        _book_at(client, sample_medspa.id, sample_service.id, day + timedelta(hours=12)),
+    ]
+    _book_at(client, sample_medspa.id, sample_service.id, day - timedelta(hours=1))
+    _book_at(client, sample_medspa.id, sample_service.id, day + timedelta(days=1))  # end exclusive
+
+    window = {"start_from": day.isoformat(), "start_to": (day + timedelta(days=1)).isoformat()}
+    items = _all_pages(
+        client,
+        f"/medspas/{sample_medspa.id}/appointments",
+        {**window, "limit": 1, "sort": "start_time"},
+    )
+    assert [a["id"] for a in items] == inside
+
+    r = client.get("/appointments", params={**window, "medspa_id": sample_medspa.id})
+    assert sorted(a["id"] for a in r.json()["items"]) == sorted(inside)
+
+
+@pytest.mark.parametrize("sort", ["id", "start_time", "-start_time"])
+@pytest.mark.parametrize("scope", ["all", "medspa"])
+def test_list_appointments_pg_json_matches_orm_path(
+    client: TestClient, sample_medspa, sample_services, monkeypatch, sort, scope
+):
+    base = (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0)
+    for hours in (3, 0, 2, 1, 4):
+        _book_at(
+            client, sample_medspa.id, sample_services[hours % 2].id, base + timedelta(hours=hours)
+        )
+    path = "/appointments" if scope == "all" else f"/medspas/{sample_medspa.id}/appointments"
+    params = {"sort": sort, "limit": 2, "start_from": base.isoformat()}
+
+    orm_pages: list[dict] = []
+    _all_pages(client, path, params, orm_pages)
+    monkeypatch.setattr(settings, "pg_json_lists", True)
+    pg_pages: list[dict] = []
+    _all_pages(client, path, params, pg_pages)
+
+    assert pg_pages == orm_pages
+    assert len(pg_pages) == 3
+
+
+def test_list_appointments_pg_json_errors_match_orm_path(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "pg_json_lists", True)
+    assert client.get(f"/medspas/{generate_id()}/appointments").status_code == 404
+    assert client.get("/appointments", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_list_appointments_empty_start_window_returns_400(client: TestClient):
+    moment = datetime(2030, 1, 1, tzinfo=timezone.utc).isoformat()
+    r = client.get("/appointments", params={"start_from": moment, "start_to": moment})
+    assert r.status_code == 400
+
+
+def test_list_appointments_cursor_for_other_sort_returns_400(
+    client: TestClient, multiple_appointments
+):
+    r = client.get("/appointments", params={"limit": 1})
+    cursor = r.json()["next_cursor"]
+    r = client.get("/appointments", params={"limit": 1, "cursor": cursor, "sort": "-start_time"})
+    assert r.status_code == 400
+
+
+def test_list_appointments_invalid_cursor_returns_400(client: TestClient):
+    r = client.get("/appointments", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Invalid cursor"
+
+
+def test_list_appointments_invalid_sort_returns_422(client: TestClient):
+    r = client.get("/appointments", params={"sort": "price"})
+    assert r.status_code == 422
+
+
 def test_create_appointment_same_service_overlapping_returns_409(
     client: TestClient, sample_medspa, sample_service
 ):
@@ -336,3 +494,152 @@ def test_list_appointments_returns_all_medspas(
     ids = [a["id"] for a in r.json()["items"]]
     assert sample_appointment.id in ids
     assert appt2_id in ids
+
+
+def test_create_appointments_batch_reports_each_item(
+    client: TestClient, sample_medspa, sample_services
+):
+    start = (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0)
+    s1, s2 = sample_services  # 15 and 30 minutes
+    r = client.post(
+        f"/medspas/{sample_medspa.id}/appointments:batch",
+        json={
+            "appointments": [
+                {"start_time": start.isoformat(), "service_ids": [s1.id]},
+                {"start_time": start.isoformat(), "service_ids": [s2.id]},
+                {"start_time": (start + timedelta(minutes=5)).isoformat(), "service_ids": [s1.id]},
+                {"start_time": start.isoformat(), "service_ids": [generate_id()]},
+                {"start_time": (start - timedelta(days=2)).isoformat(), "service_ids": [s2.id]},
+            ]
+        },
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert (data["created"], data["conflicts"], data["invalid"]) == (2, 1, 2)
+    assert [item["status"] for item in data["results"]] == [
+        "created",
+        "created",
+        "conflict",
+        "invalid",
+        "invalid",
+    ]
+    assert data["results"][4]["detail"] == "start_time cannot be in the past"
+    assert data["results"][0]["appointment"]["services"][0]["id"] == s1.id
+    assert data["results"][1]["appointment"]["total_duration"] == 30
+    assert data["results"][2]["appointment"] is None
+
+    listed = client.get(f"/medspas/{sample_medspa.id}/appointments").json()
+    assert len(listed["items"]) == 2
+
+
+def test_create_appointments_batch_conflicts_with_existing_booking(
+    client: TestClient, sample_medspa, sample_service
+):
+    start = (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0)
+    r = client.post(
+        f"/medspas/{sample_medspa.id}/appointments",
+        json={"start_time": start.isoformat(), "service_ids": [sample_service.id]},
+    )
+    assert r.status_code == 201
+    r = client.post(
+        f"/medspas/{sample_medspa.id}/appointments:batch",
+        json={
+            "appointments": [
+                {"start_time": start.isoformat(), "service_ids": [sample_service.id]},
+                {
+                    "start_time": (start + timedelta(minutes=30)).isoformat(),
+                    "service_ids": [sample_service.id],
+                },
+            ]
+        },
+    )
+    assert r.status_code == 200
+    assert [item["status"] for item in r.json()["results"]] == ["conflict", "created"]
+
+
+def test_create_appointments_batch_medspa_not_found(client: TestClient, sample_service):
+    start = (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0).isoformat()
+    r = client.post(
+        f"/medspas/{generate_id()}/appointments:batch",
+        json={"appointments": [{"start_time": start, "service_ids": [sample_service.id]}]},
+    )
+    assert r.status_code == 404
+
+
+def test_create_appointments_batch_empty_returns_422(client: TestClient, sample_medspa):
+    r = client.post(f"/medspas/{sample_medspa.id}/appointments:batch", json={"appointments": []})
+    assert r.status_code == 422
+
+
+def test_export_appointments_ndjson_streams_every_row_with_services(
+    client: TestClient, multiple_appointments, sample_services
+):
+    r = client.get("/appointments/export")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    assert 'filename="appointments.ndjson"' in r.headers["content-disposition"]
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert {rec["id"] for rec in records} == {a.id for a in multiple_appointments}
+    assert {s["id"] for s in records[0]["services"]} == {s.id for s in sample_services}
+
+
+def test_export_appointments_reads_one_chunk_per_run_sync(
+    client: TestClient, multiple_appointments, monkeypatch
+):
+    """Rows are encoded a chunk at a time as the body is sent, never read ahead in bulk."""
+    run_syncs = 0
+    run_sync = AsyncSession.run_sync
+
+    async def counting_run_sync(self, fn, *args, **kwargs):
+        nonlocal run_syncs
+        run_syncs += 1
+        return await run_sync(self, fn, *args, **kwargs)
+
+    pulled_during: list[int] = []
+
+    def one_row_chunks(rows):
+        for chunk in to_ndjson(rows, chunk_rows=1):
+            pulled_during.append(run_syncs)
+            yield chunk
+
+    monkeypatch.setattr(AsyncSession, "run_sync", counting_run_sync)
+    monkeypatch.setattr("app.api.routes.appointments.to_ndjson", one_row_chunks)
+    r = client.get("/appointments/export")
+
+    assert r.status_code == 200
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert {rec["id"] for rec in records} == {a.id for a in multiple_appointments}
+    assert len(pulled_during) == len(multiple_appointments)
+    assert len(set(pulled_during)) == len(pulled_during)
+
+
+def test_export_appointments_csv_with_filters(client: TestClient, sample_medspa, sample_service):
+    base = (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0)
+    inside = _book_at(client, sample_medspa.id, sample_service.id, base)
+    _book_at(client, sample_medspa.id, sample_service.id, base + timedelta(days=1))
+
+    r = client.get(
+        "/appointments/export",
+        params={
+            "format": "csv",
+            "medspa_id": sample_medspa.id,
+            "status": "scheduled",
+            "start_from": base.isoformat(),
+            "start_to": (base + timedelta(hours=1)).isoformat(),
+        },
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["id"] for row in rows] == [inside]
+    assert rows[0]["service_ids"] == sample_service.id
+
+
+def test_export_appointments_unknown_medspa_returns_404(client: TestClient):
+    r = client.get("/appointments/export", params={"medspa_id": generate_id()})
+    assert r.status_code == 404
+
+
+def test_export_appointments_invalid_format_returns_422(client: TestClient):
+    r = client.get("/appointments/export", params={"format": "xml"})
+    assert r.status_code == 422
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.utils.ulid import generate_id
+
+pytestmark = pytest.mark.integration
+
+
+def _day_start(days_ahead: int = 2) -> datetime:
+    return (datetime.now(timezone.utc) + timedelta(days=days_ahead)).replace(
+        hour=9, minute=0, second=0, microsecond=0
+    )
+
+
+def test_availability_empty_calendar(client: TestClient, sample_medspa, sample_service):
+    start = _day_start()
+    r = client.get(
+        f"/medspas/{sample_medspa.id}/availability",
+        params={
+            "service_ids": sample_service.id,
+            "from": start.isoformat(),
+            "to": (start + timedelta(hours=1)).isoformat(),
+            "granularity": "15m",
+        },
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["duration"] == 30
+    assert data["granularity"] == 15
+    assert len(data["slots"]) == 3  # 09:00, 09:15, 09:30
+
+
+def test_availability_excludes_booked_slot(client: TestClient, sample_medspa, sample_service):
+    start = _day_start()
+    r = client.post(
+        f"/medspas/{sample_medspa.id}/appointments",
+        json={
+            "start_time": (start + timedelta(minutes=30)).isoformat(),
+            "service_ids": [sample_service.id],
+        },
+    )
+    assert r.status_code == 201
+    r = client.get(
+        f"/medspas/{sample_medspa.id}/availability",
+        params={
+            "service_ids": sample_service.id,
+            "from": start.isoformat(),
+            "to": (start + timedelta(hours=2)).isoformat(),
+            "granularity": "30m",
+        },
+    )
+    assert r.status_code == 200
+    slots = [datetime.fromisoformat(s.replace("Z", "+00:00")) for s in r.json()["slots"]]
+    assert slots == [start, start + timedelta(minutes=60), start + timedelta(minutes=90)]
+    # Every returned slot is bookable
+    r = client.post(
+        f"/medspas/{sample_medspa.id}/appointments",
+        json={"start_time": slots[0].isoformat(), "service_ids": [sample_service.id]},
+    )
+    assert r.status_code == 201
+
+
+def test_availability_comma_separated_service_ids(
+    client: TestClient, sample_medspa, sample_services
+):
+    start = _day_start()
+    r = client.get(
+        f"/medspas/{sample_medspa.id}/availability",
+        params={
+            "service_ids": ",".join(s.id for s in sample_services),
+            "from": start.isoformat(),
+            "to": (start + timedelta(hours=1)).isoformat(),
+        },
+    )
+    assert r.status_code == 200
+    assert r.json()["duration"] == 45
+
+
+def test_availability_unknown_medspa_returns_404(client: TestClient, sample_service):
+    start = _day_start()
+    r = client.get(
+        f"/medspas/{generate_id()}/availability",
+        params={
+            "service_ids": sample_service.id,
+            "from": start.isoformat(),
+            "to": (start + timedelta(hours=1)).isoformat(),
+        },
+    )
+    assert r.status_code == 404
+
+
+def test_availability_invalid_granularity_returns_422(
+    client: TestClient, sample_medspa, sample_service
+):
+    start = _day_start()
+    r = client.get(
+        f"/medspas/{sample_medspa.id}/availability",
+        params={
+            "service_ids": sample_service.id,
+            "from": start.isoformat(),
+            "to": (start + timedelta(hours=1)).isoformat(),
+            "granularity": "15 minutes",
+        },
+    )
+    assert r.status_code == 422
@@ -0,0 +1,81 @@
+"""LISTEN/NOTIFY invalidation against the real database: commits evict, rollbacks do not."""
+
+import time
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.invalidation import InvalidationListener, notify_invalidation
+from app.models.read_models import MedspaRecord
+from app.services.medspa_service import medspa_cache
+
+pytestmark = pytest.mark.integration
+
+DELIVERY_TIMEOUT = 5.0
+NOW = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def _cache_stale(id: str) -> None:
+    medspa_cache.get_or_load(
+        id,
+        lambda key: MedspaRecord(key, "Stale", "1 Old St", "(512) 555-0000", "o@t.com", NOW, NOW),
+    )
+
+
+def _is_cached(id: str) -> bool:
+    # An evicted id reloads as None (not found), which is all these ids are.
+    return medspa_cache.get_or_load(id, lambda key: None) is not None
+
+
+def _notify(factory: sessionmaker, id: str, commit: bool = True) -> None:
+    with factory() as writer:
+        notify_invalidation(writer, "medspa", id)
+        if commit:
+            writer.commit()
+        else:
+            writer.rollback()
+
+
+def _wait_evicted(id: str) -> bool:
+    deadline = time.monotonic() + DELIVERY_TIMEOUT
+    while _is_cached(id):
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+@pytest.fixture
+def factory(db_session: Session):
+    engine = db_session.get_bind()
+    assert isinstance(engine, Engine)
+    listener = InvalidationListener(engine, heartbeat=0.2, max_backoff=0.5)
+    listener.start()
+    writers = sessionmaker(bind=engine)
+    # Ready once a committed notification round-trips (LISTEN is in place).
+    deadline = time.monotonic() + DELIVERY_TIMEOUT
+    while time.monotonic() < deadline:
+        _cache_stale("01READY")
+        _notify(writers, "01READY")
+        if _wait_evicted("01READY"):
+            break
+    yield writers
+    listener.stop()
+
+
+def test_committed_notify_evicts_in_listening_worker(factory):
+    _cache_stale("01MEDSPA")
+    _notify(factory, "01MEDSPA")
+    assert _wait_evicted("01MEDSPA")
+
+
+def test_rolled_back_notify_is_not_delivered(factory):
+    _cache_stale("01MEDSPA")
+    _cache_stale("01MARKER")
+    _notify(factory, "01MEDSPA", commit=False)
+    # Notifications arrive in commit order, so once the marker is evicted the other would be too
+    _notify(factory, "01MARKER")
+    assert _wait_evicted("01MARKER")
+    assert _is_cached("01MEDSPA")
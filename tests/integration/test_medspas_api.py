@@ -1,6 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from app.config import settings
 from app.utils.ulid import generate_id
 
 pytestmark = pytest.mark.integration
@@ -79,6 +80,24 @@ def test_list_medspas_pagination_ordered_by_id(client: TestClient, multiple_meds
     assert ids == sorted(ids)
 
 
+def test_list_medspas_pg_json_matches_orm_path(client: TestClient, multiple_medspas, monkeypatch):
+    orm_pages = [client.get("/medspas", params={"limit": 2}).json()]
+    while orm_pages[-1]["next_cursor"]:
+        params = {"limit": 2, "cursor": orm_pages[-1]["next_cursor"]}
+        orm_pages.append(client.get("/medspas", params=params).json())
+
+    monkeypatch.setattr(settings, "pg_json_lists", True)
+    r = client.get("/medspas", params={"limit": 2})
+    assert r.headers["content-type"] == "application/json"
+    pg_pages = [r.json()]
+    while pg_pages[-1]["next_cursor"]:
+        params = {"limit": 2, "cursor": pg_pages[-1]["next_cursor"]}
+        pg_pages.append(client.get("/medspas", params=params).json())
+
+    assert pg_pages == orm_pages
+    assert len(pg_pages) == 3
+
+
 def test_create_medspa_success(client: TestClient):
     r = client.post(
         "/medspas",
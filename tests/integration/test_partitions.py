@@ -0,0 +1,222 @@
+"""Monthly partitions from sql/schema.sql: routing, the default partition, and pruning.
+
+The rest of the suite builds tables with Base.metadata.create_all, which knows nothing of
+partitioning. These tests apply sql/schema.sql to a schema of their own instead, inside a
+transaction that is rolled back afterwards, and run the repository against it.
+"""
+
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.models.models import Appointment, Medspa, Service
+from app.repositories.appointment_repository import AppointmentRepository
+from app.utils.ulid import generate_id
+
+pytestmark = pytest.mark.integration
+
+SCHEMA_SQL = Path(__file__).resolve().parents[2] / "sql" / "schema.sql"
+JANUARY = datetime(2030, 1, 10, 9, 0, tzinfo=timezone.utc)
+MARCH = datetime(2030, 3, 10, 9, 0, tzinfo=timezone.utc)
+JANUARY_TABLES = {"appointments_p2030_01", "appointment_services_p2030_01"}
+
+
+@pytest.fixture
+def partitioned(db_session: Session) -> Iterator[Session]:
+    """A session on the tables sql/schema.sql creates; nothing it does outlives the test."""
+    with db_session.get_bind().engine.connect() as conn:
+        conn.begin()
+        # The raw cursor: the script's format() patterns must not be taken as bind markers
+        cursor = conn.connection.cursor()
+        cursor.execute("CREATE SCHEMA partition_test")
+        cursor.execute("SET LOCAL search_path = partition_test, public")
+        cursor.execute(SCHEMA_SQL.read_text())
+        session = Session(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            session.close()
+            conn.rollback()
+
+
+@pytest.fixture
+def service(partitioned: Session) -> Service:
+    medspa = Medspa(
+        id=generate_id(),
+        name="Partition MedSpa",
+        address="1 Partition St",
+        phone_number="(512) 555-0199",
+        email="partitions@test.com",
+    )
+    partitioned.add(medspa)
+    partitioned.flush()
+    service = Service(id=generate_id(), medspa_id=medspa.id, name="Facial", price=1000, duration=60)
+    partitioned.add(service)
+    partitioned.flush()
+    return service
+
+
+def _book(db: Session, service: Service, start: datetime) -> Appointment:
+    appointment = Appointment(
+        id=generate_id(),
+        medspa_id=service.medspa_id,
+        start_time=start,
+        status="scheduled",
+        total_price=service.price,
+        total_duration=service.duration,
+        end_time=start + timedelta(minutes=service.duration),
+    )
+    AppointmentRepository.create_many_with_services(db, [appointment], [[service.id]])
+    return appointment
+
+
+def _create_partitions(db: Session, from_time: datetime, through: datetime) -> int:
+    return db.execute(
+        text("SELECT create_appointment_partitions(:from_time, :through)"),
+        {"from_time": from_time, "through": through},
+    ).scalar_one()
+
+
+def _partition_of(db: Session, table: str, id_column: str, id: str) -> str:
+    return db.execute(
+        text(f"SELECT tableoid::regclass::text FROM {table} WHERE {id_column} = :id"),
+        {"id": id},
+    ).scalar_one()
+
+
+def _plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+def _scanned_tables(db: Session, call: Callable[[], object]) -> set[str]:
+    """Tables (partitions by name) that call's queries actually read, per EXPLAIN ANALYZE.
+
+    Partitions pruned at plan time are absent from the plan; those pruned at run time (e.g.
+    under a correlated subquery) are planned but never executed, so they are left out too.
+    """
+    captured: list[tuple[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    engine = db.get_bind().engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert captured, "repository call issued no SELECT"
+    tables = set()
+    for statement, parameters in captured:
+        [(plan_json,)] = (
+            db.connection()
+            .exec_driver_sql("EXPLAIN (ANALYZE, FORMAT JSON) " + statement, parameters)
+            .all()
+        )
+        tables.update(
+            node["Relation Name"]
+            for node in _plan_nodes(plan_json[0]["Plan"])
+            # ModifyTable names the parent table an INSERT targets, not a scan
+            if "Relation Name" in node
+            and node["Node Type"] != "ModifyTable"
+            and node.get("Actual Loops", 0) > 0
+        )
+    return tables
+
+
+def test_schema_creates_this_month_and_the_next_twelve(partitioned: Session):
+    now = datetime.now(timezone.utc)
+    assert (
+        partitioned.execute(
+            text("SELECT relkind FROM pg_class WHERE oid = 'appointments'::regclass")
+        ).scalar_one()
+        == "p"
+    )
+    assert _create_partitions(partitioned, now, now + timedelta(days=365)) == 0
+    assert _create_partitions(partitioned, now, now + timedelta(days=500)) >= 1
+
+
+def test_rows_move_out_of_default_when_their_month_is_created(
+    partitioned: Session, service: Service
+):
+    appointment = _book(partitioned, service, JANUARY)
+    assert _partition_of(partitioned, "appointments", "id", appointment.id) == (
+        "appointments_default"
+    )
+
+    assert _create_partitions(partitioned, JANUARY, JANUARY + timedelta(days=1)) == 1
+    assert _create_partitions(partitioned, JANUARY, JANUARY + timedelta(days=1)) == 0
+
+    assert _partition_of(partitioned, "appointments", "id", appointment.id) == (
+        "appointments_p2030_01"
+    )
+    assert _partition_of(partitioned, "appointment_services", "appointment_id", appointment.id) == (
+        "appointment_services_p2030_01"
+    )
+    [got] = AppointmentRepository.list(
+        partitioned, start_from=JANUARY, start_to=JANUARY + timedelta(hours=1)
+    )
+    assert got.id == appointment.id
+    assert [s.id for s in got.services] == [service.id]
+
+
+@pytest.fixture
+def booked(partitioned: Session, service: Service) -> Service:
+    """Bookings in January 2030 (own partitions), March 2030 (default) and this month."""
+    _create_partitions(partitioned, JANUARY, JANUARY + timedelta(days=1))
+    for start in (JANUARY, JANUARY + timedelta(days=1), MARCH, datetime.now(timezone.utc)):
+        _book(partitioned, service, start.replace(microsecond=0))
+    partitioned.execute(text("ANALYZE appointments"))
+    partitioned.execute(text("ANALYZE appointment_services"))
+    return service
+
+
+@pytest.mark.parametrize("method", ["list", "list_json", "iter_export_rows"])
+def test_windowed_reads_only_scan_that_month(partitioned: Session, booked: Service, method):
+    window = {"start_from": JANUARY, "start_to": JANUARY + timedelta(days=7)}
+    call = getattr(AppointmentRepository, method)
+
+    def read() -> None:
+        result = call(partitioned, **window)
+        if method == "iter_export_rows":
+            list(result)  # a generator: nothing is sent until it is consumed
+
+    tables = _scanned_tables(partitioned, read)
+
+    assert tables - {"services"} == JANUARY_TABLES
+
+
+@pytest.mark.parametrize(
+    "method",
+    ["find_scheduled_overlapping", "list_scheduled_slots", "list_scheduled_slots_by_service"],
+)
+def test_overlap_lookups_only_scan_the_slot_month(partitioned: Session, booked: Service, method):
+    call = getattr(AppointmentRepository, method)
+    start = JANUARY + timedelta(hours=2)
+
+    tables = _scanned_tables(
+        partitioned,
+        lambda: call(partitioned, booked.medspa_id, start, start + timedelta(hours=1), [booked.id]),
+    )
+
+    assert tables <= JANUARY_TABLES | {"services"}
+    assert "appointments_p2030_01" in tables
+
+
+def test_booking_conflict_check_only_scans_the_slot_month(partitioned: Session, booked: Service):
+    tables = _scanned_tables(
+        partitioned,
+        lambda: AppointmentRepository.insert_if_available(
+            partitioned, generate_id(), booked.medspa_id, JANUARY, [booked.id]
+        ),
+    )
+
+    assert tables - {"services", "medspas"} == JANUARY_TABLES
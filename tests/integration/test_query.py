@@ -1,9 +1,14 @@
+import json
+from datetime import datetime, timezone
+
 import pytest
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.exceptions import NotFoundError
 from app.models.models import Medspa
-from app.utils.query import get_by_id
+from app.schemas.medspas import MedspaResponse
+from app.utils.query import get_by_id, json_page
 from app.utils.ulid import generate_id
 
 pytestmark = pytest.mark.integration
@@ -23,3 +28,44 @@ def test_get_by_id_not_found_raises(db_session: Session):
 def test_get_by_id_custom_message(db_session: Session):
     with pytest.raises(NotFoundError, match="Medspa missing"):
         get_by_id(db_session, Medspa, generate_id(), not_found_message="Medspa missing")
+
+
+@pytest.mark.parametrize("microsecond", [0, 120])
+def test_json_page_renders_timestamps_like_response_models(db_session: Session, microsecond):
+    created = datetime(2030, 1, 1, 8, 30, 5, microsecond, tzinfo=timezone.utc)
+    medspa = Medspa(
+        id=generate_id(),
+        name="JSON MedSpa",
+        address="1 JSON St",
+        phone_number="(512) 555-0100",
+        email="json@test.com",
+        created_at=created,
+        updated_at=created,
+    )
+    db_session.add(medspa)
+    db_session.flush()
+    stmt = select(Medspa.id, Medspa.name, Medspa.created_at).where(Medspa.id == medspa.id)
+
+    page = json_page(db_session, stmt, ["id"], limit=20)
+
+    expected = MedspaResponse.from_medspa(medspa).model_dump(
+        mode="json", include={"id", "name", "created_at"}
+    )
+    assert json.loads(page.items) == [expected]
+    assert page.last is None
+
+
+def test_json_page_reports_last_key_only_when_more_rows(db_session: Session, multiple_medspas):
+    ids = sorted(m.id for m in multiple_medspas)
+    stmt = select(Medspa.id, Medspa.name)
+
+    first = json_page(db_session, stmt, ["id"], limit=2)
+    last = json_page(db_session, stmt.where(Medspa.id > ids[2]), ["id"], limit=2)
+    backwards = json_page(db_session, stmt, ["id"], limit=2, descending=True)
+
+    assert [m["id"] for m in json.loads(first.items)] == ids[:2]
+    assert first.last == {"id": ids[1]}
+    assert [m["id"] for m in json.loads(last.items)] == ids[3:]
+    assert last.last is None
+    assert [m["id"] for m in json.loads(backwards.items)] == ids[:-3:-1]
+    assert json.loads(json_page(db_session, stmt.where(Medspa.id > ids[-1]), ["id"], 2).items) == []
@@ -0,0 +1,86 @@
+"""N+1 checks: a route's SQL statement count must not grow with the rows it reads or writes.
+
+Counts come from the request summary logged by QueryStatsMiddleware. The client fixture also
+runs in strict mode, so any request over its route's statement budget fails its test.
+"""
+
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytestmark = pytest.mark.integration
+
+_DB_QUERIES = re.compile(r"db_queries=(\d+)")
+
+
+@pytest.fixture
+def queries(caplog):
+    """Statements run by the last request: queries(response) after each client call."""
+    caplog.set_level(logging.INFO, logger="app.main")
+
+    def last(response) -> int:
+        assert response.status_code < 400, response.text
+        lines = [r.getMessage() for r in caplog.records if "request_completed" in r.getMessage()]
+        match = _DB_QUERIES.search(lines[-1])
+        assert match is not None
+        return int(match.group(1))
+
+    return last
+
+
+def _start(days: int) -> str:
+    return (datetime.now(timezone.utc) + timedelta(days=days)).replace(microsecond=0).isoformat()
+
+
+def test_appointment_lists_do_not_grow_with_page_size(
+    client: TestClient, queries, sample_medspa, multiple_appointments
+):
+    for url in (f"/medspas/{sample_medspa.id}/appointments", "/appointments"):
+        client.get(url, params={"limit": 1})  # warm the medspa cache
+        one = queries(client.get(url, params={"limit": 1}))
+        four = queries(client.get(url, params={"limit": 4}))
+        assert one == four, url
+
+
+def test_create_appointment_does_not_grow_with_services(
+    client: TestClient, queries, sample_medspa, sample_services
+):
+    url = f"/medspas/{sample_medspa.id}/appointments"
+    one = queries(
+        client.post(url, json={"start_time": _start(1), "service_ids": [sample_services[0].id]})
+    )
+    both = queries(
+        client.post(
+            url, json={"start_time": _start(2), "service_ids": [s.id for s in sample_services]}
+        )
+    )
+    assert one == both
+
+
+def test_batch_does_not_grow_with_items(
+    client: TestClient, queries, sample_medspa, sample_services
+):
+    url = f"/medspas/{sample_medspa.id}/appointments:batch"
+    service_ids = [s.id for s in sample_services]
+
+    def batch(*days: int):
+        items = [{"start_time": _start(d), "service_ids": service_ids} for d in days]
+        return client.post(url, json={"appointments": items})
+
+    batch(1)  # warm the medspa and catalog caches
+    one = queries(batch(2))
+    three = queries(batch(3, 4, 5))
+    assert one == three
+
+
+def test_service_list_does_not_grow_with_page_size(
+    client: TestClient, queries, sample_medspa, sample_services
+):
+    url = f"/medspas/{sample_medspa.id}/services"
+    client.get(url, params={"limit": 1})
+    assert queries(client.get(url, params={"limit": 1})) == queries(
+        client.get(url, params={"limit": 2})
+    )
@@ -0,0 +1,237 @@
+"""Plan-regression suite: every repository read must be index-driven, with no sort step.
+
+Each case runs a repository call while capturing the SELECTs it sends, then EXPLAINs them with
+the same parameters. enable_seqscan and enable_sort are turned off for the check, which only
+makes those nodes prohibitively expensive: a Seq Scan or Sort still in the plan means no index
+can serve the query, independent of how much data is seeded.
+"""
+
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.models.models import Appointment, Medspa, Service
+from app.repositories.appointment_repository import AppointmentRepository
+from app.repositories.medspa_repository import MedspaRepository
+from app.repositories.service_repository import ServiceRepository
+from app.schemas.appointments import AppointmentSort
+from app.utils.ulid import generate_id
+
+pytestmark = pytest.mark.integration
+
+FORBIDDEN_NODES = {"Seq Scan", "Sort", "Incremental Sort"}
+BASE = datetime(2030, 1, 1, 8, 0, tzinfo=timezone.utc)
+STATUSES = ("scheduled", "completed", "canceled")
+
+
+@pytest.fixture
+def seeded(db_session: Session) -> dict[str, Any]:
+    """A few medspas with services and a few hundred appointments across statuses."""
+    medspas = [
+        Medspa(
+            id=generate_id(),
+            name=f"Plan MedSpa {i}",
+            address=f"{i} Plan St",
+            phone_number=f"(512) 555-{i:04d}",
+            email=f"plan{i}@test.com",
+        )
+        for i in range(3)
+    ]
+    db_session.add_all(medspas)
+    db_session.flush()
+    services = [
+        Service(id=generate_id(), medspa_id=m.id, name=f"S{j}", price=1000, duration=30)
+        for m in medspas
+        for j in range(5)
+    ]
+    db_session.add_all(services)
+    db_session.flush()
+    appointments, links = [], []
+    for i in range(300):
+        service = services[i % len(services)]
+        start = BASE + timedelta(minutes=30 * i)
+        appointments.append(
+            Appointment(
+                id=generate_id(),
+                medspa_id=service.medspa_id,
+                start_time=start,
+                status=STATUSES[i % len(STATUSES)],
+                total_price=service.price,
+                total_duration=service.duration,
+                end_time=start + timedelta(minutes=service.duration),
+            )
+        )
+        links.append([service.id])
+    AppointmentRepository.create_many_with_services(db_session, appointments, links)
+    db_session.commit()
+    for table in ("medspas", "services", "appointments", "appointment_services"):
+        db_session.execute(text(f"ANALYZE {table}"))
+    db_session.commit()
+    return {"medspas": medspas, "services": services, "appointments": appointments}
+
+
+def _plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+def _captured_selects(db: Session, call: Callable[[], object]) -> list[tuple[str, Any]]:
+    captured: list[tuple[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(bind, "before_cursor_execute", capture)
+    return captured
+
+
+def _assert_index_only_plans(db: Session, call: Callable[[], object]) -> None:
+    statements = _captured_selects(db, call)
+    assert statements, "repository call issued no SELECT"
+    conn = db.connection()
+    conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    conn.exec_driver_sql("SET LOCAL enable_sort = off")
+    for statement, parameters in statements:
+        [(plan_json,)] = conn.exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + statement, parameters
+        ).all()
+        nodes = [n["Node Type"] for n in _plan_nodes(plan_json[0]["Plan"])]
+        bad = FORBIDDEN_NODES.intersection(nodes)
+        assert not bad, f"{sorted(bad)} in plan {nodes} for:\n{statement}"
+    db.rollback()
+
+
+@pytest.mark.parametrize("sort", list(AppointmentSort), ids=lambda s: s.value)
+@pytest.mark.parametrize("filters", ["none", "medspa", "status", "medspa+status", "medspa+window"])
+@pytest.mark.parametrize("page", ["first", "after"])
+def test_appointment_list_plans(db_session: Session, seeded, sort, filters, page):
+    medspa_id = seeded["medspas"][0].id
+    kwargs: dict[str, Any] = {"sort": sort, "limit": 20}
+    if "medspa" in filters:
+        kwargs["medspa_id"] = medspa_id
+    if "status" in filters:
+        kwargs["status"] = "scheduled"
+    if "window" in filters:
+        kwargs["start_from"] = BASE + timedelta(days=1)
+        kwargs["start_to"] = BASE + timedelta(days=2)
+    if page == "after":
+        middle = seeded["appointments"][150]
+        kwargs["after"] = (
+            (middle.id,) if sort == AppointmentSort.ID else (middle.start_time, middle.id)
+        )
+    _assert_index_only_plans(db_session, lambda: AppointmentRepository.list(db_session, **kwargs))
+
+
+@pytest.mark.parametrize("sort", list(AppointmentSort), ids=lambda s: s.value)
+@pytest.mark.parametrize("filters", ["none", "medspa+status", "medspa+window"])
+def test_appointment_list_json_plans(db_session: Session, seeded, sort, filters):
+    kwargs: dict[str, Any] = {"sort": sort, "limit": 20}
+    if "medspa" in filters:
+        kwargs["medspa_id"] = seeded["medspas"][0].id
+    if "status" in filters:
+        kwargs["status"] = "scheduled"
+    if "window" in filters:
+        kwargs["start_from"] = BASE + timedelta(days=1)
+        kwargs["start_to"] = BASE + timedelta(days=2)
+    _assert_index_only_plans(
+        db_session, lambda: AppointmentRepository.list_json(db_session, **kwargs)
+    )
+
+
+@pytest.mark.parametrize("status", ["completed", "canceled"])
+def test_appointment_list_non_scheduled_status_by_start_time(db_session: Session, seeded, status):
+    medspa_id = seeded["medspas"][0].id
+    _assert_index_only_plans(
+        db_session,
+        lambda: AppointmentRepository.list(
+            db_session, medspa_id=medspa_id, status=status, sort=AppointmentSort.START_TIME
+        ),
+    )
+
+
+def test_appointment_get_by_id_plan(db_session: Session, seeded):
+    appointment_id = seeded["appointments"][0].id
+    _assert_index_only_plans(
+        db_session, lambda: AppointmentRepository.get_by_id(db_session, appointment_id)
+    )
+
+
+@pytest.mark.parametrize(
+    "method",
+    ["find_scheduled_overlapping", "list_scheduled_slots", "list_scheduled_slots_by_service"],
+)
+def test_appointment_overlap_plans(db_session: Session, seeded, method):
+    service_id, medspa_id = seeded["services"][0].id, seeded["services"][0].medspa_id
+    call = getattr(AppointmentRepository, method)
+    _assert_index_only_plans(
+        db_session,
+        lambda: call(
+            db_session, medspa_id, BASE + timedelta(days=1), BASE + timedelta(days=2), [service_id]
+        ),
+    )
+
+
+@pytest.mark.parametrize("cursor", [False, True])
+def test_medspa_list_plan(db_session: Session, seeded, cursor):
+    after = min(m.id for m in seeded["medspas"]) if cursor else None
+    _assert_index_only_plans(db_session, lambda: MedspaRepository.list(db_session, cursor=after))
+    _assert_index_only_plans(
+        db_session, lambda: MedspaRepository.list_json(db_session, cursor=after)
+    )
+
+
+@pytest.mark.parametrize("cursor", [False, True])
+def test_service_list_plan(db_session: Session, seeded, cursor):
+    medspa_id = seeded["medspas"][0].id
+    after = seeded["services"][0].id if cursor else None
+    _assert_index_only_plans(
+        db_session,
+        lambda: ServiceRepository.list_by_medspa_id(db_session, medspa_id, cursor=after),
+    )
+    _assert_index_only_plans(
+        db_session,
+        lambda: ServiceRepository.list_by_medspa_id_json(db_session, medspa_id, cursor=after),
+    )
+
+
+def test_service_find_by_ids_plan(db_session: Session, seeded):
+    ids = [s.id for s in seeded["services"][:3]]
+    _assert_index_only_plans(db_session, lambda: ServiceRepository.find_by_ids(db_session, ids))
+
+
+def test_service_catalog_plans(db_session: Session, seeded):
+    medspa_id = seeded["medspas"][0].id
+    ServiceRepository.bump_catalog_version(db_session, medspa_id)
+    db_session.commit()
+    _assert_index_only_plans(
+        db_session, lambda: ServiceRepository.catalog_version(db_session, medspa_id)
+    )
+    _assert_index_only_plans(
+        db_session, lambda: ServiceRepository.list_catalog(db_session, medspa_id)
+    )
+
+
+@pytest.mark.parametrize("filters", ["none", "medspa", "status", "medspa+window"])
+def test_appointment_export_plan(db_session: Session, seeded, filters):
+    kwargs: dict[str, Any] = {}
+    if "medspa" in filters:
+        kwargs["medspa_id"] = seeded["medspas"][0].id
+    if "status" in filters:
+        kwargs["status"] = "completed"
+    if "window" in filters:
+        kwargs["start_from"] = BASE + timedelta(days=1)
+        kwargs["start_to"] = BASE + timedelta(days=2)
+    _assert_index_only_plans(
+        db_session, lambda: list(AppointmentRepository.iter_export_rows(db_session, **kwargs))
+    )
@@ -0,0 +1,72 @@
+"""Replica routing against the real database, with a second engine on it standing in as replica."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.orm import Session
+
+from app.db.database import (
+    ReadConsistency,
+    RoutingSession,
+    parse_consistency_token,
+    read_consistency_ctx,
+)
+from app.schemas.appointments import AppointmentCreate
+from app.services.appointment_service import AppointmentService
+from app.services.medspa_service import MedspaService
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def replica(db_session: Session):
+    primary = db_session.get_bind()
+    assert isinstance(primary, Engine)
+    replica = create_engine(primary.url)
+    statements: list[str] = []
+    event.listen(replica, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    yield primary, replica, statements
+    replica.dispose()
+
+
+def test_write_issues_token_and_next_read_honours_it(replica, sample_medspa, sample_service):
+    primary, replica_engine, replica_statements = replica
+    writes = ReadConsistency()
+    token = read_consistency_ctx.set(writes)
+    try:
+        with RoutingSession(bind=primary, replica=replica_engine) as session:
+            created = AppointmentService.create_appointment(
+                session,
+                sample_medspa.id,
+                AppointmentCreate(
+                    start_time=datetime.now(timezone.utc) + timedelta(days=3),
+                    service_ids=[sample_service.id],
+                ),
+            )
+    finally:
+        read_consistency_ctx.reset(token)
+    assert parse_consistency_token(writes.written) is not None
+    # the write, its token query and the medspa lookup ran on the primary
+    assert not replica_statements
+    replica_statements.clear()
+
+    token = read_consistency_ctx.set(ReadConsistency(read_after=writes.written))
+    try:
+        with RoutingSession(bind=primary, replica=replica_engine) as session:
+            read = AppointmentService.get_appointment(session, created.id)
+    finally:
+        read_consistency_ctx.reset(token)
+    assert read.id == created.id
+    assert [s.id for s in read.services] == [sample_service.id]
+    # caught-up check, then the appointment and its services
+    assert len(replica_statements) == 3
+    assert "pg_last_wal_replay_lsn" in replica_statements[0]
+
+
+def test_medspa_cache_loads_from_primary(replica, sample_medspa):
+    """A miss read from a lagging replica would be cached and 404 clients holding a token."""
+    primary, replica_engine, replica_statements = replica
+    with RoutingSession(bind=primary, replica=replica_engine) as session:
+        assert MedspaService.get_medspa(session, sample_medspa.id).id == sample_medspa.id
+    assert not replica_statements
@@ -1,6 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from app.config import settings
 from app.utils.ulid import generate_id
 
 pytestmark = pytest.mark.integration
@@ -105,6 +106,22 @@ def test_list_services_pagination_ordered_by_id(client: TestClient, sample_medsp
     assert ids == sorted(ids)
 
 
+def test_list_services_pg_json_matches_orm_path(
+    client: TestClient, sample_medspa, sample_services, monkeypatch
+):
+    path = f"/medspas/{sample_medspa.id}/services"
+    orm_first = client.get(path, params={"limit": 1}).json()
+    orm_rest = client.get(path, params={"limit": 1, "cursor": orm_first["next_cursor"]}).json()
+
+    monkeypatch.setattr(settings, "pg_json_lists", True)
+    pg_first = client.get(path, params={"limit": 1}).json()
+    pg_rest = client.get(path, params={"limit": 1, "cursor": pg_first["next_cursor"]}).json()
+
+    assert (pg_first, pg_rest) == (orm_first, orm_rest)
+    assert pg_rest["next_cursor"] is None
+    assert client.get(f"/medspas/{generate_id()}/services").status_code == 404
+
+
 def test_patch_service_success(client: TestClient, sample_service):
     r = client.patch(
         f"/services/{sample_service.id}",
@@ -0,0 +1,57 @@
+"""Slow statement EXPLAIN against the real database: captured off-request, never writes."""
+
+import logging
+
+import pytest
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.exc import InternalError, ProgrammingError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.slow_queries import explainer, instrument_slow_queries
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def engine(db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "slow_query_ms", 10)
+    monkeypatch.setattr(settings, "slow_query_explain", True)
+    bind = db_session.get_bind()
+    assert isinstance(bind, Engine)
+    engine = create_engine(bind.url)
+    instrument_slow_queries(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_slow_select_plan_is_logged(engine, caplog):
+    caplog.set_level(logging.WARNING, logger="app.db.slow_queries")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": 0.05})
+    explainer.join()
+    plans = [r.getMessage() for r in caplog.records if r.getMessage().startswith("slow_query_plan")]
+    assert len(plans) == 1
+    assert "actual time=" in plans[0]
+
+
+def test_explain_runs_read_only(engine, db_session, sample_medspa):
+    statement = (
+        "WITH gone AS (DELETE FROM medspas WHERE id = %(id)s RETURNING id) SELECT * FROM gone"
+    )
+    with pytest.raises((InternalError, ProgrammingError)):
+        explainer.explain(engine.url, statement, {"id": sample_medspa.id})
+    assert (
+        db_session.execute(
+            text("SELECT count(*) FROM medspas WHERE id = :id"), {"id": sample_medspa.id}
+        ).scalar_one()
+        == 1
+    )
+
+
+def test_explain_asyncpg_statement_with_numbered_parameters(engine, sample_medspa):
+    url = engine.url.set(drivername="postgresql+asyncpg")
+    statement = "SELECT * FROM medspas WHERE id = $1 AND name <> $2"
+    assert "actual time=" in explainer.explain(url, statement, (sample_medspa.id, "x"))
+    # Deallocated: the same name can be prepared again on the pooled connection
+    assert "actual time=" in explainer.explain(url, statement, (sample_medspa.id, "y"))
@@ -0,0 +1,63 @@
+"""sqlcommenter tags reach Postgres as part of the statement text."""
+
+import asyncpg
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.query_stats import QueryStats, query_stats_ctx
+from app.db.sql_comments import tag_statements
+from app.logging_config import request_id_ctx
+from app.main import app
+from app.models.models import Medspa
+
+pytestmark = pytest.mark.integration
+
+
+class _Route:
+    path = "/medspas/{medspa_id}/appointments"
+
+
+def test_current_query_carries_the_comment(db_session: Session):
+    bind = db_session.get_bind()
+    assert isinstance(bind, Engine)
+    engine = create_engine(bind.url)
+    tag_statements(engine)
+    stats_token = query_stats_ctx.set(QueryStats(scope={"route": _Route()}))
+    id_token = request_id_ctx.set("01HZX3Q8Y6V1K2M3N4P5Q6R7S8")
+    try:
+        with engine.connect() as conn:
+            sent = conn.execute(text("SELECT current_query()")).scalar_one()
+    finally:
+        request_id_ctx.reset(id_token)
+        query_stats_ctx.reset(stats_token)
+        engine.dispose()
+    assert sent.endswith(
+        "/*request_id='01HZX3Q8Y6V1K2M3N4P5Q6R7S8',route='/medspas/{medspa_id}/appointments'*/"
+    )
+
+
+def test_repeated_requests_reuse_asyncpg_prepared_statements(
+    db_session: Session, sample_medspa: Medspa, monkeypatch
+):
+    """The app's own asyncpg engine and session: tags and deadlines keep statement texts fixed."""
+    monkeypatch.setattr(settings, "sql_comments", True)
+    prepared: list[str] = []
+    prepare = asyncpg.Connection.prepare
+
+    async def counting_prepare(self, query, *args, **kwargs):
+        prepared.append(query)
+        return await prepare(self, query, *args, **kwargs)
+
+    monkeypatch.setattr(asyncpg.Connection, "prepare", counting_prepare)
+    path = f"/medspas/{sample_medspa.id}/services"
+    # One TestClient, one event loop: its requests share the pool's connections
+    with TestClient(app) as client:
+        assert client.get(path).status_code == 200
+        first = len(prepared)
+        for _ in range(5):
+            assert client.get(path).status_code == 200
+    assert first > 0
+    assert prepared[first:] == []
@@ -0,0 +1,40 @@
+"""Request budgets against the real database: statement_timeout cancels, and does not leak."""
+
+import pytest
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.db.database import RoutingSession, is_statement_timeout, set_deadline
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def engine(db_session: Session):
+    bind = db_session.get_bind()
+    assert isinstance(bind, Engine)
+    # One pooled connection, so the second session reuses the first one's connection
+    engine = create_engine(bind.url, pool_size=1, max_overflow=0)
+    yield engine
+    engine.dispose()
+
+
+def test_statement_over_budget_is_cancelled(engine):
+    with RoutingSession(bind=engine) as session:
+        set_deadline(session, 200)
+        with pytest.raises(OperationalError) as caught:
+            session.execute(text("SELECT pg_sleep(2)"))
+    assert is_statement_timeout(caught.value)
+
+
+def test_budget_applies_per_transaction_and_does_not_leak(engine):
+    with RoutingSession(bind=engine) as session:
+        set_deadline(session, 3000)
+        first = session.execute(text("SHOW statement_timeout")).scalar_one()
+        session.commit()
+        second = session.execute(text("SHOW statement_timeout")).scalar_one()
+    assert first != "0" and second != "0"  # re-applied after the commit began a new transaction
+
+    with RoutingSession(bind=engine) as session:
+        assert session.execute(text("SHOW statement_timeout")).scalar_one() == "0"
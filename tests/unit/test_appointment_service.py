@@ -5,11 +5,21 @@ from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
+from sqlalchemy.exc import OperationalError
 
-from app.exceptions import BadRequestError, ConflictError, NotFoundError
+from app.exceptions import BadRequestError, ConflictError, NotFoundError, ServiceUnavailableError
 from app.models.models import Appointment, Medspa, Service
-from app.schemas.appointments import AppointmentCreate, AppointmentStatus
+from app.repositories.appointment_repository import BookingAttempt
+from app.schemas.appointments import (
+    AppointmentBatchItem,
+    AppointmentCreate,
+    AppointmentSort,
+    AppointmentStatus,
+    BatchItemStatus,
+)
+from app.schemas.pagination import decode_cursor, encode_cursor
 from app.services.appointment_service import AppointmentService
+from app.utils.query import JsonPage
 
 pytestmark = pytest.mark.unit
 
@@ -42,6 +52,16 @@ def _make_service(id=SERVICE_ID_1, medspa_id=MEDSPA_ID, price=5000, duration=30)
     return s
 
 
+class _FakePgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def _lock_timeout():
+    return OperationalError("SELECT pg_advisory_xact_lock(...)", {}, _FakePgError("55P03"))
+
+
 def _make_appointment(id=APPOINTMENT_ID, medspa_id=MEDSPA_ID, status="scheduled"):
     a = MagicMock(spec=Appointment)
     a.id = id
@@ -53,28 +73,45 @@ def _make_appointment(id=APPOINTMENT_ID, medspa_id=MEDSPA_ID, status="scheduled"
 # ---------------------------------------------------------------------------
 # create_appointment
 # ---------------------------------------------------------------------------
+def _attempt(services=(), conflict=False, medspa_found=True, appointment=None, duration=0):
+    return BookingAttempt(
+        medspa_found=medspa_found,
+        conflict=conflict,
+        services=list(services),
+        appointment=appointment,
+        duration=duration,
+    )
+
+
+def _future_start():
+    return (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0)
+
+
 @patch("app.services.appointment_service.transaction", _noop_transaction)
 @patch("app.services.appointment_service.generate_id", return_value=FAKE_ID)
 @patch("app.services.appointment_service.AppointmentRepository")
-@patch("app.services.appointment_service.ServiceRepository")
-@patch("app.services.appointment_service.MedspaService")
 class TestCreateAppointment:
-    def test_services_not_found_raises(
-        self, mock_medspa_svc, mock_service_repo, mock_appt_repo, _gen_id
-    ):
-        mock_medspa_svc.get_medspa.return_value = _make_medspa()
-        mock_service_repo.find_by_ids.return_value = []  # none found
+    def test_medspa_not_found_raises(self, mock_appt_repo, _gen_id):
+        mock_appt_repo.insert_if_available.return_value = _attempt(medspa_found=False)
 
         db = MagicMock()
-        start = (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0)
-        data = AppointmentCreate(start_time=start, service_ids=[SERVICE_ID_1, SERVICE_ID_2])
+        data = AppointmentCreate(start_time=_future_start(), service_ids=[SERVICE_ID_1])
+
+        with pytest.raises(NotFoundError, match="Medspa not found"):
+            AppointmentService.create_appointment(db, MEDSPA_ID, data)
+
+    def test_services_not_found_raises(self, mock_appt_repo, _gen_id):
+        mock_appt_repo.insert_if_available.return_value = _attempt(services=[])  # none found
+
+        db = MagicMock()
+        data = AppointmentCreate(
+            start_time=_future_start(), service_ids=[SERVICE_ID_1, SERVICE_ID_2]
+        )
 
         with pytest.raises(NotFoundError, match="Service\\(s\\) not found"):
             AppointmentService.create_appointment(db, MEDSPA_ID, data)
 
-    def test_start_time_in_past_raises(
-        self, mock_medspa_svc, mock_service_repo, mock_appt_repo, _gen_id
-    ):
+    def test_start_time_in_past_raises(self, mock_appt_repo, _gen_id):
         """Service enforces past-time check for callers that bypass the Pydantic schema."""
         db = MagicMock()
         start = (datetime.now(timezone.utc) - timedelta(hours=1)).replace(microsecond=0)
@@ -83,20 +120,16 @@ class TestCreateAppointment:
         with pytest.raises(BadRequestError, match="start_time cannot be in the past"):
             AppointmentService.create_appointment(db, MEDSPA_ID, data)
 
-        # Should fail before ever looking up the medspa
-        mock_medspa_svc.get_medspa.assert_not_called()
+        # Should fail before ever touching the database
+        mock_appt_repo.lock_services.assert_not_called()
+        mock_appt_repo.insert_if_available.assert_not_called()
 
-    def test_naive_start_time_treated_as_utc(
-        self, mock_medspa_svc, mock_service_repo, mock_appt_repo, _gen_id
-    ):
+    def test_naive_start_time_treated_as_utc(self, mock_appt_repo, _gen_id):
         """Naive datetime is coerced to UTC so the past-time check and create succeed."""
-        medspa = _make_medspa()
-        service = _make_service()
-        mock_medspa_svc.get_medspa.return_value = medspa
-        mock_service_repo.find_by_ids.return_value = [service]
-        mock_appt_repo.find_scheduled_overlapping.return_value = []
         created = _make_appointment(id=FAKE_ID)
-        mock_appt_repo.create_with_services.return_value = created
+        mock_appt_repo.insert_if_available.return_value = _attempt(
+            services=[_make_service()], appointment=created
+        )
 
         db = MagicMock()
         start_naive = (datetime.now(timezone.utc) + timedelta(days=1)).replace(tzinfo=None)
@@ -105,78 +138,303 @@ class TestCreateAppointment:
         result = AppointmentService.create_appointment(db, MEDSPA_ID, data)
         assert result.id == FAKE_ID
         assert result.medspa_id == MEDSPA_ID
+        start_arg = mock_appt_repo.insert_if_available.call_args[0][3]
+        assert start_arg.tzinfo is not None
 
-    def test_service_from_other_medspa_raises(
-        self, mock_medspa_svc, mock_service_repo, mock_appt_repo, _gen_id
-    ):
-        medspa = _make_medspa()
+    def test_service_from_other_medspa_raises(self, mock_appt_repo, _gen_id):
         own_service = _make_service(id=SERVICE_ID_1, medspa_id=MEDSPA_ID)
         other_service = _make_service(id=SERVICE_ID_2, medspa_id="other-medspa-id")
-        mock_medspa_svc.get_medspa.return_value = medspa
-        mock_service_repo.find_by_ids.return_value = [own_service, other_service]
+        mock_appt_repo.insert_if_available.return_value = _attempt(
+            services=[own_service, other_service]
+        )
 
         db = MagicMock()
-        start = (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0)
-        data = AppointmentCreate(start_time=start, service_ids=[SERVICE_ID_1, SERVICE_ID_2])
+        data = AppointmentCreate(
+            start_time=_future_start(), service_ids=[SERVICE_ID_1, SERVICE_ID_2]
+        )
 
         with pytest.raises(BadRequestError, match="All services must belong to the same medspa"):
             AppointmentService.create_appointment(db, MEDSPA_ID, data)
 
-    def test_succeeds_when_no_overlap(
-        self, mock_medspa_svc, mock_service_repo, mock_appt_repo, _gen_id
-    ):
-        medspa = _make_medspa()
-        service = _make_service()
-        mock_medspa_svc.get_medspa.return_value = medspa
-        mock_service_repo.find_by_ids.return_value = [service]
-        mock_appt_repo.find_scheduled_overlapping.return_value = []
+    def test_longer_than_a_day_raises(self, mock_appt_repo, _gen_id):
+        """The overlap lookups rely on no appointment lasting more than a day."""
+        mock_appt_repo.insert_if_available.return_value = _attempt(
+            services=[_make_service(duration=1441)], conflict=True, duration=1441
+        )
+
+        db = MagicMock()
+        data = AppointmentCreate(start_time=_future_start(), service_ids=[SERVICE_ID_1])
+
+        with pytest.raises(BadRequestError, match="cannot be longer than 1440 minutes"):
+            AppointmentService.create_appointment(db, MEDSPA_ID, data)
+
+    def test_succeeds_when_no_overlap(self, mock_appt_repo, _gen_id):
         created = _make_appointment(id=FAKE_ID, status="scheduled")
-        mock_appt_repo.create_with_services.return_value = created
+        mock_appt_repo.insert_if_available.return_value = _attempt(
+            services=[_make_service()], appointment=created
+        )
 
         db = MagicMock()
-        start = (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0)
+        start = _future_start()
         data = AppointmentCreate(start_time=start, service_ids=[SERVICE_ID_1])
 
         result = AppointmentService.create_appointment(db, MEDSPA_ID, data)
         assert result.id == FAKE_ID
         assert result.status == "scheduled"
-        mock_appt_repo.create_with_services.assert_called_once()
+        mock_appt_repo.insert_if_available.assert_called_once_with(
+            db, FAKE_ID, MEDSPA_ID, start, [SERVICE_ID_1]
+        )
 
-    def test_raises_conflict_when_overlapping(
-        self, mock_medspa_svc, mock_service_repo, mock_appt_repo, _gen_id
-    ):
-        medspa = _make_medspa()
-        service = _make_service()
-        mock_medspa_svc.get_medspa.return_value = medspa
-        mock_service_repo.find_by_ids.return_value = [service]
-        mock_appt_repo.find_scheduled_overlapping.return_value = [_make_appointment()]
+    def test_raises_conflict_when_overlapping(self, mock_appt_repo, _gen_id):
+        mock_appt_repo.insert_if_available.return_value = _attempt(
+            services=[_make_service()], conflict=True
+        )
 
         db = MagicMock()
-        start = (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0)
-        data = AppointmentCreate(start_time=start, service_ids=[SERVICE_ID_1])
+        data = AppointmentCreate(start_time=_future_start(), service_ids=[SERVICE_ID_1])
 
         with pytest.raises(ConflictError, match="already booked for this time slot"):
             AppointmentService.create_appointment(db, MEDSPA_ID, data)
 
-    def test_computes_total_price_and_duration(
-        self, mock_medspa_svc, mock_service_repo, mock_appt_repo, _gen_id
-    ):
-        """Verify the service aggregates price/duration from the selected services."""
-        medspa = _make_medspa()
+    def test_returns_appointment_built_by_write_path(self, mock_appt_repo, _gen_id):
+        """The returned appointment (totals, services) comes straight from the single write."""
         s1 = _make_service(id=SERVICE_ID_1, price=1000, duration=15)
         s2 = _make_service(id=SERVICE_ID_2, price=2000, duration=30)
-        mock_medspa_svc.get_medspa.return_value = medspa
-        mock_service_repo.find_by_ids.return_value = [s1, s2]
-        mock_appt_repo.find_scheduled_overlapping.return_value = []
-        mock_appt_repo.create_with_services.side_effect = lambda db, appt, sids: appt
+        created = _make_appointment(id=FAKE_ID)
+        created.total_price = 3000
+        created.total_duration = 45
+        created.services = [s1, s2]
+        mock_appt_repo.insert_if_available.return_value = _attempt(
+            services=[s1, s2], appointment=created
+        )
 
         db = MagicMock()
-        start = (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0)
-        data = AppointmentCreate(start_time=start, service_ids=[SERVICE_ID_1, SERVICE_ID_2])
+        data = AppointmentCreate(
+            start_time=_future_start(), service_ids=[SERVICE_ID_1, SERVICE_ID_2]
+        )
 
         result = AppointmentService.create_appointment(db, MEDSPA_ID, data)
+        assert result is created
         assert result.total_price == 3000
         assert result.total_duration == 45
+        db.refresh.assert_not_called()
+
+    def test_locks_services_before_write(self, mock_appt_repo, _gen_id):
+        """Advisory locks are taken inside the booking transaction, before the conflict check."""
+        mock_appt_repo.insert_if_available.return_value = _attempt(
+            services=[_make_service(id=SERVICE_ID_2), _make_service(id=SERVICE_ID_1)],
+            appointment=_make_appointment(id=FAKE_ID),
+        )
+
+        db = MagicMock()
+        data = AppointmentCreate(
+            start_time=_future_start(), service_ids=[SERVICE_ID_2, SERVICE_ID_1]
+        )
+
+        AppointmentService.create_appointment(db, MEDSPA_ID, data)
+        calls = [c[0] for c in mock_appt_repo.method_calls]
+        assert calls.index("lock_services") < calls.index("insert_if_available")
+        lock_args = mock_appt_repo.lock_services.call_args[0]
+        assert lock_args[1] == MEDSPA_ID
+        assert set(lock_args[2]) == {SERVICE_ID_1, SERVICE_ID_2}
+
+    @patch("app.services.appointment_service.pause")
+    def test_retries_on_lock_timeout(self, _sleep, mock_appt_repo, _gen_id):
+        mock_appt_repo.lock_services.side_effect = [_lock_timeout(), None]
+        mock_appt_repo.insert_if_available.return_value = _attempt(
+            services=[_make_service()], appointment=_make_appointment(id=FAKE_ID)
+        )
+
+        db = MagicMock()
+        data = AppointmentCreate(start_time=_future_start(), service_ids=[SERVICE_ID_1])
+
+        result = AppointmentService.create_appointment(db, MEDSPA_ID, data)
+        assert result.id == FAKE_ID
+        assert mock_appt_repo.lock_services.call_count == 2
+        mock_appt_repo.insert_if_available.assert_called_once()
+
+    @patch("app.services.appointment_service.pause")
+    def test_lock_timeout_exhausts_retries_raises_503(self, _sleep, mock_appt_repo, _gen_id):
+        mock_appt_repo.lock_services.side_effect = _lock_timeout()
+
+        db = MagicMock()
+        data = AppointmentCreate(start_time=_future_start(), service_ids=[SERVICE_ID_1])
+
+        with pytest.raises(ServiceUnavailableError):
+            AppointmentService.create_appointment(db, MEDSPA_ID, data)
+        mock_appt_repo.insert_if_available.assert_not_called()
+
+    def test_non_lock_operational_error_not_retried(self, mock_appt_repo, _gen_id):
+        mock_appt_repo.lock_services.side_effect = OperationalError(
+            "SELECT 1", {}, _FakePgError("08006")
+        )
+
+        db = MagicMock()
+        data = AppointmentCreate(start_time=_future_start(), service_ids=[SERVICE_ID_1])
+
+        with pytest.raises(OperationalError):
+            AppointmentService.create_appointment(db, MEDSPA_ID, data)
+        assert mock_appt_repo.lock_services.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# create_appointments_batch
+# ---------------------------------------------------------------------------
+@patch("app.services.appointment_service.transaction", _noop_transaction)
+@patch("app.services.appointment_service.OfferingsService")
+@patch("app.services.appointment_service.MedspaService")
+@patch("app.services.appointment_service.AppointmentRepository")
+class TestCreateAppointmentsBatch:
+    def _setup(self, mock_appt_repo, mock_medspa_svc, mock_offerings, services, booked=None):
+        mock_medspa_svc.get_medspa.return_value = _make_medspa()
+        mock_offerings.resolve_services.return_value = {s.id: s for s in services}
+        mock_appt_repo.list_scheduled_slots_by_service.return_value = booked or {}
+
+    def _written(self, mock_appt_repo):
+        return mock_appt_repo.create_many_with_services.call_args[0][1]
+
+    def test_all_items_created_with_one_write(
+        self, mock_appt_repo, mock_medspa_svc, mock_offerings
+    ):
+        self._setup(
+            mock_appt_repo,
+            mock_medspa_svc,
+            mock_offerings,
+            [_make_service(id=SERVICE_ID_1, duration=30), _make_service(id=SERVICE_ID_2)],
+        )
+        start = _future_start()
+        items = [
+            AppointmentCreate(start_time=start, service_ids=[SERVICE_ID_1]),
+            AppointmentCreate(start_time=start, service_ids=[SERVICE_ID_2]),
+            AppointmentCreate(start_time=start + timedelta(minutes=30), service_ids=[SERVICE_ID_1]),
+        ]
+
+        outcomes = AppointmentService.create_appointments_batch(MagicMock(), MEDSPA_ID, items)
+
+        assert [o.status for o in outcomes] == [BatchItemStatus.CREATED] * 3
+        assert [o.index for o in outcomes] == [0, 1, 2]
+        mock_offerings.resolve_services.assert_called_once()
+        mock_appt_repo.create_many_with_services.assert_called_once()
+        written = self._written(mock_appt_repo)
+        assert len(written) == 3
+        assert outcomes[0].appointment is not None
+        assert outcomes[0].appointment.end_time == start + timedelta(minutes=30)
+
+    def test_conflicts_with_existing_booking(self, mock_appt_repo, mock_medspa_svc, mock_offerings):
+        start = _future_start()
+        self._setup(
+            mock_appt_repo,
+            mock_medspa_svc,
+            mock_offerings,
+            [_make_service(id=SERVICE_ID_1, duration=30)],
+            booked={SERVICE_ID_1: [(start + timedelta(minutes=15), start + timedelta(minutes=45))]},
+        )
+        items = [
+            AppointmentCreate(start_time=start, service_ids=[SERVICE_ID_1]),
+            AppointmentCreate(start_time=start + timedelta(minutes=45), service_ids=[SERVICE_ID_1]),
+        ]
+
+        outcomes = AppointmentService.create_appointments_batch(MagicMock(), MEDSPA_ID, items)
+
+        assert [o.status for o in outcomes] == [BatchItemStatus.CONFLICT, BatchItemStatus.CREATED]
+        assert outcomes[0].appointment is None
+        assert len(self._written(mock_appt_repo)) == 1
+
+    def test_conflicts_within_batch_earliest_start_wins(
+        self, mock_appt_repo, mock_medspa_svc, mock_offerings
+    ):
+        """Items overlapping each other: the pass runs in start order, ties by request position."""
+        self._setup(
+            mock_appt_repo,
+            mock_medspa_svc,
+            mock_offerings,
+            [_make_service(id=SERVICE_ID_1, duration=30)],
+        )
+        start = _future_start()
+        items = [
+            AppointmentCreate(start_time=start + timedelta(minutes=15), service_ids=[SERVICE_ID_1]),
+            AppointmentCreate(start_time=start, service_ids=[SERVICE_ID_1]),
+            AppointmentCreate(start_time=start, service_ids=[SERVICE_ID_1]),
+        ]
+
+        outcomes = AppointmentService.create_appointments_batch(MagicMock(), MEDSPA_ID, items)
+
+        assert [o.status for o in outcomes] == [
+            BatchItemStatus.CONFLICT,
+            BatchItemStatus.CREATED,
+            BatchItemStatus.CONFLICT,
+        ]
+
+    def test_invalid_items_reported_without_failing_batch(
+        self, mock_appt_repo, mock_medspa_svc, mock_offerings
+    ):
+        self._setup(
+            mock_appt_repo,
+            mock_medspa_svc,
+            mock_offerings,
+            [
+                _make_service(id=SERVICE_ID_1),
+                _make_service(id=SERVICE_ID_2, medspa_id="other-medspa-id"),
+            ],
+        )
+        past = (datetime.now(timezone.utc) - timedelta(hours=1)).replace(microsecond=0)
+        items = [
+            AppointmentBatchItem(start_time=past, service_ids=[SERVICE_ID_1]),
+            AppointmentCreate(start_time=_future_start(), service_ids=["missing"]),
+            AppointmentCreate(start_time=_future_start(), service_ids=[SERVICE_ID_2]),
+            AppointmentCreate(start_time=_future_start(), service_ids=[SERVICE_ID_1]),
+        ]
+
+        outcomes = AppointmentService.create_appointments_batch(MagicMock(), MEDSPA_ID, items)
+
+        assert [o.status for o in outcomes] == [BatchItemStatus.INVALID] * 3 + [
+            BatchItemStatus.CREATED
+        ]
+        assert outcomes[0].detail == "start_time cannot be in the past"
+        assert outcomes[1].detail is not None and "not found" in outcomes[1].detail
+        assert outcomes[2].detail == "All services must belong to the same medspa"
+        assert mock_appt_repo.lock_services.call_args[0][2] == [SERVICE_ID_1]
+
+    def test_item_longer_than_a_day_invalid(self, mock_appt_repo, mock_medspa_svc, mock_offerings):
+        self._setup(
+            mock_appt_repo,
+            mock_medspa_svc,
+            mock_offerings,
+            [
+                _make_service(id=SERVICE_ID_1, duration=1000),
+                _make_service(id=SERVICE_ID_2, duration=500),
+            ],
+        )
+        items = [
+            AppointmentCreate(start_time=_future_start(), service_ids=[SERVICE_ID_1, SERVICE_ID_2]),
+            AppointmentCreate(start_time=_future_start(), service_ids=[SERVICE_ID_1]),
+        ]
+
+        outcomes = AppointmentService.create_appointments_batch(MagicMock(), MEDSPA_ID, items)
+
+        assert outcomes[0].status == BatchItemStatus.INVALID
+        assert outcomes[0].detail == "Appointment cannot be longer than 1440 minutes"
+        assert outcomes[1].status == BatchItemStatus.CREATED
+
+    def test_all_invalid_skips_transaction(self, mock_appt_repo, mock_medspa_svc, mock_offerings):
+        self._setup(mock_appt_repo, mock_medspa_svc, mock_offerings, [])
+        items = [AppointmentCreate(start_time=_future_start(), service_ids=[SERVICE_ID_1])]
+
+        outcomes = AppointmentService.create_appointments_batch(MagicMock(), MEDSPA_ID, items)
+
+        assert outcomes[0].status == BatchItemStatus.INVALID
+        mock_appt_repo.lock_services.assert_not_called()
+        mock_appt_repo.create_many_with_services.assert_not_called()
+
+    def test_medspa_not_found_fails_whole_batch(
+        self, mock_appt_repo, mock_medspa_svc, mock_offerings
+    ):
+        mock_medspa_svc.get_medspa.side_effect = NotFoundError("Medspa not found")
+        items = [AppointmentCreate(start_time=_future_start(), service_ids=[SERVICE_ID_1])]
+
+        with pytest.raises(NotFoundError, match="Medspa not found"):
+            AppointmentService.create_appointments_batch(MagicMock(), MEDSPA_ID, items)
+        mock_appt_repo.create_many_with_services.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
@@ -197,7 +455,14 @@ class TestListAppointments:
         assert len(items) == 1
         assert items[0].medspa_id == MEDSPA_ID
         mock_appt_repo.list.assert_called_once_with(
-            db, medspa_id=medspa.id, status=None, cursor=None, limit=20
+            db,
+            medspa_id=medspa.id,
+            status=None,
+            after=None,
+            limit=20,
+            sort=AppointmentSort.ID,
+            start_from=None,
+            start_to=None,
         )
 
     def test_filter_by_status(self, mock_appt_repo):
@@ -211,7 +476,14 @@ class TestListAppointments:
 
         assert len(items) == 1
         mock_appt_repo.list.assert_called_once_with(
-            db, medspa_id=None, status=AppointmentStatus.SCHEDULED, cursor=None, limit=20
+            db,
+            medspa_id=None,
+            status=AppointmentStatus.SCHEDULED,
+            after=None,
+            limit=20,
+            sort=AppointmentSort.ID,
+            start_from=None,
+            start_to=None,
         )
 
     def test_next_cursor_set_when_more_results(self, mock_appt_repo):
@@ -223,7 +495,61 @@ class TestListAppointments:
         db = MagicMock()
         items, cursor = AppointmentService.list_appointments(db, limit=2)
         assert len(items) == 2
-        assert cursor == "01B"
+        assert cursor is not None
+        assert decode_cursor(cursor) == ["id", "01B"]
+
+        AppointmentService.list_appointments(db, cursor=cursor, limit=2)
+        assert mock_appt_repo.list.call_args.kwargs["after"] == ("01B",)
+
+    def test_start_time_cursor_round_trips_keyset(self, mock_appt_repo):
+        start = datetime(2030, 1, 1, 9, 0, tzinfo=timezone.utc)
+        a1 = _make_appointment(id="01A")
+        a1.start_time = start
+        mock_appt_repo.list.return_value = [a1, _make_appointment(id="01B")]
+
+        db = MagicMock()
+        _, cursor = AppointmentService.list_appointments(
+            db, limit=1, sort=AppointmentSort.START_TIME_DESC
+        )
+        assert cursor is not None
+        AppointmentService.list_appointments(
+            db, cursor=cursor, limit=1, sort=AppointmentSort.START_TIME_DESC
+        )
+        kwargs = mock_appt_repo.list.call_args.kwargs
+        assert kwargs["after"] == (start, "01A")
+        assert kwargs["sort"] == AppointmentSort.START_TIME_DESC
+
+    def test_cursor_from_other_sort_raises(self, mock_appt_repo):
+        cursor = encode_cursor("id", "01A")
+        with pytest.raises(BadRequestError, match="does not match the requested sort"):
+            AppointmentService.list_appointments(
+                MagicMock(), cursor=cursor, sort=AppointmentSort.START_TIME
+            )
+        mock_appt_repo.list.assert_not_called()
+
+    def test_malformed_cursor_raises(self, mock_appt_repo):
+        cursor = encode_cursor("start_time", "not-a-date", "01A")
+        with pytest.raises(BadRequestError, match="Invalid cursor"):
+            AppointmentService.list_appointments(
+                MagicMock(), cursor=cursor, sort=AppointmentSort.START_TIME
+            )
+
+    def test_time_window_passed_to_repository_as_utc(self, mock_appt_repo):
+        mock_appt_repo.list.return_value = []
+        start_from = datetime(2030, 1, 1)
+        start_to = datetime(2030, 1, 2, tzinfo=timezone.utc)
+
+        AppointmentService.list_appointments(MagicMock(), start_from=start_from, start_to=start_to)
+
+        kwargs = mock_appt_repo.list.call_args.kwargs
+        assert kwargs["start_from"] == start_from.replace(tzinfo=timezone.utc)
+        assert kwargs["start_to"] == start_to
+
+    def test_empty_time_window_raises(self, mock_appt_repo):
+        moment = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        with pytest.raises(BadRequestError, match="start_to must be after start_from"):
+            AppointmentService.list_appointments(MagicMock(), start_from=moment, start_to=moment)
+        mock_appt_repo.list.assert_not_called()
 
     def test_next_cursor_none_when_no_more(self, mock_appt_repo):
         mock_appt_repo.list.return_value = [_make_appointment()]
@@ -234,6 +560,101 @@ class TestListAppointments:
         assert cursor is None
 
 
+# ---------------------------------------------------------------------------
+# list_appointments_json
+# ---------------------------------------------------------------------------
+@patch("app.services.appointment_service.AppointmentRepository")
+class TestListAppointmentsJson:
+    def test_items_passed_through_and_cursor_from_last_key(self, mock_appt_repo):
+        start = datetime(2030, 1, 1, 9, 0, tzinfo=timezone.utc)
+        mock_appt_repo.list_json.return_value = JsonPage(
+            items='[{"id" : "01A"}]', last={"start_time": start, "id": "01A"}
+        )
+
+        db = MagicMock()
+        items, cursor = AppointmentService.list_appointments_json(
+            db, limit=1, sort=AppointmentSort.START_TIME
+        )
+
+        assert items == '[{"id" : "01A"}]'
+        assert cursor is not None
+        assert decode_cursor(cursor) == ["start_time", start.isoformat(), "01A"]
+        AppointmentService.list_appointments_json(
+            db, cursor=cursor, limit=1, sort=AppointmentSort.START_TIME
+        )
+        assert mock_appt_repo.list_json.call_args.kwargs["after"] == (start, "01A")
+
+    def test_no_cursor_on_last_page(self, mock_appt_repo):
+        mock_appt_repo.list_json.return_value = JsonPage(items="[]", last=None)
+
+        items, cursor = AppointmentService.list_appointments_json(MagicMock(), limit=20)
+
+        assert items == "[]"
+        assert cursor is None
+
+    @patch("app.services.appointment_service.MedspaService")
+    def test_same_filters_as_list_appointments(self, mock_medspa_svc, mock_appt_repo):
+        mock_medspa_svc.get_medspa.return_value = _make_medspa()
+        mock_appt_repo.list_json.return_value = JsonPage(items="[]", last=None)
+        start_from = datetime(2030, 1, 1)
+
+        db = MagicMock()
+        AppointmentService.list_appointments_json(
+            db, medspa_id=MEDSPA_ID, status=AppointmentStatus.SCHEDULED, start_from=start_from
+        )
+
+        mock_appt_repo.list_json.assert_called_once_with(
+            db,
+            limit=20,
+            sort=AppointmentSort.ID,
+            medspa_id=MEDSPA_ID,
+            status=AppointmentStatus.SCHEDULED,
+            after=None,
+            start_from=start_from.replace(tzinfo=timezone.utc),
+            start_to=None,
+        )
+
+
+# ---------------------------------------------------------------------------
+# export_appointments
+# ---------------------------------------------------------------------------
+@patch("app.services.appointment_service.AppointmentRepository")
+class TestExportAppointments:
+    @patch("app.services.appointment_service.MedspaService")
+    def test_validates_filters_and_returns_repository_stream(self, mock_medspa_svc, mock_appt_repo):
+        mock_medspa_svc.get_medspa.return_value = _make_medspa()
+        stream = iter([])
+        mock_appt_repo.iter_export_rows.return_value = stream
+        start_from = datetime(2030, 1, 1)
+
+        db = MagicMock()
+        result = AppointmentService.export_appointments(
+            db, medspa_id=MEDSPA_ID, status=AppointmentStatus.COMPLETED, start_from=start_from
+        )
+
+        assert result is stream
+        mock_appt_repo.iter_export_rows.assert_called_once_with(
+            db,
+            medspa_id=MEDSPA_ID,
+            status=AppointmentStatus.COMPLETED,
+            start_from=start_from.replace(tzinfo=timezone.utc),
+            start_to=None,
+        )
+
+    @patch("app.services.appointment_service.MedspaService")
+    def test_unknown_medspa_raises_before_streaming(self, mock_medspa_svc, mock_appt_repo):
+        mock_medspa_svc.get_medspa.side_effect = NotFoundError("Medspa not found")
+        with pytest.raises(NotFoundError):
+            AppointmentService.export_appointments(MagicMock(), medspa_id=MEDSPA_ID)
+        mock_appt_repo.iter_export_rows.assert_not_called()
+
+    def test_empty_window_raises_before_streaming(self, mock_appt_repo):
+        moment = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        with pytest.raises(BadRequestError, match="start_to must be after start_from"):
+            AppointmentService.export_appointments(MagicMock(), start_from=moment, start_to=moment)
+        mock_appt_repo.iter_export_rows.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # update_status
 # ---------------------------------------------------------------------------
@@ -242,7 +663,7 @@ class TestListAppointments:
 class TestUpdateStatus:
     def test_scheduled_to_completed(self, mock_appt_repo):
         appt = _make_appointment(status="scheduled")
-        mock_appt_repo.get_by_id.return_value = appt
+        mock_appt_repo.load.return_value = appt
         mock_appt_repo.update.return_value = appt
 
         db = MagicMock()
@@ -252,7 +673,7 @@ class TestUpdateStatus:
 
     def test_scheduled_to_canceled(self, mock_appt_repo):
         appt = _make_appointment(status="scheduled")
-        mock_appt_repo.get_by_id.return_value = appt
+        mock_appt_repo.load.return_value = appt
         mock_appt_repo.update.return_value = appt
 
         db = MagicMock()
@@ -262,7 +683,7 @@ class TestUpdateStatus:
 
     def test_same_status_returns_without_persisting(self, mock_appt_repo):
         appt = _make_appointment(status="scheduled")
-        mock_appt_repo.get_by_id.return_value = appt
+        mock_appt_repo.load.return_value = appt
 
         db = MagicMock()
         result = AppointmentService.update_status(db, APPOINTMENT_ID, AppointmentStatus.SCHEDULED)
@@ -271,7 +692,7 @@ class TestUpdateStatus:
 
     def test_completed_to_scheduled_raises(self, mock_appt_repo):
         appt = _make_appointment(status="completed")
-        mock_appt_repo.get_by_id.return_value = appt
+        mock_appt_repo.load.return_value = appt
 
         db = MagicMock()
         with pytest.raises(BadRequestError, match="Invalid status transition"):
@@ -279,7 +700,7 @@ class TestUpdateStatus:
 
     def test_canceled_to_completed_raises(self, mock_appt_repo):
         appt = _make_appointment(status="canceled")
-        mock_appt_repo.get_by_id.return_value = appt
+        mock_appt_repo.load.return_value = appt
 
         db = MagicMock()
         with pytest.raises(BadRequestError, match="Invalid status transition"):
@@ -287,7 +708,7 @@ class TestUpdateStatus:
 
     def test_completed_to_canceled_raises(self, mock_appt_repo):
         appt = _make_appointment(status="completed")
-        mock_appt_repo.get_by_id.return_value = appt
+        mock_appt_repo.load.return_value = appt
 
         db = MagicMock()
         with pytest.raises(BadRequestError, match="Invalid status transition"):
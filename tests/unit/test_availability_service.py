@@ -0,0 +1,139 @@
+"""Unit tests for AvailabilityService — all repository and external dependencies are mocked."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.exceptions import BadRequestError, NotFoundError
+from app.models.models import Medspa, Service
+from app.services.availability_service import AvailabilityService
+
+pytestmark = pytest.mark.unit
+
+MEDSPA_ID = "01MYYYYYYYYYYYYYYYYYYYYYYYY"
+SERVICE_ID_1 = "01SAAAAAAAAAAAAAAAAAAAAAAAA"
+SERVICE_ID_2 = "01SBBBBBBBBBBBBBBBBBBBBBBB"
+
+DAY = datetime(2099, 1, 5, 9, 0, tzinfo=timezone.utc)
+
+
+def _make_medspa(id=MEDSPA_ID):
+    m = MagicMock(spec=Medspa)
+    m.id = id
+    return m
+
+
+def _make_service(id=SERVICE_ID_1, medspa_id=MEDSPA_ID, duration=30):
+    s = MagicMock(spec=Service)
+    s.id = id
+    s.medspa_id = medspa_id
+    s.duration = duration
+    return s
+
+
+def _by_id(services):
+    return {s.id: s for s in services}
+
+
+@patch("app.services.availability_service.AppointmentRepository")
+@patch("app.services.availability_service.OfferingsService")
+@patch("app.services.availability_service.MedspaService")
+class TestFindOpenSlots:
+    def test_returns_open_starts_around_bookings(
+        self, mock_medspa_svc, mock_offerings, mock_appt_repo
+    ):
+        mock_medspa_svc.get_medspa.return_value = _make_medspa()
+        mock_offerings.resolve_services.return_value = _by_id([_make_service(duration=30)])
+        mock_appt_repo.list_scheduled_slots.return_value = [
+            (DAY + timedelta(minutes=30), DAY + timedelta(minutes=60))
+        ]
+
+        db = MagicMock()
+        result = AvailabilityService.find_open_slots(
+            db, MEDSPA_ID, [SERVICE_ID_1], DAY, DAY + timedelta(hours=2), 30
+        )
+        assert result.duration == 30
+        assert result.granularity == 30
+        assert result.slots == [DAY, DAY + timedelta(minutes=60), DAY + timedelta(minutes=90)]
+        mock_appt_repo.list_scheduled_slots.assert_called_once_with(
+            db, MEDSPA_ID, DAY, DAY + timedelta(hours=2), [SERVICE_ID_1]
+        )
+
+    def test_duration_is_sum_of_services(self, mock_medspa_svc, mock_offerings, mock_appt_repo):
+        mock_medspa_svc.get_medspa.return_value = _make_medspa()
+        mock_offerings.resolve_services.return_value = _by_id(
+            [
+                _make_service(id=SERVICE_ID_1, duration=15),
+                _make_service(id=SERVICE_ID_2, duration=30),
+            ]
+        )
+        mock_appt_repo.list_scheduled_slots.return_value = []
+
+        result = AvailabilityService.find_open_slots(
+            MagicMock(), MEDSPA_ID, [SERVICE_ID_1, SERVICE_ID_2], DAY, DAY + timedelta(hours=1), 15
+        )
+        assert result.duration == 45
+        assert result.slots == [DAY, DAY + timedelta(minutes=15)]
+
+    def test_window_end_before_start_raises(self, mock_medspa_svc, mock_offerings, mock_appt_repo):
+        with pytest.raises(BadRequestError, match="after"):
+            AvailabilityService.find_open_slots(
+                MagicMock(), MEDSPA_ID, [SERVICE_ID_1], DAY, DAY - timedelta(hours=1), 15
+            )
+        mock_medspa_svc.get_medspa.assert_not_called()
+
+    def test_window_too_wide_raises(self, mock_medspa_svc, mock_offerings, mock_appt_repo):
+        with pytest.raises(BadRequestError, match="cannot exceed"):
+            AvailabilityService.find_open_slots(
+                MagicMock(), MEDSPA_ID, [SERVICE_ID_1], DAY, DAY + timedelta(days=90), 15
+            )
+
+    def test_granularity_out_of_range_raises(self, mock_medspa_svc, mock_offerings, mock_appt_repo):
+        with pytest.raises(BadRequestError, match="granularity"):
+            AvailabilityService.find_open_slots(
+                MagicMock(), MEDSPA_ID, [SERVICE_ID_1], DAY, DAY + timedelta(hours=1), 1
+            )
+
+    def test_unknown_service_raises(self, mock_medspa_svc, mock_offerings, mock_appt_repo):
+        mock_medspa_svc.get_medspa.return_value = _make_medspa()
+        mock_offerings.resolve_services.return_value = _by_id([])
+
+        with pytest.raises(NotFoundError, match="Service\\(s\\) not found"):
+            AvailabilityService.find_open_slots(
+                MagicMock(), MEDSPA_ID, [SERVICE_ID_1], DAY, DAY + timedelta(hours=1), 15
+            )
+
+    def test_service_from_other_medspa_raises(
+        self, mock_medspa_svc, mock_offerings, mock_appt_repo
+    ):
+        mock_medspa_svc.get_medspa.return_value = _make_medspa()
+        mock_offerings.resolve_services.return_value = _by_id([_make_service(medspa_id="other")])
+
+        with pytest.raises(BadRequestError, match="same medspa"):
+            AvailabilityService.find_open_slots(
+                MagicMock(), MEDSPA_ID, [SERVICE_ID_1], DAY, DAY + timedelta(hours=1), 15
+            )
+        mock_appt_repo.list_scheduled_slots.assert_not_called()
+
+    def test_services_longer_than_a_booking_allows_raise(
+        self, mock_medspa_svc, mock_offerings, mock_appt_repo
+    ):
+        mock_medspa_svc.get_medspa.return_value = _make_medspa()
+        mock_offerings.resolve_services.return_value = _by_id(
+            [
+                _make_service(id=SERVICE_ID_1, duration=720),
+                _make_service(id=SERVICE_ID_2, duration=721),
+            ]
+        )
+
+        with pytest.raises(BadRequestError, match="cannot be longer than 1440 minutes"):
+            AvailabilityService.find_open_slots(
+                MagicMock(),
+                MEDSPA_ID,
+                [SERVICE_ID_1, SERVICE_ID_2],
+                DAY,
+                DAY + timedelta(days=2),
+                15,
+            )
+        mock_appt_repo.list_scheduled_slots.assert_not_called()
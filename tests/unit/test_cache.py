@@ -0,0 +1,158 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.utils.cache import TTLCache
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(
+    clock, max_size=10, ttl=60.0, negative_ttl=5.0, negative_max_size=10
+) -> TTLCache[str, str]:
+    return TTLCache(
+        max_size=max_size,
+        ttl=ttl,
+        negative_ttl=negative_ttl,
+        negative_max_size=negative_max_size,
+        clock=clock,
+    )
+
+
+def test_hit_after_first_load():
+    cache = _cache(FakeClock())
+    load = MagicMock(return_value="v")
+
+    assert cache.get_or_load("k", load) == "v"
+    assert cache.get_or_load("k", load) == "v"
+
+    load.assert_called_once_with("k")
+    assert cache.stats() == {
+        "hits": 1,
+        "negative_hits": 0,
+        "misses": 1,
+        "evictions": 0,
+        "negative_evictions": 0,
+        "size": 1,
+        "negative_size": 0,
+    }
+
+
+def test_entry_expires_after_ttl():
+    clock = FakeClock()
+    cache = _cache(clock, ttl=60.0)
+    load = MagicMock(side_effect=["old", "new"])
+
+    cache.get_or_load("k", load)
+    clock.now = 59.9
+    assert cache.get_or_load("k", load) == "old"
+    clock.now = 60.0
+    assert cache.get_or_load("k", load) == "new"
+
+
+def test_not_found_cached_for_negative_ttl():
+    clock = FakeClock()
+    cache = _cache(clock, negative_ttl=5.0)
+    load = MagicMock(return_value=None)
+
+    assert cache.get_or_load("missing", load) is None
+    assert cache.get_or_load("missing", load) is None
+    assert load.call_count == 1
+    assert cache.stats()["negative_hits"] == 1
+    clock.now = 5.0
+    cache.get_or_load("missing", load)
+    assert load.call_count == 2
+
+
+def test_least_recently_used_entry_evicted():
+    cache = _cache(FakeClock(), max_size=2)
+    load = MagicMock(side_effect=lambda key: key.upper())
+
+    cache.get_or_load("a", load)
+    cache.get_or_load("b", load)
+    cache.get_or_load("a", load)  # a is now most recent
+    cache.get_or_load("c", load)  # evicts b
+
+    assert cache.stats()["evictions"] == 1
+    load.reset_mock()
+    cache.get_or_load("a", load)
+    cache.get_or_load("b", load)
+    load.assert_called_once_with("b")
+
+
+def test_misses_never_evict_found_values():
+    """A scan of unknown keys only pushes out other misses, in their own smaller LRU."""
+    cache = _cache(FakeClock(), max_size=2, negative_max_size=3)
+    cache.get_or_load("hot", MagicMock(return_value="v"))
+
+    for i in range(100):
+        assert cache.get_or_load(f"unknown-{i}", MagicMock(return_value=None)) is None
+
+    load = MagicMock()
+    assert cache.get_or_load("hot", load) == "v"
+    load.assert_not_called()
+    stats = cache.stats()
+    assert (stats["size"], stats["negative_size"]) == (1, 3)
+    assert (stats["evictions"], stats["negative_evictions"]) == (0, 97)
+
+
+def test_key_found_after_cached_miss_replaces_it():
+    clock = FakeClock()
+    cache = _cache(clock)
+    cache.get_or_load("k", MagicMock(return_value=None))
+    clock.now = 6.0  # past negative_ttl
+
+    assert cache.get_or_load("k", MagicMock(return_value="created")) == "created"
+    assert cache.stats()["negative_size"] == 0
+
+
+def test_invalidate_forces_reload():
+    cache = _cache(FakeClock())
+    load = MagicMock(side_effect=[None, "created"])
+
+    assert cache.get_or_load("k", load) is None
+    cache.invalidate("k")
+    assert cache.get_or_load("k", load) == "created"
+
+
+def test_invalidate_where_drops_matching_keys():
+    cache: TTLCache[tuple[str, int], str] = TTLCache(max_size=10, ttl=60.0, negative_ttl=5.0)
+    for key in (("a", 1), ("a", 2), ("b", 1)):
+        cache.get_or_load(key, lambda k: f"{k[0]}{k[1]}")
+
+    cache.invalidate_where(lambda key: key[0] == "a")
+
+    assert cache.stats()["size"] == 1
+    load = MagicMock(return_value="reloaded")
+    assert cache.get_or_load(("b", 1), load) == "b1"
+    assert cache.get_or_load(("a", 2), load) == "reloaded"
+
+
+def test_load_racing_an_invalidation_is_not_stored():
+    cache = _cache(FakeClock())
+
+    def load_then_invalidate(key):
+        cache.invalidate(key)  # e.g. a write committed while this read was in flight
+        return "stale"
+
+    assert cache.get_or_load("k", load_then_invalidate) == "stale"
+    assert cache.get_or_load("k", MagicMock(return_value="fresh")) == "fresh"
+
+
+def test_zero_ttl_disables_caching():
+    cache = _cache(FakeClock(), ttl=0, negative_ttl=0)
+    load = MagicMock(return_value="v")
+
+    cache.get_or_load("k", load)
+    cache.get_or_load("k", load)
+
+    assert load.call_count == 2
+    assert cache.stats()["size"] == 0
@@ -1,10 +1,42 @@
-"""Unit tests for app.db.database — transaction, get_db, create_all."""
+"""Unit tests for app.db.database — transaction, get_async_db, create_all."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+import inspect
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from fastapi import FastAPI
+from fastapi.dependencies.models import Dependant
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.util.concurrency import greenlet_spawn
+from starlette.requests import Request
 
-from app.db.database import create_all, get_db, transaction
+from app.api.exception_handlers import statement_timeout_handler
+from app.config import settings
+from app.db.database import (
+    REQUEST_TIMEOUT_HEADER,
+    ReadConsistency,
+    RoutingSession,
+    _apply_deadline,
+    async_url,
+    create_all,
+    get_async_db,
+    is_lock_contention_error,
+    is_statement_timeout,
+    on_replica,
+    parse_consistency_token,
+    pause,
+    read_consistency_ctx,
+    request_budget_ms,
+    set_deadline,
+    transaction,
+)
+from app.exceptions import ServiceUnavailableError
+from app.main import CONSISTENCY_TOKEN_HEADER, ReadConsistencyMiddleware
+from app.main import app as api
 
 pytestmark = pytest.mark.unit
 
@@ -39,18 +71,16 @@ def test_transaction_logs_on_rollback():
         assert "rollback" in mock_logger.exception.call_args[0][0].lower()
 
 
-def test_get_db_yields_session_and_closes_on_exit():
-    """get_db yields a session from SessionLocal and closes it in finally."""
-    mock_session = MagicMock()
-    with patch("app.db.database.SessionLocal", return_value=mock_session):
-        gen = get_db()
-        session = next(gen)
-        assert session is mock_session
-        try:
-            next(gen)
-        except StopIteration:
-            pass
-    mock_session.close.assert_called_once()
+def _request(method="GET", path="/appointments", headers=None, route_path=None) -> Request:
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    if route_path is not None:
+        scope["route"] = MagicMock(path=route_path)
+    return Request(scope)
 
 
 def test_create_all_calls_metadata_create_all():
@@ -60,3 +90,260 @@ def test_create_all_calls_metadata_create_all():
 
         create_all()
         mock_create.assert_called_once_with(bind=database.engine)
+
+
+@pytest.mark.parametrize(
+    ("pgcode", "expected"), [("55P03", True), ("40P01", True), ("40001", True), ("08006", False)]
+)
+def test_is_lock_contention_error(pgcode, expected):
+    """Lock timeout, deadlock and serialization failures are retryable; others are not."""
+    orig = Exception("db error")
+    orig.pgcode = pgcode  # type: ignore[attr-defined]
+    assert is_lock_contention_error(OperationalError("SELECT 1", {}, orig)) is expected
+
+
+def test_is_lock_contention_error_ignores_non_operational_errors():
+    assert is_lock_contention_error(ValueError("nope")) is False
+
+
+# ---------------------------------------------------------------------------
+# Request budgets (statement_timeout)
+# ---------------------------------------------------------------------------
+def _db_error(pgcode: str) -> OperationalError:
+    orig = Exception("db error")
+    orig.pgcode = pgcode  # type: ignore[attr-defined]
+    return OperationalError("SELECT 1", {}, orig)
+
+
+@pytest.fixture
+def budgets(monkeypatch):
+    monkeypatch.setattr(settings, "statement_timeout_ms", 5000)
+    monkeypatch.setattr(settings, "statement_timeout_max_ms", 30_000)
+    monkeypatch.setattr(
+        settings, "statement_timeout_routes_ms", {"GET /appointments/export": 300_000}
+    )
+
+
+@pytest.mark.parametrize(
+    ("method", "route_path", "header", "expected"),
+    [
+        ("GET", "/appointments", None, 5000),
+        ("GET", "/appointments/export", None, 300_000),
+        ("POST", "/appointments/export", None, 5000),
+        ("GET", "/appointments", "250", 250),
+        ("GET", "/appointments", "999999", 30_000),
+        ("GET", "/appointments", "soon", 5000),
+        ("GET", "/appointments", "0", 5000),
+    ],
+)
+def test_request_budget(budgets, method, route_path, header, expected):
+    headers = {REQUEST_TIMEOUT_HEADER: header} if header is not None else None
+    request = _request(method=method, headers=headers, route_path=route_path)
+    assert request_budget_ms(request) == expected
+
+
+def test_transaction_start_sets_remaining_budget_as_statement_timeout():
+    session = RoutingSession()
+    set_deadline(session, 2000)
+    connection = MagicMock()
+    _apply_deadline(session, MagicMock(), connection)
+    statement, params = connection.execute.call_args[0]
+    assert str(statement) == "SELECT set_config('statement_timeout', :timeout, true)"
+    assert 1900 < int(params["timeout"].removesuffix("ms")) <= 2000
+
+
+def test_no_budget_sets_nothing():
+    session = RoutingSession()
+    set_deadline(session, 0)
+    connection = MagicMock()
+    _apply_deadline(session, MagicMock(), connection)
+    connection.execute.assert_not_called()
+
+
+def test_spent_budget_fails_fast():
+    session = RoutingSession()
+    set_deadline(session, 1)
+    with patch("app.db.database.time.monotonic", return_value=10**9):
+        with pytest.raises(ServiceUnavailableError, match="time budget"):
+            _apply_deadline(session, MagicMock(), MagicMock())
+
+
+def test_statement_timeout_maps_to_503():
+    assert is_statement_timeout(_db_error("57014"))
+    response = statement_timeout_handler(_request(), _db_error("57014"))
+    assert response.status_code == 503
+    assert b"time budget" in bytes(response.body)
+
+
+def test_other_database_errors_are_not_mapped():
+    assert not is_statement_timeout(_db_error("08006"))
+    assert not is_statement_timeout(ValueError("nope"))
+    with pytest.raises(OperationalError):
+        statement_timeout_handler(_request(), _db_error("08006"))
+
+
+# ---------------------------------------------------------------------------
+# Replica routing
+# ---------------------------------------------------------------------------
+@pytest.fixture
+def engines():
+    primary, replica = create_engine("sqlite://"), create_engine("sqlite://")
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def consistency():
+    holder = ReadConsistency()
+    token = read_consistency_ctx.set(holder)
+    yield holder
+    read_consistency_ctx.reset(token)
+
+
+def test_marked_reads_go_to_replica_and_the_rest_to_primary(engines):
+    primary, replica = engines
+    session = RoutingSession(bind=primary, replica=replica)
+    assert session.get_bind(clause=on_replica(select(1))) is replica
+    assert session.get_bind(clause=select(1)) is primary
+    assert session.get_bind(clause=text("SELECT 1")) is primary
+
+
+def test_without_replica_everything_goes_to_primary(engines):
+    primary, _ = engines
+    session = RoutingSession(bind=primary)
+    assert session.get_bind(clause=on_replica(select(1))) is primary
+
+
+def test_reads_inside_transaction_go_to_primary(engines):
+    primary, replica = engines
+    session = RoutingSession(bind=primary, replica=replica)
+    with transaction(session):
+        assert session.get_bind(clause=on_replica(select(1))) is primary
+    assert session.get_bind(clause=on_replica(select(1))) is replica
+
+
+def test_lagging_replica_is_skipped_until_token_replayed(engines, consistency):
+    primary, replica = engines
+    consistency.read_after = "0/16B3748"
+    session = RoutingSession(bind=primary, replica=replica)
+    with patch.object(session, "connection") as connection:
+        connection.return_value.scalar.return_value = False
+        assert session.get_bind(clause=on_replica(select(1))) is primary
+        assert session.get_bind(clause=on_replica(select(1))) is primary
+    connection.return_value.scalar.assert_called_once()
+    assert connection.return_value.scalar.call_args[0][1] == {"lsn": "0/16B3748"}
+
+
+def test_transaction_issues_token_after_commit(engines, consistency):
+    primary, replica = engines
+    session = RoutingSession(bind=primary, replica=replica)
+    with patch.object(session, "connection") as connection:
+        connection.return_value.scalar.return_value = "0/16B3748"
+        with transaction(session):
+            pass
+    assert consistency.written == "0/16B3748"
+    assert consistency.read_after == "0/16B3748"  # the rest of this request reads its write
+
+
+def test_no_token_without_replica(engines, consistency):
+    primary, _ = engines
+    with transaction(RoutingSession(bind=primary)):
+        pass
+    assert consistency.written is None
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("16/B374D848", "16/B374D848"), ("0/0", "0/0"), ("16-B374", None), ("", None), (None, None)],
+)
+def test_parse_consistency_token(value, expected):
+    assert parse_consistency_token(value) == expected
+
+
+def test_middleware_reads_token_and_returns_written_position():
+    app = FastAPI()
+    app.add_middleware(ReadConsistencyMiddleware)
+
+    @app.get("/probe")
+    async def probe():
+        consistency = read_consistency_ctx.get()
+        assert consistency is not None
+        consistency.written = "0/2"
+        return {"read_after": consistency.read_after}
+
+    response = TestClient(app).get("/probe", headers={CONSISTENCY_TOKEN_HEADER: "0/1"})
+    assert response.json() == {"read_after": "0/1"}
+    assert response.headers[CONSISTENCY_TOKEN_HEADER] == "0/2"
+
+
+# ---------------------------------------------------------------------------
+# Async request path (asyncpg)
+# ---------------------------------------------------------------------------
+def _asyncpg_error(pgcode: str) -> DBAPIError:
+    """What SQLAlchemy's asyncpg adapter raises: a plain DBAPIError, not an OperationalError."""
+    orig = Exception("db error")
+    orig.pgcode = pgcode  # type: ignore[attr-defined]
+    return DBAPIError("SELECT 1", {}, orig)
+
+
+def test_asyncpg_errors_are_classified_by_sqlstate():
+    assert is_lock_contention_error(_asyncpg_error("40P01"))
+    assert not is_lock_contention_error(_asyncpg_error("08006"))
+    assert is_statement_timeout(_asyncpg_error("57014"))
+    assert statement_timeout_handler(_request(), _asyncpg_error("57014")).status_code == 503
+
+
+def test_async_url_swaps_only_the_driver():
+    url = async_url("postgresql://app:secret@db:5432/medspa?application_name=api")
+    assert url.render_as_string(hide_password=False) == (
+        "postgresql+asyncpg://app:secret@db:5432/medspa?application_name=api"
+    )
+
+
+def test_get_async_db_sets_deadline_and_closes():
+    session = MagicMock(close=AsyncMock())
+    session.sync_session.info = {}
+
+    async def use_dependency() -> None:
+        dependency = get_async_db(_request())
+        assert await anext(dependency) is session
+        with pytest.raises(StopAsyncIteration):
+            await anext(dependency)
+
+    with patch("app.db.database.AsyncSessionLocal", return_value=session):
+        asyncio.run(use_dependency())
+    session.close.assert_awaited_once()
+    assert "deadline" in session.sync_session.info
+
+
+def test_pause_under_run_sync_lets_other_requests_run():
+    """Booking retries back off with pause(); time.sleep would stall the whole event loop."""
+
+    async def other_request() -> None:
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+
+    async def run() -> bool:
+        other = asyncio.create_task(other_request())
+        await greenlet_spawn(pause, 0.2)  # as AsyncSession.run_sync runs service code
+        return other.done()
+
+    assert asyncio.run(run())
+
+
+def _calls(dependant: Dependant):
+    for dependency in dependant.dependencies:
+        yield dependency.call
+        yield from _calls(dependency)
+
+
+def test_routes_and_dependencies_run_on_the_event_loop():
+    """A sync route or dependency would hold a threadpool thread (40 by default) per request."""
+    routes = [r for r in api.routes if isinstance(r, APIRoute)]
+    assert routes
+    for route in routes:
+        assert inspect.iscoroutinefunction(route.endpoint), route.path
+        for call in _calls(route.dependant):
+            is_async = inspect.iscoroutinefunction(call) or inspect.isasyncgenfunction(call)
+            assert is_async, (route.path, call)
@@ -0,0 +1,79 @@
+"""Unit tests for app.utils.export — NDJSON/CSV encoders for streamed exports."""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.api.responses import FastJSONResponse
+from app.utils.export import CSV_COLUMNS, to_csv, to_ndjson
+
+pytestmark = pytest.mark.unit
+
+
+def _row(id="01A", services=None):
+    return {
+        "id": id,
+        "medspa_id": "01M",
+        "start_time": datetime(2030, 1, 1, 9, 0, tzinfo=timezone.utc),
+        "end_time": datetime(2030, 1, 1, 10, 0, tzinfo=timezone.utc),
+        "status": "completed",
+        "total_price": 8500,
+        "total_duration": 60,
+        "created_at": datetime(2029, 12, 1, tzinfo=timezone.utc),
+        "services": services
+        if services is not None
+        else [{"id": "01S", "name": "Facial, deluxe", "price": 8500, "duration": 60}],
+    }
+
+
+def test_ndjson_one_object_per_line_with_iso_datetimes():
+    lines = b"".join(to_ndjson([_row("01A"), _row("01B")])).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [r["id"] for r in records] == ["01A", "01B"]
+    assert records[0]["start_time"] == "2030-01-01T09:00:00Z"
+    assert records[0]["services"][0]["name"] == "Facial, deluxe"
+
+
+def test_ndjson_datetimes_match_api_responses():
+    """Same encoder options as FastJSONResponse, so exported and listed items agree."""
+    row = _row()
+    line = b"".join(to_ndjson([row])).rstrip(b"\n")
+    assert line == FastJSONResponse(content=row).body
+
+
+def test_csv_header_and_flattened_services_are_quoted():
+    services = [
+        {"id": "01S", "name": "Facial, deluxe", "price": 1, "duration": 30},
+        {"id": "01T", "name": "Peel", "price": 1, "duration": 30},
+    ]
+    reader = csv.reader(io.StringIO("".join(to_csv([_row(services=services)]))))
+    header, row = list(reader)
+    assert tuple(header) == CSV_COLUMNS
+    record = dict(zip(header, row, strict=True))
+    assert record["service_ids"] == "01S;01T"
+    assert record["service_names"] == "Facial, deluxe;Peel"
+    assert record["total_price"] == "8500"
+
+
+def test_csv_empty_export_is_header_only():
+    assert "".join(to_csv([])) == ",".join(CSV_COLUMNS) + "\n"
+
+
+@pytest.mark.parametrize("encode", [to_ndjson, to_csv])
+def test_rows_are_chunked_and_consumed_lazily(encode):
+    consumed = []
+
+    def rows():
+        for i in range(5):
+            consumed.append(i)
+            yield _row(f"01{i}")
+
+    chunks = encode(rows(), chunk_rows=2)
+    first = next(chunks)
+    assert len(consumed) == 2
+    newline = b"\n" if encode is to_ndjson else "\n"
+    assert first.count(newline) == (2 if encode is to_ndjson else 3)  # CSV adds the header
+    assert len(list(chunks)) == 2
@@ -0,0 +1,99 @@
+"""Unit tests for the background database prober and the health endpoints (no database)."""
+
+import inspect
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.db.health import DatabaseProber, DatabaseStatus
+from app.main import app
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def prober():
+    with patch("app.db.health.create_engine"):
+        return DatabaseProber(MagicMock(), interval=5.0, timeout=2.0)
+
+
+@pytest.fixture
+def client(prober):
+    app.state.db_prober = prober
+    yield TestClient(app)  # no lifespan: the test drives the prober
+    del app.state.db_prober
+
+
+def test_probe_records_success(prober):
+    status = prober.probe()
+    assert status.ok and status.latency_ms is not None
+    assert prober.status is status
+
+
+def test_probe_failure_records_error_and_drops_connection(prober):
+    prober._engine.connect.side_effect = ConnectionError("refused")
+    status = prober.probe()
+    assert not status.ok
+    assert status.error == "ConnectionError"
+    prober._engine.dispose.assert_called_once()
+
+
+def test_result_goes_stale_after_missed_probes(prober):
+    now = time.monotonic()
+    assert prober.is_fresh(DatabaseStatus(True, now - 10))
+    assert not prober.is_fresh(DatabaseStatus(True, now - 15))
+
+
+def test_live_never_needs_a_probe(client):
+    assert client.get("/health/live").json() == {"status": "ok"}
+
+
+def test_health_endpoints_run_on_the_event_loop():
+    """Sync routes would queue for a threadpool slot behind requests waiting on the database."""
+    endpoints = [
+        r.endpoint for r in app.routes if isinstance(r, APIRoute) and r.path.startswith("/health")
+    ]
+    assert len(endpoints) == 3
+    assert all(inspect.iscoroutinefunction(e) for e in endpoints)
+
+
+def test_ready_from_cached_probe(client, prober):
+    prober.probe()
+    r = client.get("/health/ready")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["status"] == "ok"
+    assert body["database"]["ok"] is True
+    assert body["pool"]["capacity"] == settings.db_pool_size + settings.db_max_overflow
+    assert client.get("/health").json() == {"status": "ok"}
+    prober._engine.connect.assert_called_once()  # endpoints did not probe again
+
+
+def test_not_ready_before_first_probe(client):
+    r = client.get("/health/ready")
+    assert r.status_code == 503
+    assert r.json()["database"] == {"ok": False, "detail": "not probed yet"}
+
+
+def test_not_ready_when_database_down_or_result_stale(client, prober):
+    prober._engine.connect.side_effect = ConnectionError("refused")
+    prober.probe()
+    assert client.get("/health/ready").status_code == 503
+    r = client.get("/health")
+    assert r.status_code == 503
+    assert r.json() == {"status": "unhealthy", "detail": "database unavailable"}
+
+    prober._status = DatabaseStatus(True, time.monotonic() - 60)
+    assert client.get("/health/ready").status_code == 503
+
+
+def test_not_ready_when_pool_saturated(client, prober, monkeypatch):
+    prober.probe()
+    monkeypatch.setattr(settings, "health_max_pool_saturation", 0.0)
+    r = client.get("/health/ready")
+    assert r.status_code == 503
+    assert r.json()["database"]["ok"] is True
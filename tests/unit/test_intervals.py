@@ -0,0 +1,79 @@
+"""Unit tests for app.utils.intervals — merge, free-slot sweep and per-service calendars."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.utils.intervals import DisjointIntervals, align_up, free_starts, merge_intervals
+
+pytestmark = pytest.mark.unit
+
+BASE = datetime(2030, 1, 7, 9, 0, tzinfo=timezone.utc)
+
+
+def _at(minutes: int) -> datetime:
+    return BASE + timedelta(minutes=minutes)
+
+
+def test_merge_intervals_sorts_and_merges_overlapping_and_touching():
+    merged = merge_intervals([(_at(60), _at(90)), (_at(0), _at(30)), (_at(30), _at(45))])
+    assert merged == [(_at(0), _at(45)), (_at(60), _at(90))]
+
+
+def test_merge_intervals_keeps_contained_interval_inside():
+    assert merge_intervals([(_at(0), _at(120)), (_at(10), _at(20))]) == [(_at(0), _at(120))]
+
+
+def test_align_up():
+    step = timedelta(minutes=15)
+    assert align_up(_at(0), step) == _at(0)
+    assert align_up(_at(1), step) == _at(15)
+    assert align_up(_at(14), step) == _at(15)
+
+
+def test_free_starts_empty_calendar_fills_grid():
+    slots = free_starts([], _at(0), _at(60), timedelta(minutes=30), timedelta(minutes=15))
+    assert slots == [_at(0), _at(15), _at(30)]
+
+
+def test_free_starts_skips_slots_overlapping_busy_intervals():
+    """Half-open semantics: a slot may end exactly when a booking starts, or start when it ends."""
+    busy = [(_at(60), _at(90))]
+    slots = free_starts(busy, _at(0), _at(150), timedelta(minutes=30), timedelta(minutes=15))
+    assert slots == [_at(0), _at(15), _at(30), _at(90), _at(105), _at(120)]
+
+
+def test_free_starts_aligns_window_start_to_grid():
+    slots = free_starts([], _at(7), _at(60), timedelta(minutes=15), timedelta(minutes=15))
+    assert slots == [_at(15), _at(30), _at(45)]
+
+
+def test_free_starts_busy_interval_before_window_is_ignored():
+    busy = [(_at(-120), _at(-60)), (_at(0), _at(15))]
+    slots = free_starts(busy, _at(0), _at(45), timedelta(minutes=15), timedelta(minutes=15))
+    assert slots == [_at(15), _at(30)]
+
+
+def test_free_starts_fully_booked_returns_nothing():
+    busy = [(_at(0), _at(240))]
+    assert free_starts(busy, _at(0), _at(240), timedelta(minutes=15), timedelta(minutes=15)) == []
+
+
+def test_disjoint_intervals_overlap_is_half_open():
+    calendar = DisjointIntervals([(_at(60), _at(90)), (_at(0), _at(30))])
+    assert calendar.overlaps(_at(20), _at(40))
+    assert calendar.overlaps(_at(70), _at(80))
+    assert calendar.overlaps(_at(-10), _at(200))
+    assert not calendar.overlaps(_at(30), _at(60))
+    assert not calendar.overlaps(_at(90), _at(120))
+    assert not calendar.overlaps(_at(-30), _at(0))
+
+
+def test_disjoint_intervals_add_is_seen_by_later_checks():
+    calendar = DisjointIntervals()
+    assert not calendar.overlaps(_at(0), _at(30))
+    calendar.add(_at(60), _at(90))
+    calendar.add(_at(0), _at(30))
+    assert calendar.overlaps(_at(15), _at(45))
+    assert calendar.overlaps(_at(45), _at(75))
+    assert not calendar.overlaps(_at(30), _at(60))
@@ -0,0 +1,104 @@
+"""Unit tests for app.db.invalidation — handler dispatch and the listener's reconnect loop."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.db import invalidation
+from app.db.invalidation import (
+    CHANNEL,
+    InvalidationListener,
+    dispatch,
+    flush_all,
+    notify_invalidation,
+    register_invalidation,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def isolated_handlers(monkeypatch):
+    """Tests register their own topics; the services' registrations are restored afterwards."""
+    monkeypatch.setattr(invalidation, "_handlers", {})
+
+
+def test_notify_sends_topic_and_key_on_channel():
+    db = MagicMock()
+    notify_invalidation(db, "medspa", "01M")
+    params = db.execute.call_args[0][1]
+    assert params == {"channel": CHANNEL, "payload": "medspa:01M"}
+
+
+def test_dispatch_routes_key_to_topic_handler():
+    evict, other = MagicMock(), MagicMock()
+    register_invalidation("medspa", evict, MagicMock())
+    register_invalidation("catalog", other, MagicMock())
+
+    dispatch("medspa:01M")
+
+    evict.assert_called_once_with("01M")
+    other.assert_not_called()
+
+
+def test_dispatch_ignores_unknown_topic():
+    evict = MagicMock()
+    register_invalidation("medspa", evict, MagicMock())
+    dispatch("unknown:01M")
+    evict.assert_not_called()
+
+
+def test_flush_all_flushes_every_handler():
+    flushes = [MagicMock(), MagicMock()]
+    register_invalidation("a", MagicMock(), flushes[0])
+    register_invalidation("b", MagicMock(), flushes[1])
+    flush_all()
+    for flush in flushes:
+        flush.assert_called_once_with()
+
+
+def _listener() -> InvalidationListener:
+    return InvalidationListener(MagicMock(), heartbeat=0.01, max_backoff=0.01)
+
+
+def test_listener_reconnects_and_flushes_on_connection_loss():
+    flush = MagicMock()
+    register_invalidation("medspa", MagicMock(), flush)
+    listener = _listener()
+    first, second = MagicMock(), MagicMock()
+    connect_error = OperationalError("connect", {}, Exception("refused"))
+
+    def listen(conn):
+        if conn is first:
+            raise OperationalError("poll", {}, Exception("server closed the connection"))
+        listener._stopping.set()
+
+    with (
+        patch.object(listener, "_connect", side_effect=[connect_error, first, second]),
+        patch.object(listener, "_listen", side_effect=listen),
+    ):
+        listener._run()
+
+    # on connect, on loss, on reconnect
+    assert flush.call_count == 3
+    first.close.assert_called_once()
+    second.close.assert_called_once()
+
+
+def test_listener_dispatches_pending_notifications():
+    evict = MagicMock()
+    register_invalidation("catalog", evict, MagicMock())
+    listener = _listener()
+    conn = MagicMock()
+    conn.notifies = [MagicMock(payload="catalog:01M"), MagicMock(payload="catalog:01N")]
+
+    def poll():
+        listener._stopping.set()
+
+    conn.poll.side_effect = poll
+    with patch("app.db.invalidation.select.select", return_value=([conn], [], [])):
+        listener._listen(conn)
+
+    assert [c.args for c in evict.call_args_list] == [("01M",), ("01N",)]
+    assert conn.notifies == []
@@ -9,7 +9,8 @@ from sqlalchemy.exc import IntegrityError
 from app.exceptions import ConflictError, NotFoundError
 from app.models.models import Medspa
 from app.schemas.medspas import MedspaCreate
-from app.services.medspa_service import MedspaService
+from app.services.medspa_service import MedspaService, medspa_cache
+from app.utils.query import JsonPage
 
 pytestmark = pytest.mark.unit
 
@@ -35,26 +36,46 @@ def _make_medspa(id=MEDSPA_ID, name="Test MedSpa"):
 # ---------------------------------------------------------------------------
 # get_medspa
 # ---------------------------------------------------------------------------
+@patch("app.services.medspa_service.MedspaRepository")
 class TestGetMedspa:
-    @patch("app.services.medspa_service.get_by_id")
-    def test_found(self, mock_get_by_id):
+    def test_found(self, mock_repo):
         medspa = _make_medspa()
-        mock_get_by_id.return_value = medspa
+        mock_repo.get_by_id.return_value = medspa
 
         db = MagicMock()
         result = MedspaService.get_medspa(db, MEDSPA_ID)
         assert result.id == MEDSPA_ID
         assert result.name == "Test MedSpa"
-        mock_get_by_id.assert_called_once_with(db, Medspa, MEDSPA_ID, "Medspa not found")
+        mock_repo.get_by_id.assert_called_once_with(db, MEDSPA_ID)
 
-    @patch("app.services.medspa_service.get_by_id")
-    def test_not_found(self, mock_get_by_id):
-        mock_get_by_id.side_effect = NotFoundError("Medspa not found")
+    def test_not_found(self, mock_repo):
+        mock_repo.get_by_id.return_value = None
 
         db = MagicMock()
         with pytest.raises(NotFoundError, match="Medspa not found"):
             MedspaService.get_medspa(db, MEDSPA_ID)
 
+    def test_second_lookup_served_from_cache(self, mock_repo):
+        mock_repo.get_by_id.return_value = _make_medspa()
+
+        db = MagicMock()
+        MedspaService.get_medspa(db, MEDSPA_ID)
+        result = MedspaService.get_medspa(db, MEDSPA_ID)
+
+        assert result.id == MEDSPA_ID
+        mock_repo.get_by_id.assert_called_once_with(db, MEDSPA_ID)
+        assert medspa_cache.stats()["hits"] == 1
+
+    def test_unknown_id_cached_as_not_found(self, mock_repo):
+        mock_repo.get_by_id.return_value = None
+
+        for _ in range(3):
+            with pytest.raises(NotFoundError, match="Medspa not found"):
+                MedspaService.get_medspa(MagicMock(), MEDSPA_ID)
+
+        mock_repo.get_by_id.assert_called_once()
+        assert medspa_cache.stats()["negative_hits"] == 2
+
 
 # ---------------------------------------------------------------------------
 # list_medspas
@@ -106,6 +127,25 @@ class TestListMedspas:
         mock_repo.list.assert_called_once_with(db, cursor="some-cursor", limit=10)
 
 
+@patch("app.services.medspa_service.MedspaRepository")
+class TestListMedspasJson:
+    def test_next_cursor_is_last_id(self, mock_repo):
+        mock_repo.list_json.return_value = JsonPage(items="[]", last={"id": MEDSPA_ID})
+
+        db = MagicMock()
+        items, next_cursor = MedspaService.list_medspas_json(db, cursor="some-cursor", limit=2)
+
+        assert items == "[]"
+        assert next_cursor == MEDSPA_ID
+        mock_repo.list_json.assert_called_once_with(db, cursor="some-cursor", limit=2)
+
+    def test_next_cursor_none_when_no_more(self, mock_repo):
+        mock_repo.list_json.return_value = JsonPage(items="[]", last=None)
+
+        _, next_cursor = MedspaService.list_medspas_json(MagicMock(), limit=20)
+        assert next_cursor is None
+
+
 # ---------------------------------------------------------------------------
 # create_medspa
 # ---------------------------------------------------------------------------
@@ -143,3 +183,18 @@ class TestCreateMedspa:
 
         with pytest.raises(ConflictError, match="already exists"):
             MedspaService.create_medspa(db, data)
+
+    def test_create_drops_cached_not_found(self, mock_repo, _gen_id):
+        mock_repo.get_by_id.side_effect = [None, _make_medspa(id=FAKE_ID)]
+        with pytest.raises(NotFoundError):
+            MedspaService.get_medspa(MagicMock(), FAKE_ID)
+
+        data = MedspaCreate(
+            name="New MedSpa",
+            address="100 Main St",
+            phone_number="512-555-1234",
+            email="contact@example.com",
+        )
+        MedspaService.create_medspa(MagicMock(), data)
+
+        assert MedspaService.get_medspa(MagicMock(), FAKE_ID).id == FAKE_ID
@@ -1,20 +1,25 @@
 """Unit tests for OfferingsService — all repository and external dependencies are mocked."""
 
 from contextlib import contextmanager
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from app.exceptions import NotFoundError
 from app.models.models import Medspa, Service
+from app.models.read_models import ServiceRecord
 from app.schemas.services import ServiceCreate, ServiceUpdate
-from app.services.offerings_service import OfferingsService
+from app.services.offerings_service import OfferingsService, catalog_cache
+from app.utils.query import JsonPage
 
 pytestmark = pytest.mark.unit
 
 MEDSPA_ID = "01MYYYYYYYYYYYYYYYYYYYYYYYY"
 SERVICE_ID = "01SAAAAAAAAAAAAAAAAAAAAAAAA"
 FAKE_ID = "01HXXXXXXXXXXXXXXXXXXXXXXX"
+OTHER_SERVICE_ID = "01SBBBBBBBBBBBBBBBBBBBBBBB"
+NOW = datetime(2030, 1, 1, tzinfo=timezone.utc)
 
 
 @contextmanager
@@ -39,6 +44,10 @@ def _make_service(id=SERVICE_ID, medspa_id=MEDSPA_ID, name="Test Service", price
     return s
 
 
+def _record(id=SERVICE_ID, medspa_id=MEDSPA_ID, price=5000):
+    return ServiceRecord(id, medspa_id, "Test Service", None, price, 30, NOW, NOW)
+
+
 # ---------------------------------------------------------------------------
 # create_service
 # ---------------------------------------------------------------------------
@@ -60,6 +69,7 @@ class TestCreateService:
         assert result.name == "New Service"
         assert result.medspa_id == MEDSPA_ID
         mock_service_repo.create.assert_called_once()
+        mock_service_repo.bump_catalog_version.assert_called_once_with(db, MEDSPA_ID)
 
     def test_medspa_not_found(self, mock_medspa_svc, mock_service_repo, _gen_id):
         mock_medspa_svc.get_medspa.side_effect = NotFoundError("Medspa not found")
@@ -74,21 +84,20 @@ class TestCreateService:
 # ---------------------------------------------------------------------------
 # get_service
 # ---------------------------------------------------------------------------
+@patch("app.services.offerings_service.ServiceRepository")
 class TestGetService:
-    @patch("app.services.offerings_service.get_by_id")
-    def test_exists(self, mock_get_by_id):
+    def test_exists(self, mock_service_repo):
         service = _make_service()
-        mock_get_by_id.return_value = service
+        mock_service_repo.get_by_id.return_value = service
 
         db = MagicMock()
         result = OfferingsService.get_service(db, SERVICE_ID)
         assert result.id == SERVICE_ID
         assert result.name == "Test Service"
-        mock_get_by_id.assert_called_once_with(db, Service, SERVICE_ID, "Service not found")
+        mock_service_repo.get_by_id.assert_called_once_with(db, SERVICE_ID)
 
-    @patch("app.services.offerings_service.get_by_id")
-    def test_not_found(self, mock_get_by_id):
-        mock_get_by_id.side_effect = NotFoundError("Service not found")
+    def test_not_found(self, mock_service_repo):
+        mock_service_repo.get_by_id.return_value = None
 
         db = MagicMock()
         with pytest.raises(NotFoundError, match="Service not found"):
@@ -121,6 +130,19 @@ class TestListServicesByMedspa:
         assert len(items) == 1
         assert items[0].id == SERVICE_ID
 
+    def test_json_page_checks_medspa_and_returns_last_id(self, mock_medspa_svc, mock_service_repo):
+        mock_medspa_svc.get_medspa.return_value = _make_medspa()
+        mock_service_repo.list_by_medspa_id_json.return_value = JsonPage(
+            items="[]", last={"id": SERVICE_ID}
+        )
+
+        db = MagicMock()
+        items, next_cursor = OfferingsService.list_services_by_medspa_json(db, MEDSPA_ID, limit=1)
+
+        assert items == "[]"
+        assert next_cursor == SERVICE_ID
+        mock_medspa_svc.get_medspa.assert_called_once_with(db, MEDSPA_ID)
+
 
 # ---------------------------------------------------------------------------
 # update_service
@@ -139,6 +161,7 @@ class TestUpdateService:
         result = OfferingsService.update_service(db, SERVICE_ID, data)
         assert result.name == "Updated"
         assert result.price == 5000  # unchanged
+        mock_service_repo.bump_catalog_version.assert_called_once_with(db, MEDSPA_ID)
 
     def test_all_four_fields(self, mock_get_by_id, mock_service_repo):
         service = _make_service()
@@ -162,3 +185,66 @@ class TestUpdateService:
         db = MagicMock()
         with pytest.raises(NotFoundError, match="Service not found"):
             OfferingsService.update_service(db, "nonexistent-id", ServiceUpdate(name="X"))
+
+
+# ---------------------------------------------------------------------------
+# get_catalog / resolve_services
+# ---------------------------------------------------------------------------
+@patch("app.services.offerings_service.ServiceRepository")
+class TestGetCatalog:
+    def test_loaded_once_per_version(self, mock_service_repo):
+        mock_service_repo.catalog_version.return_value = 3
+        mock_service_repo.list_catalog.return_value = [_record()]
+
+        db = MagicMock()
+        first = OfferingsService.get_catalog(db, MEDSPA_ID)
+        second = OfferingsService.get_catalog(db, MEDSPA_ID)
+
+        assert first is second
+        assert dict(first) == {SERVICE_ID: _record()}
+        assert mock_service_repo.catalog_version.call_count == 2
+        mock_service_repo.list_catalog.assert_called_once_with(db, MEDSPA_ID)
+        assert catalog_cache.stats()["hits"] == 1
+
+    def test_new_version_reloads(self, mock_service_repo):
+        mock_service_repo.catalog_version.return_value = 1
+        mock_service_repo.list_catalog.return_value = [_record(price=5000)]
+        assert OfferingsService.get_catalog(MagicMock(), MEDSPA_ID)[SERVICE_ID].price == 5000
+
+        mock_service_repo.catalog_version.return_value = 2
+        mock_service_repo.list_catalog.return_value = [_record(price=7500)]
+        assert OfferingsService.get_catalog(MagicMock(), MEDSPA_ID)[SERVICE_ID].price == 7500
+        assert mock_service_repo.list_catalog.call_count == 2
+
+    def test_catalog_is_read_only(self, mock_service_repo):
+        mock_service_repo.catalog_version.return_value = 0
+        mock_service_repo.list_catalog.return_value = []
+
+        catalog = OfferingsService.get_catalog(MagicMock(), MEDSPA_ID)
+        with pytest.raises(TypeError):
+            catalog[SERVICE_ID] = _record()  # type: ignore[index]
+
+    def test_resolve_from_catalog_without_lookup(self, mock_service_repo):
+        mock_service_repo.catalog_version.return_value = 1
+        mock_service_repo.list_catalog.return_value = [_record()]
+        mock_service_repo.find_by_ids.return_value = []
+
+        db = MagicMock()
+        found = OfferingsService.resolve_services(db, MEDSPA_ID, [SERVICE_ID])
+
+        assert found == {SERVICE_ID: _record()}
+        mock_service_repo.find_by_ids.assert_called_once_with(db, [])
+
+    def test_resolve_looks_up_ids_outside_catalog(self, mock_service_repo):
+        foreign = _record(id=OTHER_SERVICE_ID, medspa_id="other")
+        mock_service_repo.catalog_version.return_value = 1
+        mock_service_repo.list_catalog.return_value = [_record()]
+        mock_service_repo.find_by_ids.return_value = [foreign]
+
+        db = MagicMock()
+        found = OfferingsService.resolve_services(
+            db, MEDSPA_ID, [SERVICE_ID, OTHER_SERVICE_ID, FAKE_ID]
+        )
+
+        assert found == {SERVICE_ID: _record(), OTHER_SERVICE_ID: foreign}
+        mock_service_repo.find_by_ids.assert_called_once_with(db, [OTHER_SERVICE_ID, FAKE_ID])
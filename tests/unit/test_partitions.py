@@ -0,0 +1,92 @@
+"""Unit tests for monthly partition maintenance (no Postgres: engine mocked or sqlite)."""
+
+import logging
+from unittest.mock import MagicMock, patch
+
+import anyio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from app.db.partitions import ensure_partitions, maintain_partitions
+
+pytestmark = pytest.mark.unit
+
+
+class _FakePgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def _engine_creating(months: int) -> MagicMock:
+    engine = MagicMock()
+    conn = engine.begin.return_value.__enter__.return_value
+    conn.execute.return_value.scalar_one.return_value = months
+    return engine
+
+
+def test_ensure_partitions_covers_this_month_and_months_ahead(caplog):
+    engine = _engine_creating(2)
+
+    with caplog.at_level(logging.INFO, logger="app.db.partitions"):
+        assert ensure_partitions(engine, months_ahead=12, lock_timeout_ms=3000) == 2
+
+    conn = engine.begin.return_value.__enter__.return_value
+    conn.exec_driver_sql.assert_called_once_with("SET LOCAL lock_timeout = 3000")
+    statement, params = conn.execute.call_args[0]
+    assert "create_appointment_partitions" in str(statement)
+    assert params == {"months": 13}
+    assert "appointment_partitions_created months=2" in caplog.text
+
+
+def test_ensure_partitions_quiet_when_nothing_to_create(caplog):
+    with caplog.at_level(logging.INFO, logger="app.db.partitions"):
+        assert ensure_partitions(_engine_creating(0), months_ahead=12, lock_timeout_ms=3000) == 0
+    assert caplog.text == ""
+
+
+def test_ensure_partitions_without_function_logs_and_returns_none(caplog):
+    """create_all databases have no create_appointment_partitions(); the API carries on."""
+    engine = create_engine("sqlite://")
+
+    with caplog.at_level(logging.WARNING, logger="app.db.partitions"):
+        assert ensure_partitions(engine, months_ahead=12, lock_timeout_ms=3000) is None
+
+    [record] = caplog.records
+    assert record.getMessage() == "appointment_partitions_failed"
+    assert record.exc_info is not None and record.exc_info[0] is OperationalError
+
+
+def test_ensure_partitions_gives_up_on_lock_timeout(caplog):
+    """Behind a long reader the DDL's lock wait would block every later query; retried later."""
+    engine = _engine_creating(1)
+    conn = engine.begin.return_value.__enter__.return_value
+    conn.execute.side_effect = OperationalError(
+        "SELECT create_appointment_partitions(...)", {}, _FakePgError("55P03")
+    )
+
+    with caplog.at_level(logging.WARNING, logger="app.db.partitions"):
+        assert ensure_partitions(engine, months_ahead=12, lock_timeout_ms=3000) is None
+
+    assert "appointment_partitions_lock_timeout lock_timeout_ms=3000" in caplog.text
+
+
+def test_maintain_partitions_repeats_every_interval():
+    calls = []
+
+    def fake_ensure(engine, months_ahead, lock_timeout_ms):
+        calls.append((months_ahead, lock_timeout_ms))
+        return 0
+
+    async def run_briefly():
+        with anyio.move_on_after(0.2):
+            await maintain_partitions(
+                MagicMock(), months_ahead=3, interval=0.05, lock_timeout_ms=100
+            )
+
+    with patch("app.db.partitions.ensure_partitions", fake_ensure):
+        anyio.run(run_briefly)
+
+    assert len(calls) >= 2
+    assert set(calls) == {(3, 100)}
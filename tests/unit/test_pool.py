@@ -0,0 +1,100 @@
+"""Unit tests for app.db.pool — checkout timing and peaks, on an in-memory SQLite pool."""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.db.pool import TimedQueuePool, instrument_pool, pool_stats, pool_status
+from app.main import app
+
+pytestmark = pytest.mark.unit
+
+
+def _engine(max_overflow: int, timeout: float) -> Engine:
+    engine = create_engine(
+        "sqlite://",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=max_overflow,
+        pool_timeout=timeout,
+    )
+    instrument_pool(engine)
+    return engine
+
+
+@pytest.fixture
+def engine():
+    engine = _engine(max_overflow=1, timeout=0.05)
+    yield engine
+    engine.dispose()
+
+
+def test_status_reports_in_use_and_overflow(engine: Engine):
+    first, second = engine.connect(), engine.connect()
+
+    status = pool_status(engine)
+    assert status["size"] == 1
+    assert status["max_overflow"] == 1
+    assert status["checked_out"] == 2
+    assert status["overflow"] == 1
+    assert status["checkouts"] == 2
+
+    first.close()
+    second.close()
+    status = pool_status(engine)
+    assert status["checked_out"] == 0
+    assert status["checked_in"] == 1
+    assert (status["peak_checked_out"], status["peak_overflow"]) == (2, 1)
+
+
+def test_exhausted_pool_counts_timeout_and_wait(engine: Engine):
+    held = [engine.connect(), engine.connect()]
+
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    status = pool_status(engine)
+    assert status["timeouts"] == 1
+    assert status["wait_max_ms"] >= 50
+    for conn in held:
+        conn.close()
+
+
+def test_checkout_wait_includes_queueing():
+    engine = _engine(max_overflow=0, timeout=5)
+    held = engine.connect()
+    release = threading.Timer(0.05, held.close)
+    release.start()
+    started = time.perf_counter()
+    with engine.connect():
+        waited = time.perf_counter() - started
+    release.join()
+
+    stats = pool_stats(engine)
+    assert stats is not None
+    assert stats.snapshot()["wait_max_ms"] >= 40
+    assert stats.snapshot()["wait_max_ms"] <= waited * 1000 + 1
+    engine.dispose()
+
+
+def test_each_engine_keeps_its_own_stats_across_dispose(engine: Engine):
+    other = _engine(max_overflow=0, timeout=1)
+    engine.connect().close()
+    engine.dispose()  # recreates the pool; its stats carry over
+
+    assert pool_status(engine)["checkouts"] == 1
+    assert pool_status(other)["checkouts"] == 0
+    other.dispose()
+
+
+def test_admin_pool_endpoint_reports_this_worker():
+    response = TestClient(app).get("/admin/pool")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["pool_class"] == "TimedAsyncQueuePool"
+    assert body["size"] >= 1
+    assert {"pid", "checked_out", "overflow", "wait_mean_ms", "timeouts"} <= body.keys()
@@ -0,0 +1,143 @@
+"""Unit tests for per-request statement counting and query budgets (sqlite, no Postgres)."""
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.db.query_stats import (
+    QueryBudgetExceeded,
+    QueryStats,
+    check_query_budget,
+    count_queries,
+    instrument_queries,
+    route_key,
+)
+from app.main import QueryStatsMiddleware
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    instrument_queries(engine)
+    yield engine
+    engine.dispose()
+
+
+def _run(engine, n: int) -> None:
+    with engine.connect() as conn:
+        for _ in range(n):
+            conn.execute(text("SELECT 1"))
+
+
+def test_counts_statements_and_time(engine):
+    with count_queries() as stats:
+        _run(engine, 3)
+    assert stats.statements == 3
+    assert stats.db_seconds > 0
+
+
+def test_failed_statement_is_counted(engine):
+    with count_queries() as stats, engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+    assert stats.statements == 2
+
+
+def test_instrumenting_twice_counts_once(engine):
+    instrument_queries(engine)
+    with count_queries() as stats:
+        _run(engine, 2)
+    assert stats.statements == 2
+
+
+def test_statements_outside_a_request_are_not_counted(engine):
+    _run(engine, 2)  # no QueryStats set: nothing to record, nothing raised
+    with count_queries() as stats:
+        _run(engine, 1)
+    assert stats.statements == 1
+
+
+def test_budget_default_and_route_override(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "query_budget_default", 2)
+    monkeypatch.setattr(settings, "query_budgets", {"GET /export": 0})
+    check_query_budget("GET /items", QueryStats(statements=2))
+    check_query_budget("GET /export", QueryStats(statements=500))  # 0: no budget
+    assert "query_budget_exceeded" not in caplog.text
+
+    with caplog.at_level(logging.WARNING, logger="app.db.query_stats"):
+        check_query_budget("GET /items", QueryStats(statements=3))
+    assert "query_budget_exceeded route=GET /items statements=3 budget=2" in caplog.text
+
+
+def test_strict_budget_raises(monkeypatch):
+    monkeypatch.setattr(settings, "query_budget_default", 2)
+    monkeypatch.setattr(settings, "query_budget_strict", True)
+    with pytest.raises(QueryBudgetExceeded, match="GET /items ran 3 SQL statements"):
+        check_query_budget("GET /items", QueryStats(statements=3))
+
+
+def test_route_key_uses_route_template():
+    class Route:
+        path = "/items/{item_id}"
+
+    assert route_key({"method": "GET", "path": "/items/1", "route": Route()}) == (
+        "GET /items/{item_id}"
+    )
+    assert route_key({"method": "GET", "path": "/nowhere"}) == "GET /nowhere"
+
+
+@pytest.fixture
+def client(engine):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/items/{n}")
+    def items(n: int):
+        _run(engine, n)
+        return {"n": n}
+
+    @app.get("/stream/{n}")
+    def stream(n: int):
+        def body():
+            for _ in range(n):
+                _run(engine, 1)
+                yield "x"
+
+        return StreamingResponse(body())
+
+    return TestClient(app)
+
+
+def _summary(caplog) -> str:
+    (line,) = [r.getMessage() for r in caplog.records if "request_completed" in r.getMessage()]
+    return line
+
+
+def test_request_summary_logs_statements(client, caplog):
+    with caplog.at_level(logging.INFO, logger="app.main"):
+        assert client.get("/items/3").status_code == 200
+    assert "route=GET /items/{n} status=200" in _summary(caplog)
+    assert "db_queries=3 " in _summary(caplog)
+
+
+def test_request_summary_includes_streamed_body(client, caplog):
+    with caplog.at_level(logging.INFO, logger="app.main"):
+        assert client.get("/stream/4").text == "xxxx"
+    assert "db_queries=4 " in _summary(caplog)
+
+
+def test_strict_mode_fails_request_over_budget(client, monkeypatch):
+    monkeypatch.setattr(settings, "query_budgets", {"GET /items/{n}": 2})
+    monkeypatch.setattr(settings, "query_budget_strict", True)
+    assert client.get("/items/2").status_code == 200
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/items/3")
@@ -0,0 +1,35 @@
+from dataclasses import FrozenInstanceError, fields
+
+import pytest
+
+from app.models.models import Appointment, Medspa, Service
+from app.models.read_models import (
+    AppointmentRecord,
+    AppointmentServiceRecord,
+    MedspaRecord,
+    ServiceRecord,
+    record_columns,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize(
+    "model,record",
+    [(Medspa, MedspaRecord), (Service, ServiceRecord), (Service, AppointmentServiceRecord)],
+)
+def test_record_columns_follow_record_fields(model, record):
+    columns = record_columns(model, record)
+    assert [c.key for c in columns] == [f.name for f in fields(record)]
+
+
+def test_record_columns_exclude():
+    columns = record_columns(Appointment, AppointmentRecord, exclude=("services",))
+    assert [c.key for c in columns] == [f.name for f in fields(AppointmentRecord)][:-1]
+
+
+def test_records_are_slotted_and_frozen():
+    service = AppointmentServiceRecord("01S", "Facial", 8500, 60)
+    assert not hasattr(service, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        service.price = 1  # type: ignore[misc]
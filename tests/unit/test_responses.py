@@ -0,0 +1,138 @@
+"""FastJSONResponse + content_from_* must produce the same bytes as the Pydantic response models."""
+
+import json
+from dataclasses import fields
+from datetime import datetime, timezone
+
+import pytest
+
+from app.api.responses import FastJSONResponse, pg_json_page_response
+from app.main import app
+from app.models.models import Appointment, Medspa, Service
+from app.models.read_models import (
+    AppointmentRecord,
+    AppointmentServiceRecord,
+    MedspaRecord,
+    ServiceRecord,
+)
+from app.schemas.appointments import AppointmentResponse
+from app.schemas.medspas import MedspaResponse
+from app.schemas.pagination import PaginatedResponse, paginated_content
+from app.schemas.services import ServiceResponse
+
+pytestmark = pytest.mark.unit
+
+CREATED = datetime(2030, 1, 1, 8, 0, 0, 123456, tzinfo=timezone.utc)
+UPDATED = datetime(2030, 1, 2, 8, 0, tzinfo=timezone.utc)
+
+
+def _medspa():
+    return Medspa(
+        id="01MEDSPA0000000000000000000",
+        name="Glow",
+        address="1 Main St",
+        phone_number="(512) 555-0100",
+        email="hi@glow.test",
+        created_at=CREATED,
+        updated_at=UPDATED,
+    )
+
+
+def _service(id="01SERVICE000000000000000000", description=None):
+    return Service(
+        id=id,
+        medspa_id="01MEDSPA0000000000000000000",
+        name="Facial ✨",
+        description=description,
+        price=8500,
+        duration=60,
+        created_at=CREATED,
+        updated_at=UPDATED,
+    )
+
+
+def _appointment():
+    return Appointment(
+        id="01APPOINTMENT00000000000000",
+        medspa_id="01MEDSPA0000000000000000000",
+        start_time=datetime(2030, 3, 1, 14, 0, tzinfo=timezone.utc),
+        status="scheduled",
+        total_price=17000,
+        total_duration=120,
+        created_at=CREATED,
+        updated_at=UPDATED,
+        services=[_service(), _service(id="01SERVICE000000000000000001", description="x")],
+    )
+
+
+def test_appointment_content_matches_model():
+    a = _appointment()
+    expected = AppointmentResponse.from_appointment(a).model_dump_json().encode()
+    assert FastJSONResponse(AppointmentResponse.content_from_appointment(a)).body == expected
+
+
+def test_medspa_content_matches_model():
+    m = _medspa()
+    expected = MedspaResponse.from_medspa(m).model_dump_json().encode()
+    assert FastJSONResponse(MedspaResponse.content_from_medspa(m)).body == expected
+
+
+@pytest.mark.parametrize("description", [None, "Deep clean"])
+def test_service_content_matches_model(description):
+    s = _service(description=description)
+    expected = ServiceResponse.from_service(s).model_dump_json().encode()
+    assert FastJSONResponse(ServiceResponse.content_from_service(s)).body == expected
+
+
+def test_paginated_content_matches_model():
+    a = _appointment()
+    page = PaginatedResponse[AppointmentResponse](
+        items=[AppointmentResponse.from_appointment(a)], next_cursor="abc", limit=20
+    )
+    content = paginated_content([AppointmentResponse.content_from_appointment(a)], "abc", 20)
+    assert FastJSONResponse(content).body == page.model_dump_json().encode()
+
+
+def test_records_render_like_entities():
+    m, s, a = _medspa(), _service(description="x"), _appointment()
+    medspa = MedspaRecord(*(getattr(m, f.name) for f in fields(MedspaRecord)))
+    service = ServiceRecord(*(getattr(s, f.name) for f in fields(ServiceRecord)))
+    appointment = AppointmentRecord(
+        *(getattr(a, f.name) for f in fields(AppointmentRecord) if f.name != "services"),
+        services=[AppointmentServiceRecord(x.id, x.name, x.price, x.duration) for x in a.services],
+    )
+
+    assert FastJSONResponse(MedspaResponse.content_from_medspa(medspa)).body == (
+        FastJSONResponse(MedspaResponse.content_from_medspa(m)).body
+    )
+    assert FastJSONResponse(ServiceResponse.content_from_service(service)).body == (
+        FastJSONResponse(ServiceResponse.content_from_service(s)).body
+    )
+    assert FastJSONResponse(AppointmentResponse.content_from_appointment(appointment)).body == (
+        AppointmentResponse.from_appointment(a).model_dump_json().encode()
+    )
+    assert AppointmentResponse.from_appointment(appointment) == (
+        AppointmentResponse.from_appointment(a)
+    )
+
+
+@pytest.mark.parametrize("next_cursor", [None, "abc"])
+def test_pg_json_page_response_wraps_items_verbatim(next_cursor):
+    items = '[{"id" : "01A", "start_time" : "2030-03-01T14:00:00Z"}]'
+    response = pg_json_page_response(items, next_cursor, 20)
+
+    body = bytes(response.body)
+
+    assert response.media_type == "application/json"
+    assert items.encode() in body
+    assert json.loads(body) == {
+        "items": json.loads(items),
+        "next_cursor": next_cursor,
+        "limit": 20,
+    }
+
+
+def test_openapi_still_documents_response_models():
+    schema = app.openapi()["paths"]["/appointments"]["get"]["responses"]["200"]
+    ref = schema["content"]["application/json"]["schema"]["$ref"]
+    assert ref.endswith("PaginatedResponse_AppointmentResponse_")
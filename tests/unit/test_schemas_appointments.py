@@ -2,7 +2,7 @@ from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from app.schemas.appointments import AppointmentCreate
+from app.schemas.appointments import AppointmentBatchCreate, AppointmentCreate
 
 pytestmark = pytest.mark.unit
 
@@ -19,3 +19,13 @@ def test_appointment_create_naive_past_raises():
     naive_past = (datetime.now(timezone.utc) - timedelta(days=1)).replace(tzinfo=None)
     with pytest.raises(ValueError, match="start_time cannot be in the past"):
         AppointmentCreate(start_time=naive_past, service_ids=["01ARZ3NDEKTSV4RRFFQ69G5FAV"])
+
+
+def test_batch_items_accept_past_start_time():
+    """A past item is reported per item by the service, not a 422 for the whole batch."""
+    past = datetime.now(timezone.utc) - timedelta(days=1)
+    data = AppointmentBatchCreate.model_validate(
+        {"appointments": [{"start_time": past, "service_ids": ["01S", "01S"]}]}
+    )
+    assert data.appointments[0].start_time == past
+    assert data.appointments[0].service_ids == ["01S"]
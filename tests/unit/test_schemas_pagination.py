@@ -0,0 +1,31 @@
+import pytest
+
+from app.exceptions import BadRequestError
+from app.schemas.pagination import decode_cursor, encode_cursor
+
+pytestmark = pytest.mark.unit
+
+
+def test_cursor_round_trip_is_url_safe_and_unpadded():
+    cursor = encode_cursor("start_time", "2030-01-01T09:00:00+00:00", "01ARZ3NDEKTSV4RRFFQ69G5FAV")
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert decode_cursor(cursor) == [
+        "start_time",
+        "2030-01-01T09:00:00+00:00",
+        "01ARZ3NDEKTSV4RRFFQ69G5FAV",
+    ]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "01ARZ3NDEKTSV4RRFFQ69G5FAV",  # legacy raw id
+        "not base64!",
+        "e30",  # {} (not a list)
+        "W10",  # [] (empty)
+        "WzFd",  # [1] (not strings)
+    ],
+)
+def test_decode_cursor_rejects_foreign_input(cursor):
+    with pytest.raises(BadRequestError, match="Invalid cursor"):
+        decode_cursor(cursor)
@@ -0,0 +1,145 @@
+"""Unit tests for the slow statement log (sqlite with a sleeping function, no Postgres)."""
+
+import logging
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.db.query_stats import QueryStats, query_stats_ctx
+from app.db.slow_queries import (
+    instrument_slow_queries,
+    is_explainable,
+    normalize_sql,
+    parameter_shapes,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _sleep_ms(ms: int) -> int:
+    time.sleep(ms / 1000)
+    return ms
+
+
+def _sleep_then_fail(ms: int) -> int:
+    time.sleep(ms / 1000)
+    raise ValueError("boom")
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(settings, "slow_query_ms", 20)
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def _functions(dbapi_connection, connection_record):
+        dbapi_connection.create_function("sleep_ms", 1, _sleep_ms)
+        dbapi_connection.create_function("sleep_then_fail", 1, _sleep_then_fail)
+
+    instrument_slow_queries(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def slow_log(caplog):
+    caplog.set_level(logging.WARNING, logger="app.db.slow_queries")
+
+    def lines() -> list[str]:
+        return [r.getMessage() for r in caplog.records if r.getMessage().startswith("slow_query ")]
+
+    return lines
+
+
+def test_normalize_sql_replaces_literals_and_joins_lines():
+    sql = "SELECT *\n  FROM t\n WHERE name = 'O''Brien' AND n > 10 AND id = %(id_1)s"
+    assert normalize_sql(sql) == "SELECT * FROM t WHERE name = ? AND n > ? AND id = %(id_1)s"
+
+
+def test_parameter_shapes_never_include_values():
+    shapes = parameter_shapes({"email_1": "jane@example.com", "keys": ["a", "b"], "n": 3})
+    assert shapes == "{email_1: str, keys: list[2], n: int}"
+    assert parameter_shapes([{"id": "x"}, {"id": "y"}], executemany=True) == "2 x {id: str}"
+    assert parameter_shapes(("x", 1)) == "{str, int}"
+    many = parameter_shapes({f"p{i}": i for i in range(50)})
+    assert many.endswith("... 50 in all}")
+
+
+def test_only_single_selects_are_explainable():
+    assert is_explainable("  select 1", executemany=False)
+    assert is_explainable("WITH x AS (SELECT 1) SELECT * FROM x", executemany=False)
+    assert not is_explainable("INSERT INTO t VALUES (1)", executemany=False)
+    assert not is_explainable("SELECT set_config('a', 'b', true); SELECT 1", executemany=False)
+    assert not is_explainable("SELECT 1", executemany=True)
+
+
+def test_data_modifying_ctes_are_not_explainable():
+    """insert_if_available is a WITH ... INSERT ... RETURNING: a write, never re-run."""
+    assert not is_explainable(
+        "WITH inserted AS (INSERT INTO t (a) VALUES (1) RETURNING a) SELECT * FROM inserted",
+        executemany=False,
+    )
+    assert not is_explainable("WITH d AS (DELETE FROM t RETURNING a) SELECT 1", executemany=False)
+    assert not is_explainable("SELECT id FROM t FOR UPDATE", executemany=False)
+    assert is_explainable("SELECT updated_at FROM t WHERE note = 'delete me'", executemany=False)
+
+
+def test_slow_statement_uses_the_request_timing(engine):
+    """One timing per statement, shared with the request's QueryStats."""
+    stats = QueryStats()
+    token = query_stats_ctx.set(stats)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT sleep_ms(30)"))
+    finally:
+        query_stats_ctx.reset(token)
+    assert stats.statements == 1
+    assert stats.db_seconds >= 0.03
+    assert len(engine.dispatch.before_cursor_execute) == 1
+
+
+def test_slow_statement_is_logged_with_route(engine, slow_log):
+    class Route:
+        path = "/medspas/{medspa_id}"
+
+    stats = QueryStats(scope={"method": "GET", "path": "/medspas/1", "route": Route()})
+    token = query_stats_ctx.set(stats)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT sleep_ms(:ms), :email"), {"ms": 30, "email": "a@b.c"})
+    finally:
+        query_stats_ctx.reset(token)
+    (line,) = slow_log()
+    assert "route=GET /medspas/{medspa_id} failed=False" in line
+    assert "params={int, str}" in line  # sqlite binds positionally
+    assert "sql=SELECT sleep_ms(?), ?" in line
+    assert "a@b.c" not in line
+
+
+def test_fast_statement_is_not_logged(engine, slow_log):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT sleep_ms(0)"))
+    assert slow_log() == []
+
+
+def test_failed_slow_statement_is_logged(engine, slow_log):
+    with engine.connect() as conn, pytest.raises(OperationalError):
+        conn.execute(text("SELECT sleep_then_fail(30)"))
+    (line,) = slow_log()
+    assert "route=- failed=True" in line
+
+
+def test_explain_is_queued_only_when_enabled_and_for_selects(engine, monkeypatch):
+    with patch("app.db.slow_queries.explainer") as explainer, engine.connect() as conn:
+        conn.execute(text("SELECT sleep_ms(30)"))
+        explainer.submit.assert_not_called()
+
+        monkeypatch.setattr(settings, "slow_query_explain", True)
+        conn.execute(text("SELECT sleep_ms(30)"))
+        conn.execute(text("CREATE TABLE t AS SELECT sleep_ms(30) AS ms"))
+    explainer.submit.assert_called_once()
+    assert explainer.submit.call_args.args[1] == "SELECT sleep_ms(30)"
@@ -0,0 +1,82 @@
+"""Unit tests for sqlcommenter tags on statements (sqlite, no Postgres)."""
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from app.config import settings
+from app.db.query_stats import QueryStats, query_stats_ctx
+from app.db.sql_comments import sql_comment, tag_statements
+from app.logging_config import request_id_ctx
+
+pytestmark = pytest.mark.unit
+
+
+class _Route:
+    path = "/appointments/{appointment_id}"
+
+
+@pytest.fixture
+def request_context():
+    stats = QueryStats(scope={"method": "GET", "path": "/appointments/1", "route": _Route()})
+    stats_token = query_stats_ctx.set(stats)
+    id_token = request_id_ctx.set("01HZX3Q8Y6V1K2M3N4P5Q6R7S8")
+    yield
+    request_id_ctx.reset(id_token)
+    query_stats_ctx.reset(stats_token)
+
+
+@pytest.fixture
+def sent():
+    """Statements as the DBAPI cursor received them."""
+    engine = create_engine("sqlite://")
+    tag_statements(engine)
+    statements: list[str] = []
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record(conn, cursor, statement, params, context, many):
+        statements.append(statement)
+
+    def run(sql: str) -> list[str]:
+        with engine.connect() as conn:
+            conn.execute(text(sql), {"x": 1})
+        return statements
+
+    yield run
+    engine.dispose()
+
+
+def test_statements_carry_request_id_and_route(request_context, sent):
+    (statement,) = sent("SELECT :x")
+    assert statement == (
+        "SELECT ? /*request_id='01HZX3Q8Y6V1K2M3N4P5Q6R7S8',route='/appointments/{appointment_id}'*/"
+    )
+
+
+def test_route_only_without_request_id(request_context):
+    assert sql_comment(request_id=False) == "/*route='/appointments/{appointment_id}'*/"
+
+
+def test_no_comment_outside_a_request(sent):
+    assert sent("SELECT :x") == ["SELECT ?"]
+
+
+def test_comment_can_be_turned_off(request_context, sent, monkeypatch):
+    monkeypatch.setattr(settings, "sql_comments", False)
+    assert sent("SELECT :x") == ["SELECT ?"]
+
+
+def test_client_request_id_cannot_break_out_of_the_comment():
+    token = request_id_ctx.set("x'*/; DROP TABLE medspas; --%s")
+    try:
+        assert sql_comment() == "/*request_id='x__/__DROP_TABLE_medspas__--_s'*/"
+    finally:
+        request_id_ctx.reset(token)
+
+
+def test_route_is_left_out_before_routing():
+    stats = QueryStats(scope={"method": "GET", "path": "/nowhere"})
+    token = query_stats_ctx.set(stats)
+    try:
+        assert sql_comment() is None
+    finally:
+        query_stats_ctx.reset(token)